@@ -1,5 +1,17 @@
 """RefData Hub API application package."""
 
-from .main import create_app
+from __future__ import annotations
+
+from typing import Any
 
 __all__ = ["create_app"]
+
+
+def __getattr__(name: str) -> Any:
+    # Imported on first use: scoring worker processes import this package to
+    # unpickle their scorer and must not build the application.
+    if name == "create_app":
+        from .main import create_app
+
+        return create_app
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -49,7 +49,7 @@ class Settings(BaseSettings):
     )
     matcher_backend: str = Field(
         default="embedding",
-        description="Selected matcher backend (embedding or llm).",
+        description="Selected matcher backend (embedding, fuzzy, llm or hybrid).",
     )
     embedding_model: str = Field(
         default="tfidf",
@@ -68,6 +68,125 @@ class Settings(BaseSettings):
     top_k: int = Field(
         default=5, ge=1, le=20, description="Maximum number of match candidates to return."
     )
+    llm_batch_size: int = Field(
+        default=20,
+        ge=1,
+        le=200,
+        description=(
+            "Raw values packed into one LLM prompt when scoring in bulk (1 disables batching)."
+        ),
+    )
+    llm_shortlist_size: int = Field(
+        default=20,
+        ge=1,
+        le=200,
+        description="Embedding candidates sent to the LLM for reranking by the hybrid backend.",
+    )
+    llm_cache_enabled: bool = Field(
+        default=True, description="Persist parsed LLM rankings to avoid repeat provider calls."
+    )
+    llm_cache_ttl_seconds: int = Field(
+        default=7 * 24 * 3600, ge=1, description="Lifetime of cached LLM rankings in seconds."
+    )
+    llm_cache_max_entries: int = Field(
+        default=100_000, ge=1, description="Maximum number of persisted LLM ranking entries."
+    )
+    llm_cache_memory_entries: int = Field(
+        default=2048,
+        ge=0,
+        description="Size of the in-process LRU in front of the LLM ranking table (0 disables it).",
+    )
+    llm_concurrency: int = Field(
+        default=8, ge=1, le=128, description="Maximum concurrent requests to the LLM provider."
+    )
+    llm_timeout_seconds: float = Field(
+        default=30.0, gt=0, description="Per-attempt timeout for LLM provider requests."
+    )
+    llm_max_retries: int = Field(
+        default=2, ge=0, le=10, description="Retries for transient LLM provider failures."
+    )
+    llm_retry_backoff_seconds: float = Field(
+        default=0.5, ge=0, description="Base delay for exponential backoff between LLM retries."
+    )
+    scoring_processes: int = Field(
+        default=0,
+        ge=0,
+        le=256,
+        description="Worker processes for large embedding scoring runs (0 or 1 scores in-process).",
+    )
+    scoring_process_min_values: int = Field(
+        default=5000,
+        ge=1,
+        description="Smallest batch of raw values worth sharding across scoring processes.",
+    )
+    job_workers: int = Field(
+        default=2, ge=1, le=32, description="Worker threads executing background jobs."
+    )
+    job_heartbeat_seconds: float = Field(
+        default=15.0,
+        gt=0,
+        description="Seconds between heartbeats of unfinished jobs (four missed beats orphan one).",
+    )
+    raw_value_dedup: bool = Field(
+        default=False,
+        description="Keep one proposal audit row per normalised raw value with a counter.",
+    )
+    raw_value_write_behind: bool = Field(
+        default=False,
+        description="Queue proposal audit rows in memory and insert them in bulk.",
+    )
+    raw_value_flush_rows: int = Field(
+        default=500, ge=1, description="Queued audit rows that trigger an immediate flush."
+    )
+    raw_value_flush_interval_seconds: float = Field(
+        default=1.0, gt=0, description="Maximum time an audit row waits in the queue."
+    )
+    source_engine_pool_size: int = Field(
+        default=2, ge=1, le=64, description="Pooled connections kept per source connection."
+    )
+    source_engine_max_overflow: int = Field(
+        default=3, ge=0, le=64, description="Extra connections a source pool may open under load."
+    )
+    source_engine_idle_seconds: float = Field(
+        default=300.0, gt=0, description="Dispose source engines unused for this long."
+    )
+    source_engine_max_engines: int = Field(
+        default=32, ge=1, description="Source connection engines kept open at once."
+    )
+    source_capture_default_limit: int = Field(
+        default=100,
+        ge=0,
+        description="Distinct values captured per mapped field by default; 0 keeps all.",
+    )
+    source_capture_chunk_size: int = Field(
+        default=1000, ge=1, description="Captured values streamed and written per batch."
+    )
+    source_schema_cache_ttl_seconds: float = Field(
+        default=900.0,
+        ge=0,
+        description="Serve cached source table and field listings for this long; 0 disables.",
+    )
+    retention_raw_value_days: int = Field(
+        default=0, ge=0, description="Prune unreviewed raw values not seen for this many days."
+    )
+    retention_raw_value_max_per_dimension: int = Field(
+        default=0, ge=0, description="Keep at most this many unreviewed raw values per dimension."
+    )
+    retention_sample_days: int = Field(
+        default=0, ge=0, description="Prune source samples not seen for this many days."
+    )
+    retention_sample_max_per_field: int = Field(
+        default=0, ge=0, description="Keep at most this many source samples per mapped field."
+    )
+    retention_prune_unmapped_samples: bool = Field(
+        default=False, description="Prune source samples of fields without a mapping."
+    )
+    retention_batch_size: int = Field(
+        default=5000, ge=1, description="Rows deleted per transaction while pruning history."
+    )
+    retention_interval_minutes: float = Field(
+        default=0, ge=0, description="Minutes between scheduled pruning runs (0 disables)."
+    )
 
     model_config = SettingsConfigDict(
         env_file=".env",
@@ -116,12 +116,129 @@ def _ensure_systemconfig_llm_mode_column(engine) -> None:
         )
 
 
+# Columns introduced after a table first shipped, as ``name -> DDL`` fragments.
+ADDITIVE_COLUMNS: dict[str, dict[str, str]] = {
+    "systemconfig": {
+        "llm_batch_size": "INTEGER NOT NULL DEFAULT 20",
+        "llm_shortlist_size": "INTEGER NOT NULL DEFAULT 20",
+        "exact_match_attributes": "JSON NOT NULL DEFAULT '[\"code\"]'",
+    },
+    "canonicalvalue": {
+        "updated_at": "TIMESTAMP",
+    },
+    "sourcefieldmapping": {
+        "capture_limit": "INTEGER",
+    },
+    "rawvalue": {
+        "normalised_text": "VARCHAR",
+        "occurrence_count": "INTEGER NOT NULL DEFAULT 1",
+        "last_seen_at": "TIMESTAMP",
+    },
+}
+
+
+def _ensure_additive_columns(engine) -> None:
+    """Add nullable or defaulted columns missing from legacy installations."""
+
+    inspector = inspect(engine)
+    tables = set(inspector.get_table_names())
+    for table, columns in ADDITIVE_COLUMNS.items():
+        if table not in tables:
+            continue
+        existing = {column["name"] for column in inspector.get_columns(table)}
+        missing = {name: ddl for name, ddl in columns.items() if name not in existing}
+        if not missing:
+            continue
+        with engine.begin() as connection:
+            for name, ddl in missing.items():
+                logger.info("Adding missing %s.%s column", table, name)
+                connection.execute(text(f"ALTER TABLE {table} ADD COLUMN {name} {ddl}"))
+
+
+def _ensure_raw_value_dedup_index(engine) -> None:
+    """Create the raw value deduplication index on installations that predate it."""
+
+    inspector = inspect(engine)
+    if "rawvalue" not in inspector.get_table_names():
+        return
+    if any(
+        index["name"] == "uq_rawvalue_dimension_normalised"
+        for index in inspector.get_indexes("rawvalue")
+    ):
+        return
+
+    # Legacy rows keep a null key, which unique indexes treat as distinct.
+    logger.info("Adding rawvalue deduplication index")
+    with engine.begin() as connection:
+        connection.execute(
+            text(
+                "CREATE UNIQUE INDEX uq_rawvalue_dimension_normalised "
+                "ON rawvalue (dimension, normalised_text)"
+            )
+        )
+
+
+def _ensure_source_sample_unique_index(engine) -> None:
+    """Fold duplicate samples and add the natural key index on legacy installations.
+
+    Samples used to be written without a uniqueness guarantee, so a field could
+    hold several rows for one raw value. Each group collapses into its newest
+    row with the summed count, the latest ``last_seen_at`` and a dimension
+    taken from any row when the survivor has none, matching how the samples
+    endpoint aggregated them.
+    """
+
+    inspector = inspect(engine)
+    if "sourcesample" not in inspector.get_table_names():
+        return
+    if any(
+        index["name"] == "uq_sourcesample_natural_key"
+        for index in inspector.get_indexes("sourcesample")
+    ):
+        return
+
+    key = "source_connection_id, source_table, source_field, raw_value"
+    same_key = (
+        "peer.source_connection_id = sourcesample.source_connection_id "
+        "AND peer.source_table = sourcesample.source_table "
+        "AND peer.source_field = sourcesample.source_field "
+        "AND peer.raw_value = sourcesample.raw_value"
+    )
+    logger.info("Folding duplicate source samples and adding the natural key index")
+    with engine.begin() as connection:
+        connection.execute(
+            text(
+                "UPDATE sourcesample SET "
+                f"occurrence_count = (SELECT SUM(peer.occurrence_count) "
+                f"FROM sourcesample peer WHERE {same_key}), "
+                f"last_seen_at = (SELECT MAX(peer.last_seen_at) "
+                f"FROM sourcesample peer WHERE {same_key}), "
+                f"dimension = COALESCE(dimension, (SELECT MAX(peer.dimension) "
+                f"FROM sourcesample peer WHERE {same_key})) "
+                f"WHERE id IN (SELECT MAX(id) FROM sourcesample GROUP BY {key} "
+                "HAVING COUNT(*) > 1)"
+            )
+        )
+        connection.execute(
+            text(
+                "DELETE FROM sourcesample WHERE id NOT IN "
+                f"(SELECT MAX(id) FROM sourcesample GROUP BY {key})"
+            )
+        )
+        connection.execute(
+            text(f"CREATE UNIQUE INDEX uq_sourcesample_natural_key ON sourcesample ({key})")
+        )
+
+
 def init_db(engine, settings: Settings | None = None) -> None:
     """Create database tables and seed initial data."""
 
     SQLModel.metadata.create_all(engine)
     _ensure_canonical_attributes_column(engine)
     _ensure_systemconfig_llm_mode_column(engine)
+    _ensure_additive_columns(engine)
+    _ensure_raw_value_dedup_index(engine)
+    _ensure_source_sample_unique_index(engine)
     seed_database(engine, settings=settings)
 
 
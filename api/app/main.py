@@ -2,21 +2,58 @@
 
 from __future__ import annotations
 
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
+
 from fastapi import APIRouter, FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 from .config import Settings, load_settings
 from .database import create_db_engine, init_db
 from .routes import config as config_routes
+from .routes import jobs as job_routes
 from .routes import reference as reference_routes
 from .routes import source as source_routes
+from .services.jobs import JobRunner
+from .services.llm_cache import LLMRankingCache
+from .services.llm_client import LLMClient
+from .services.dimension_catalogue import DimensionCatalogue
+from .services.matcher_registry import MatcherRegistry
+from .services import retention
+from .services.raw_values import RawValueBuffer, RawValueRecorder
+from .services.schema_cache import SchemaCatalogueCache
+from .services.scoring_pool import ProcessScoringPool
+from .services.source_connections import SourceEngineRegistry
+from .services.source_samples import CapturePolicy
 
 
 def create_app(settings: Settings | None = None) -> FastAPI:
     """Create and configure the FastAPI application."""
 
     settings = settings or load_settings()
-    app = FastAPI(title="RefData Hub API", version="0.1.0")
+
+    @asynccontextmanager
+    async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+        await app.state.llm_client.start()
+        # Background threads start here rather than in create_app, so importing
+        # the module-level app (or building one in a test) leaves none behind.
+        if app.state.raw_value_buffer is not None:
+            app.state.raw_value_buffer.start()
+        app.state.job_runner.start()
+        if app.state.retention_scheduler is not None:
+            app.state.retention_scheduler.start()
+        yield
+        if app.state.retention_scheduler is not None:
+            app.state.retention_scheduler.shutdown()
+        app.state.job_runner.shutdown()
+        if app.state.raw_value_buffer is not None:
+            app.state.raw_value_buffer.shutdown()
+        if app.state.scoring_pool is not None:
+            app.state.scoring_pool.shutdown()
+        app.state.source_engines.dispose_all()
+        await app.state.llm_client.aclose()
+
+    app = FastAPI(title="RefData Hub API", version="0.1.0", lifespan=lifespan)
 
     app.add_middleware(
         CORSMiddleware,
@@ -30,11 +67,82 @@ def create_app(settings: Settings | None = None) -> FastAPI:
     app.state.engine = engine
     app.state.settings = settings
     init_db(engine, settings=settings)
+    app.state.llm_cache = (
+        LLMRankingCache(
+            engine,
+            ttl_seconds=settings.llm_cache_ttl_seconds,
+            max_entries=settings.llm_cache_max_entries,
+            memory_entries=settings.llm_cache_memory_entries,
+        )
+        if settings.llm_cache_enabled
+        else None
+    )
+    app.state.llm_client = LLMClient(
+        concurrency=settings.llm_concurrency,
+        timeout_seconds=settings.llm_timeout_seconds,
+        max_retries=settings.llm_max_retries,
+        backoff_seconds=settings.llm_retry_backoff_seconds,
+    )
+    app.state.scoring_pool = (
+        ProcessScoringPool(
+            settings.scoring_processes, min_values=settings.scoring_process_min_values
+        )
+        if settings.scoring_processes > 1
+        else None
+    )
+    app.state.source_engines = SourceEngineRegistry(
+        pool_size=settings.source_engine_pool_size,
+        max_overflow=settings.source_engine_max_overflow,
+        idle_seconds=settings.source_engine_idle_seconds,
+        max_engines=settings.source_engine_max_engines,
+    )
+    app.state.schema_cache = SchemaCatalogueCache(settings.source_schema_cache_ttl_seconds)
+    app.state.capture_policy = CapturePolicy.from_settings(settings)
+    app.state.dimension_catalogue = DimensionCatalogue()
+    app.state.matcher_registry = MatcherRegistry(
+        llm_cache=app.state.llm_cache,
+        llm_client=app.state.llm_client,
+        scoring_pool=app.state.scoring_pool,
+        catalogue=app.state.dimension_catalogue,
+    )
+    app.state.raw_value_buffer = (
+        RawValueBuffer(
+            engine,
+            max_rows=settings.raw_value_flush_rows,
+            flush_interval=settings.raw_value_flush_interval_seconds,
+            dedup=settings.raw_value_dedup,
+        )
+        if settings.raw_value_write_behind
+        else None
+    )
+    app.state.raw_value_recorder = RawValueRecorder(
+        dedup=settings.raw_value_dedup, buffer=app.state.raw_value_buffer
+    )
+    app.state.job_runner = JobRunner(
+        engine,
+        app.state,
+        max_workers=settings.job_workers,
+        heartbeat_seconds=settings.job_heartbeat_seconds,
+    )
+    reference_routes.register_jobs(app.state.job_runner)
+    source_routes.register_jobs(app.state.job_runner)
+    retention.register_jobs(app.state.job_runner)
+    app.state.job_runner.recover()
+    app.state.retention_scheduler = (
+        retention.RetentionScheduler(
+            engine,
+            app.state.job_runner,
+            interval_seconds=settings.retention_interval_minutes * 60,
+        )
+        if settings.retention_interval_minutes > 0
+        else None
+    )
 
     api_router = APIRouter(prefix="/api")
     api_router.include_router(reference_routes.router)
     api_router.include_router(config_routes.router)
     api_router.include_router(source_routes.router)
+    api_router.include_router(job_routes.router)
     app.include_router(api_router)
 
     @app.get("/health", tags=["health"])
@@ -2,26 +2,340 @@
 
 from __future__ import annotations
 
+import hashlib
+import heapq
 import json
 import logging
-from typing import Any, Iterable, List
+import math
+import threading
+from collections import Counter
+from typing import Any, Callable, Iterable, List, Sequence
 
 import httpx
+import numpy as np
+from scipy import sparse
 from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
+from sklearn.preprocessing import normalize
+
+from sqlalchemy import func
+from sqlmodel import Session, select
 
 from .models import CanonicalValue, SystemConfig
 from .schemas import MatchCandidate
+from .services.llm_cache import LLMRankingCache, build_cache_key
+from .services.llm_client import LLMClient, LLMRequest
+from .services.scoring_pool import ProcessScoringPool
 
 LOGGER = logging.getLogger(__name__)
 
+_SCORE_BLOCK_CELLS = 2_000_000
+
+# Backends that consult an LLM before falling back to embedding scores.
+_LLM_BACKENDS = frozenset({"llm", "hybrid"})
+
+# Character n-grams (within word boundaries) used by the fuzzy backend.
+_FUZZY_NGRAM_RANGE = (2, 3)
+
+_LLM_SYSTEM_PROMPT = "You respond only with JSON and never with additional text."
+
+
+def _select_top_k(scores: np.ndarray, k: int) -> np.ndarray:
+    """Return indices of the ``k`` highest scores, best first.
+
+    Uses ``argpartition`` so only the selected rows are sorted. Ties are broken
+    by position, matching a stable descending sort of the full array.
+    """
+
+    total = scores.shape[0]
+    if k <= 0 or total == 0:
+        return np.empty(0, dtype=np.intp)
+    if k >= total:
+        return np.argsort(-scores, kind="stable")
+
+    partitioned = np.argpartition(-scores, k - 1)[:k]
+    cutoff = scores[partitioned].min()
+    above = np.flatnonzero(scores > cutoff)
+    ties = np.flatnonzero(scores == cutoff)[: k - above.shape[0]]
+    chosen = np.sort(np.concatenate([above, ties]))
+    return chosen[np.argsort(-scores[chosen], kind="stable")]
+
+
+class EmbeddingIndex:
+    """TF-IDF representation of a canonical library fitted once and reused per query.
+
+    The canonical matrix is L2-normalised up front so ranking only needs to
+    vectorise the query and take a sparse dot product. Query tokens missing from
+    the canonical vocabulary still contribute to the query norm, mirroring the
+    behaviour of fitting the vectorizer on the raw text and library together.
+    ``vectorizer`` defaults to word TF-IDF; the fuzzy backend passes a
+    character n-gram vectorizer instead.
+    """
+
+    def __init__(self, sentences: Sequence[str], vectorizer: TfidfVectorizer | None = None):
+        self.vectorizer = (vectorizer or TfidfVectorizer(norm=None)).fit(sentences)
+        self.matrix = normalize(self.vectorizer.transform(sentences)).tocsr()
+        # Term-major copy so query blocks multiply without re-converting per call.
+        self.matrix_t = self.matrix.T.tocsr()
+        self._analyzer = self.vectorizer.build_analyzer()
+        self._vocabulary = self.vectorizer.vocabulary_
+        self._idf = self.vectorizer.idf_
+        # Smoothed IDF of a term seen only in the query across ``n + 1`` documents.
+        self._oov_idf = math.log((len(sentences) + 2) / 2) + 1.0
+
+    def __len__(self) -> int:
+        return self.matrix.shape[0]
+
+    def transform(self, raw_texts: Sequence[str]) -> sparse.csr_matrix:
+        """Vectorise query texts into L2-normalised rows aligned with the index."""
+
+        rows: list[int] = []
+        columns: list[int] = []
+        weights: list[float] = []
+        for row, text in enumerate(raw_texts):
+            start = len(weights)
+            squared_norm = 0.0
+            for token, count in Counter(self._analyzer(text)).items():
+                column = self._vocabulary.get(token)
+                if column is None:
+                    squared_norm += (count * self._oov_idf) ** 2
+                    continue
+                weight = count * float(self._idf[column])
+                squared_norm += weight * weight
+                rows.append(row)
+                columns.append(column)
+                weights.append(weight)
+            if squared_norm:
+                norm = math.sqrt(squared_norm)
+                for position in range(start, len(weights)):
+                    weights[position] /= norm
+
+        return sparse.csr_matrix(
+            (weights, (rows, columns)),
+            shape=(len(raw_texts), self.matrix.shape[1]),
+        )
+
+    def scores(self, raw_text: str) -> Any:
+        """Return cosine similarity between ``raw_text`` and every canonical row."""
+
+        return (self.transform([raw_text]) @ self.matrix_t).toarray().ravel()
+
+
+def _score_top_k(
+    index: EmbeddingIndex, raw_texts: Sequence[str], top_k: int
+) -> list[tuple[np.ndarray, np.ndarray]]:
+    """Return the best ``top_k`` row positions and rounded scores per raw text.
+
+    Module-level so :class:`ProcessScoringPool` workers can run it against the
+    index they inherited at fork time.
+    """
+
+    queries = index.transform(raw_texts)
+    # Bound the dense score block to roughly two million cells per chunk.
+    chunk_rows = max(1, _SCORE_BLOCK_CELLS // max(1, len(index)))
+
+    results: list[tuple[np.ndarray, np.ndarray]] = []
+    for start in range(0, len(raw_texts), chunk_rows):
+        block = (queries[start : start + chunk_rows] @ index.matrix_t).toarray()
+        np.clip(block, 0.0, 1.0, out=block)
+        for scores in np.round(block, 4):
+            positions = _select_top_k(scores, top_k)
+            results.append((positions, scores[positions]))
+    return results
+
+
+class LexicalIndex:
+    """Inverted token index used by the lexical fallback matcher.
+
+    Maps each token to the canonical rows containing it so Jaccard similarity is
+    only computed for rows sharing at least one token with the query.
+    """
+
+    def __init__(self, token_sets: Sequence[set[str]]):
+        self.sizes = np.fromiter((len(tokens) for tokens in token_sets), dtype=np.int64)
+        self.non_empty = [position for position, size in enumerate(self.sizes) if size]
+        postings: dict[str, list[int]] = {}
+        for position, tokens in enumerate(token_sets):
+            for token in tokens:
+                postings.setdefault(token, []).append(position)
+        self.postings = {
+            token: np.asarray(rows, dtype=np.int64) for token, rows in postings.items()
+        }
+
+    def scores(self, query_tokens: set[str]) -> tuple[np.ndarray, np.ndarray]:
+        """Return candidate row positions (ascending) and their Jaccard scores."""
+
+        matches = [self.postings[token] for token in query_tokens if token in self.postings]
+        if not matches:
+            return np.empty(0, dtype=np.int64), np.empty(0)
+        positions, overlap = np.unique(np.concatenate(matches), return_counts=True)
+        union = len(query_tokens) + self.sizes[positions] - overlap
+        return positions, overlap / union
+
+
+class _IndexCache:
+    """Process-wide cache of prebuilt matcher indexes keyed by dimension.
+
+    Entries carry a signature of the canonical values they were built from so a
+    matcher constructed from a different snapshot never reuses a stale index.
+    Callers that mutate the canonical library should still invalidate the
+    affected dimension to release memory promptly.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._entries: dict[tuple[str, tuple[str, ...]], tuple[str, Any]] = {}
+
+    def get_or_build(
+        self,
+        kind: str,
+        dimensions: tuple[str, ...],
+        signature: str,
+        builder: Callable[[], Any],
+    ) -> Any:
+        key = (kind, dimensions)
+        with self._lock:
+            cached = self._entries.get(key)
+        if cached and cached[0] == signature:
+            return cached[1]
+
+        index = builder()
+        with self._lock:
+            self._entries[key] = (signature, index)
+        return index
+
+    def invalidate(self, dimension: str | None = None) -> None:
+        with self._lock:
+            if dimension is None:
+                self._entries.clear()
+                return
+            # Entries keyed by an empty tuple span every dimension.
+            for key in [key for key in self._entries if not key[1] or dimension in key[1]]:
+                del self._entries[key]
+
+
+class ExactMatchIndex:
+    """Hash map from normalised labels and selected attribute values to canonical values."""
+
+    def __init__(
+        self, canonical_values: Sequence[CanonicalValue], attribute_keys: Sequence[str] = ()
+    ):
+        # Detached copies: cached indexes outlive the session that loaded the rows.
+        self.candidates = [
+            MatchCandidate(
+                canonical_id=canonical.id or 0,
+                canonical_label=canonical.canonical_label,
+                dimension=canonical.dimension,
+                description=canonical.description,
+                score=1.0,
+            )
+            for canonical in canonical_values
+        ]
+        self.positions: dict[str, list[int]] = {}
+        for position, canonical in enumerate(canonical_values):
+            keys = {_normalise_exact_key(canonical.canonical_label)}
+            attributes = canonical.attributes or {}
+            for attribute in attribute_keys:
+                value = attributes.get(attribute)
+                if isinstance(value, (str, int)) and not isinstance(value, bool):
+                    keys.add(_normalise_exact_key(str(value)))
+            keys.discard("")
+            for key in keys:
+                self.positions.setdefault(key, []).append(position)
+
+    def lookup(self, raw_text: str) -> list[MatchCandidate]:
+        return [
+            self.candidates[position]
+            for position in self.positions.get(_normalise_exact_key(raw_text), ())
+        ]
+
+
+def _normalise_exact_key(value: str) -> str:
+    return value.strip().casefold()
+
+
+_INDEX_CACHE = _IndexCache()
+
+
+def invalidate_matcher_indexes(dimension: str | None = None) -> None:
+    """Drop cached matcher indexes for ``dimension`` (or all dimensions)."""
+
+    _INDEX_CACHE.invalidate(dimension)
+    LOGGER.debug("Invalidated matcher indexes", extra={"dimension": dimension})
+
+
+def find_exact_matches(
+    session: Session,
+    raw_text: str,
+    attribute_keys: Sequence[str] = (),
+    dimension: str | None = None,
+    *,
+    library_signature: str | None = None,
+) -> list[MatchCandidate]:
+    """Return canonical values whose label or attribute equals ``raw_text``.
+
+    The map for ``dimension`` (or for every dimension when ``None``) is loaded
+    once and then served from memory. It is keyed by the row count, highest id
+    and latest ``updated_at`` of the canonical values it covers, so inserts,
+    deletes and in-place edits made by other workers all produce a new key.
+    That key is read with one aggregate query unless the caller passes
+    ``library_signature`` (see :meth:`CatalogueSnapshot.library_signature`).
+    """
+
+    attribute_keys = tuple(attribute_keys)
+
+    def scoped(statement):  # type: ignore[no-untyped-def]
+        if dimension is not None:
+            statement = statement.where(CanonicalValue.dimension == dimension)
+        return statement
+
+    def build() -> ExactMatchIndex:
+        return ExactMatchIndex(session.exec(scoped(select(CanonicalValue))).all(), attribute_keys)
+
+    if library_signature is None:
+        count, max_id, updated_at = session.exec(
+            scoped(
+                select(
+                    func.count(),
+                    func.max(CanonicalValue.id),
+                    func.max(CanonicalValue.updated_at),
+                )
+            )
+        ).one()
+        library_signature = f"{count}:{max_id}:{updated_at}"
+    index = _INDEX_CACHE.get_or_build(
+        "exact-lookup",
+        (dimension,) if dimension is not None else (),
+        f"{library_signature}:{json.dumps(attribute_keys)}",
+        build,
+    )
+    return index.lookup(raw_text)
+
 
 class SemanticMatcher:
     """Selects the appropriate semantic matcher implementation."""
 
-    def __init__(self, config: SystemConfig, canonical_values: Iterable[CanonicalValue]):
+    def __init__(
+        self,
+        config: SystemConfig,
+        canonical_values: Iterable[CanonicalValue],
+        llm_cache: LLMRankingCache | None = None,
+        llm_client: LLMClient | None = None,
+        scoring_pool: ProcessScoringPool | None = None,
+    ):
         self.config = config
         self.canonical_values = list(canonical_values)
+        self.llm_cache = llm_cache
+        self.llm_client = llm_client
+        self.scoring_pool = scoring_pool
+        self._options_version: str | None = None
+        self._signature: str | None = None
+        self._dimensions: tuple[str, ...] | None = None
+
+    @property
+    def library_version(self) -> str:
+        """Content signature of the canonical library; stable across restarts."""
+
+        return self._library_signature()
 
     def rank(self, raw_text: str) -> List[MatchCandidate]:
         """Rank canonical values given raw input text."""
@@ -29,177 +343,377 @@ class SemanticMatcher:
         if not raw_text.strip():
             return []
 
-        if self.config.matcher_backend == "llm":
+        exact = self._exact_matches(raw_text)
+        if exact:
+            return exact
+
+        if self.config.matcher_backend in _LLM_BACKENDS:
             llm_rankings = self._rank_with_llm(raw_text)
             if llm_rankings:
                 return llm_rankings
 
         return self._rank_with_embeddings(raw_text)
 
-    def _rank_with_embeddings(self, raw_text: str) -> List[MatchCandidate]:
-        """Score matches using embedding cosine similarity."""
+    def rank_many(self, raw_values: Sequence[str]) -> list[list[MatchCandidate]]:
+        """Rank several raw values at once, preserving the input order.
 
-        if not self.canonical_values:
-            return []
+        Exact label or attribute hits are answered from a hash map; embedding
+        scores for the rest come from a single sparse matrix product and only
+        the top candidates of each row are materialised.
+        """
 
-        normalised_raw = raw_text.strip().casefold()
+        results: list[list[MatchCandidate]] = [[] for _ in raw_values]
+        pending: list[int] = []
+        for position, raw_text in enumerate(raw_values):
+            if not raw_text.strip():
+                continue
+            exact = self._exact_matches(raw_text)
+            if exact:
+                results[position] = exact
+            else:
+                pending.append(position)
+
+        if pending and self.config.matcher_backend in _LLM_BACKENDS:
+            llm_rankings = self._rank_many_with_llm([raw_values[position] for position in pending])
+            unscored: list[int] = []
+            for position, matches in zip(pending, llm_rankings):
+                if matches:
+                    results[position] = matches
+                else:
+                    unscored.append(position)
+            pending = unscored
+
+        if pending:
+            ranked = self._rank_many_with_embeddings([raw_values[position] for position in pending])
+            for position, matches in zip(pending, ranked):
+                results[position] = matches
+        return results
 
-        try:
-            sentences = [raw_text] + [self._canonical_as_sentence(cv) for cv in self.canonical_values]
-            vectorizer = TfidfVectorizer().fit(sentences)
-            embeddings = vectorizer.transform(sentences)
-            scores = cosine_similarity(embeddings[0], embeddings[1:]).flatten()
-        except Exception:  # pragma: no cover - defensive
-            LOGGER.warning(
-                "Falling back to lexical similarity because TF-IDF vectorization failed",
-            )
-            return self._rank_with_lexical(raw_text)
-
-        matches = []
-        for canonical, score in zip(self.canonical_values, scores):
-            scaled = float(max(0.0, min(1.0, score)))
-            if canonical.canonical_label.strip().casefold() == normalised_raw:
-                scaled = 1.0
-            matches.append(
-                MatchCandidate(
-                    canonical_id=canonical.id or 0,
-                    canonical_label=canonical.canonical_label,
-                    dimension=canonical.dimension,
-                    description=canonical.description,
-                    score=round(scaled, 4),
-                )
-            )
+    def _rank_with_embeddings(self, raw_text: str) -> List[MatchCandidate]:
+        """Score matches using embedding (or character n-gram) cosine similarity."""
 
-        matches.sort(key=lambda item: item.score, reverse=True)
-        top_k = max(1, self.config.top_k or 5)
-        return matches[:top_k]
+        return self._rank_many_with_embeddings([raw_text])[0]
 
-    def _rank_with_lexical(self, raw_text: str) -> List[MatchCandidate]:
+    def _rank_many_with_embeddings(
+        self, raw_texts: Sequence[str], limit: int | None = None
+    ) -> list[list[MatchCandidate]]:
+        if not self.canonical_values:
+            return [[] for _ in raw_texts]
+
+        index = self._fuzzy_index() if self._uses_fuzzy() else self._embedding_index()
+        if index is None:
+            return [self._rank_with_lexical(raw_text, limit) for raw_text in raw_texts]
+
+        top_k = limit or max(1, self.config.top_k or 5)
+        if self.scoring_pool is not None and self.scoring_pool.should_use(len(raw_texts)):
+            scored = self.scoring_pool.map(index, _score_top_k, raw_texts, top_k)
+        else:
+            scored = _score_top_k(index, raw_texts, top_k)
+        return [
+            [
+                self._candidate(self.canonical_values[int(position)], float(score))
+                for position, score in zip(positions, scores)
+            ]
+            for positions, scores in scored
+        ]
+
+    def _rank_with_lexical(self, raw_text: str, limit: int | None = None) -> List[MatchCandidate]:
         """Fallback matcher using normalized token overlap."""
 
         raw_tokens = self._tokenize(raw_text)
         if not raw_tokens:
             return []
 
-        normalised_raw = raw_text.strip().casefold()
-
-        candidates: list[MatchCandidate] = []
-        for canonical in self.canonical_values:
-            canonical_tokens = self._tokenize(self._canonical_as_sentence(canonical))
-            if not canonical_tokens:
-                continue
-            overlap = len(raw_tokens & canonical_tokens)
-            union = len(raw_tokens | canonical_tokens)
-            score = float(overlap / union) if union else 0.0
-            if canonical.canonical_label.strip().casefold() == normalised_raw:
-                score = 1.0
-            candidates.append(
-                MatchCandidate(
-                    canonical_id=canonical.id or 0,
-                    canonical_label=canonical.canonical_label,
-                    dimension=canonical.dimension,
-                    description=canonical.description,
-                    score=round(score, 4),
-                )
-            )
-
-        candidates.sort(key=lambda item: item.score, reverse=True)
-        top_k = max(1, self.config.top_k or 5)
-        return candidates[:top_k]
+        index = self._lexical_index()
+        positions, scores = index.scores(raw_tokens)
+        scores = np.round(scores, 4)
+
+        top_k = limit or max(1, self.config.top_k or 5)
+        results = [
+            self._candidate(self.canonical_values[int(positions[offset])], float(scores[offset]))
+            for offset in _select_top_k(scores, top_k)
+        ]
+        if len(results) < top_k:
+            # Preserve the previous contract of padding with zero-overlap candidates.
+            seen = set(positions.tolist())
+            for position in index.non_empty:
+                if len(results) >= top_k:
+                    break
+                if position in seen:
+                    continue
+                results.append(self._candidate(self.canonical_values[position], 0.0))
+        return results
 
     def _rank_with_llm(self, raw_text: str) -> List[MatchCandidate]:
         """Use an LLM to score match candidates when configured."""
 
+        return self._rank_many_with_llm([raw_text])[0]
+
+    def _rank_many_with_llm(self, raw_texts: Sequence[str]) -> list[list[MatchCandidate]]:
+        """Rank values with LLM prompts; empty lists mark values left unscored.
+
+        Uncached values are packed ``llm_batch_size`` to a prompt and the prompts
+        are sent concurrently when a shared :class:`LLMClient` is available.
+        """
+
         if not self.canonical_values:
+            return [[] for _ in raw_texts]
+
+        results: list[list[MatchCandidate]] = [[] for _ in raw_texts]
+        pending: dict[str, list[int]] = {}
+        for position, raw_text in enumerate(raw_texts):
+            cache_key = self._llm_cache_key(raw_text)
+            if cache_key is not None:
+                cached = self.llm_cache.get(cache_key)
+                if cached is not None:
+                    results[position] = self._build_matches_from_rankings(cached)
+                    continue
+            pending.setdefault(raw_text, []).append(position)
+
+        distinct = list(pending)
+        shortlists: dict[str, list[MatchCandidate]] | None = None
+        if self._uses_shortlist():
+            shortlists = dict(zip(distinct, self._llm_shortlists(distinct)))
+            distinct = [raw_text for raw_text in distinct if shortlists[raw_text]]
+
+        batch_size = max(1, self.config.llm_batch_size or 1)
+        chunks = [
+            distinct[start : start + batch_size] for start in range(0, len(distinct), batch_size)
+        ]
+        prompts: list[str] = []
+        for chunk in chunks:
+            chunk_shortlists = [shortlists[raw_text] for raw_text in chunk] if shortlists else None
+            if len(chunk) == 1:
+                shortlist = chunk_shortlists[0] if chunk_shortlists else None
+                prompts.append(self._build_llm_prompt(chunk[0], shortlist))
+            else:
+                prompts.append(self._build_llm_batch_prompt(chunk, chunk_shortlists))
+
+        for chunk, content in zip(chunks, self._complete_llm_many(prompts)):
+            if len(chunk) == 1:
+                parsed = [self._parse_llm_json(content)]
+            else:
+                parsed = self._parse_llm_batch_json(content, len(chunk))
+            for raw_text, rankings in zip(chunk, parsed):
+                if shortlists is not None:
+                    rankings = self._merge_shortlist_rankings(rankings, shortlists[raw_text])
+                matches = self._build_matches_from_rankings(rankings)
+                if not matches:
+                    continue
+                self._store_llm_rankings(self._llm_cache_key(raw_text), raw_text, rankings)
+                for position in pending[raw_text]:
+                    results[position] = matches
+        return results
+
+    def _store_llm_rankings(
+        self, cache_key: str | None, raw_text: str, rankings: list[dict[str, Any]]
+    ) -> None:
+        if cache_key is None:
+            return
+        self.llm_cache.set(
+            cache_key,
+            raw_text=raw_text,
+            dimension=",".join(self._dimensions_key()),
+            model=self._llm_model_key(),
+            library_version=self._llm_options_version(),
+            rankings=rankings,
+        )
+
+    def _llm_cache_key(self, raw_text: str) -> str | None:
+        if self.llm_cache is None:
+            return None
+        return build_cache_key(
+            raw_text,
+            ",".join(self._dimensions_key()),
+            self._llm_model_key(),
+            self._llm_options_version(),
+        )
+
+    def _llm_model_key(self) -> str:
+        mode = (self.config.llm_mode or "online").lower()
+        default_model = "llama3" if mode == "offline" else ""
+        key = f"{mode}:{self.config.llm_model or default_model}"
+        if self._uses_shortlist():
+            # Shortlists are derived from the library, so their size completes the key.
+            key += f":shortlist={self._shortlist_size()}"
+        return key
+
+    def _uses_shortlist(self) -> bool:
+        return self.config.matcher_backend == "hybrid"
+
+    def _shortlist_size(self) -> int:
+        return max(self.config.llm_shortlist_size or 1, self.config.top_k or 5)
+
+    def _llm_shortlists(self, raw_texts: Sequence[str]) -> list[list[MatchCandidate]]:
+        """Embedding candidates sent to the LLM for reranking in hybrid mode."""
+
+        return [
+            [candidate for candidate in shortlist if candidate.canonical_id]
+            for shortlist in self._rank_many_with_embeddings(raw_texts, self._shortlist_size())
+        ]
+
+    @staticmethod
+    def _merge_shortlist_rankings(
+        rankings: list[dict[str, Any]], shortlist: Sequence[MatchCandidate]
+    ) -> list[dict[str, Any]]:
+        """Combine LLM scores with the embedding shortlist they were drawn from.
+
+        Only shortlisted ids are kept; shortlist entries the LLM left unscored keep
+        their embedding score. An empty reply yields no rankings so callers fall
+        back to plain embedding matches.
+        """
+
+        llm_scores: dict[int, float] = {}
+        allowed = {candidate.canonical_id for candidate in shortlist}
+        for item in rankings:
+            if not isinstance(item, dict) or item.get("id") not in allowed:
+                continue
+            try:
+                llm_scores.setdefault(item["id"], float(item.get("score", 0)))
+            except (TypeError, ValueError):
+                continue
+        if not llm_scores:
             return []
+        return [
+            {
+                "id": candidate.canonical_id,
+                "score": llm_scores.get(candidate.canonical_id, candidate.score),
+            }
+            for candidate in shortlist
+        ]
+
+    def _llm_options_version(self) -> str:
+        """Hash the canonical options embedded in LLM prompts."""
+
+        if self._options_version is None:
+            payload = json.dumps(self._build_llm_options(), ensure_ascii=False, sort_keys=True)
+            self._options_version = hashlib.sha256(payload.encode("utf-8")).hexdigest()
+        return self._options_version
+
+    def _complete_llm_many(self, prompts: Sequence[str]) -> list[str]:
+        """Return the raw reply for each prompt ("" when the provider call failed)."""
+
+        if self.llm_client is None:
+            return [self._complete_llm(prompt) for prompt in prompts]
+
+        requests = [self._llm_request(prompt) for prompt in prompts]
+        responses = iter(
+            self.llm_client.post_many_sync([request for request in requests if request is not None])
+        )
+        return [
+            self._llm_response_content(next(responses)) if request is not None else ""
+            for request in requests
+        ]
 
+    def _complete_llm(self, prompt: str) -> str:
         mode = (self.config.llm_mode or "online").lower()
         if mode == "offline":
-            return self._rank_with_ollama(raw_text)
-        return self._rank_with_openai(raw_text)
+            return self._complete_with_ollama(prompt)
+        return self._complete_with_openai(prompt)
 
-    def _rank_with_openai(self, raw_text: str) -> List[MatchCandidate]:
-        """Call an OpenAI-compatible API to score candidates."""
+    def _llm_request(self, prompt: str) -> LLMRequest | None:
+        """HTTP request for ``prompt`` against the configured provider."""
+
+        messages = [
+            {"role": "system", "content": _LLM_SYSTEM_PROMPT},
+            {"role": "user", "content": prompt},
+        ]
+        mode = (self.config.llm_mode or "online").lower()
+        if mode == "offline":
+            base_url = (self.config.llm_api_base or "http://ollama:11434").rstrip("/")
+            return LLMRequest(
+                url=f"{base_url}/api/chat",
+                payload={
+                    "model": self.config.llm_model or "llama3",
+                    "stream": False,
+                    "messages": messages,
+                },
+            )
 
         if not self.config.llm_api_key or not self.config.llm_model:
-            LOGGER.warning("LLM backend configured without API credentials; falling back to embeddings")
-            return []
+            LOGGER.warning(
+                "LLM backend configured without API credentials; falling back to embeddings"
+            )
+            return None
+        base_url = (self.config.llm_api_base or "https://api.openai.com/v1").rstrip("/")
+        return LLMRequest(
+            url=f"{base_url}/chat/completions",
+            payload={"model": self.config.llm_model, "messages": messages, "temperature": 0},
+            headers={"Authorization": f"Bearer {self.config.llm_api_key}"},
+        )
+
+    @staticmethod
+    def _llm_response_content(data: Any) -> str:
+        """Extract the reply text from an Ollama or OpenAI-style response body."""
+
+        content = ""
+        if isinstance(data, dict):
+            if isinstance(data.get("message"), dict):
+                content = data["message"].get("content", "")
+            elif "response" in data:
+                content = str(data.get("response", ""))
+            elif isinstance(data.get("choices"), list) and data["choices"]:
+                choice = data["choices"][0]
+                message = choice.get("message") if isinstance(choice, dict) else None
+                if isinstance(message, dict):
+                    content = message.get("content") or ""
+
+        if data is not None and not content:
+            LOGGER.warning("LLM response missing usable content; falling back to embeddings")
+        return content
+
+    def _complete_with_openai(self, prompt: str) -> str:
+        """Send ``prompt`` to an OpenAI-compatible API and return the raw reply."""
+
+        if not self.config.llm_api_key or not self.config.llm_model:
+            LOGGER.warning(
+                "LLM backend configured without API credentials; falling back to embeddings"
+            )
+            return ""
 
         try:
             import openai
         except ImportError:  # pragma: no cover - dependency missing in some environments
             LOGGER.warning("openai package not available; falling back to embeddings")
-            return []
+            return ""
 
         openai.api_key = self.config.llm_api_key
         if self.config.llm_api_base:
             openai.api_base = self.config.llm_api_base
 
-        prompt = self._build_llm_prompt(raw_text)
-
         try:
             response = openai.ChatCompletion.create(
                 model=self.config.llm_model,
                 messages=[
-                    {
-                        "role": "system",
-                        "content": "You respond only with JSON and never with additional text.",
-                    },
+                    {"role": "system", "content": _LLM_SYSTEM_PROMPT},
                     {"role": "user", "content": prompt},
                 ],
                 temperature=0,
             )
-            content = response["choices"][0]["message"]["content"]
+            return response["choices"][0]["message"]["content"]
         except Exception as exc:  # pragma: no cover - network/LLM errors not under test
             LOGGER.warning("LLM ranking failed: %s", exc)
-            return []
+            return ""
 
-        rankings = self._parse_llm_json(content)
-        return self._build_matches_from_rankings(rankings)
-
-    def _rank_with_ollama(self, raw_text: str) -> List[MatchCandidate]:
-        """Call a local Ollama instance to score candidates."""
-
-        base_url = (self.config.llm_api_base or "http://ollama:11434").rstrip("/")
-        model = self.config.llm_model or "llama3"
-        endpoint = f"{base_url}/api/chat"
-        payload = {
-            "model": model,
-            "stream": False,
-            "messages": [
-                {
-                    "role": "system",
-                    "content": "You respond only with JSON and never with additional text.",
-                },
-                {"role": "user", "content": self._build_llm_prompt(raw_text)},
-            ],
-        }
+    def _complete_with_ollama(self, prompt: str) -> str:
+        """Send ``prompt`` to a local Ollama instance and return the raw reply."""
 
+        request = self._llm_request(prompt)
         try:
             with httpx.Client(timeout=30.0) as client:
-                response = client.post(endpoint, json=payload)
+                response = client.post(request.url, json=request.payload)
                 response.raise_for_status()
                 data = response.json()
         except Exception as exc:  # pragma: no cover - network/LLM errors not under test
             LOGGER.warning("Ollama ranking failed: %s", exc)
-            return []
-
-        content = ""
-        if isinstance(data, dict):
-            if isinstance(data.get("message"), dict):
-                content = data["message"].get("content", "")
-            elif "response" in data:
-                content = str(data.get("response", ""))
-
-        if not content:
-            LOGGER.warning("Ollama response missing usable content; falling back to embeddings")
-            return []
+            return ""
 
-        rankings = self._parse_llm_json(content)
-        return self._build_matches_from_rankings(rankings)
+        return self._llm_response_content(data)
 
-    def _build_llm_prompt(self, raw_text: str) -> str:
-        options = self._build_llm_options()
+    def _build_llm_prompt(
+        self, raw_text: str, shortlist: Sequence[MatchCandidate] | None = None
+    ) -> str:
+        options = self._build_llm_options(self._shortlist_ids([shortlist] if shortlist else None))
         if not options:
             LOGGER.warning("LLM backend has no canonical options to evaluate")
         header = (
@@ -211,11 +725,52 @@ class SemanticMatcher:
             f"Canonical options: {json.dumps(options, ensure_ascii=False)}"
         )
 
-    def _build_llm_options(self) -> list[dict[str, Any]]:
+    def _build_llm_batch_prompt(
+        self,
+        raw_texts: Sequence[str],
+        shortlists: Sequence[Sequence[MatchCandidate]] | None = None,
+    ) -> str:
+        """Prompt asking the LLM to rank the shared canonical options for many values.
+
+        With ``shortlists`` only their union is listed and each raw value names the
+        candidate ids it should be ranked against.
+        """
+
+        options = self._build_llm_options(self._shortlist_ids(shortlists))
+        if not options:
+            LOGGER.warning("LLM backend has no canonical options to evaluate")
+        header = (
+            "You are assisting with semantic data harmonization. For each numbered raw "
+            "value, rank the canonical options below from best to worst match. Respond "
+            "with a JSON array containing one object per raw value with its 'index' and "
+            "'matches', a list of objects containing 'id' and 'score' (0-1)."
+        )
+        numbered: list[dict[str, Any]] = []
+        for index, text in enumerate(raw_texts):
+            item: dict[str, Any] = {"index": index, "raw_value": text}
+            if shortlists is not None:
+                item["candidate_ids"] = [candidate.canonical_id for candidate in shortlists[index]]
+            numbered.append(item)
+        return header + (
+            f"\n\nRaw values: {json.dumps(numbered, ensure_ascii=False)}\n\n"
+            f"Canonical options: {json.dumps(options, ensure_ascii=False)}"
+        )
+
+    @staticmethod
+    def _shortlist_ids(
+        shortlists: Sequence[Sequence[MatchCandidate]] | None,
+    ) -> set[int] | None:
+        if shortlists is None:
+            return None
+        return {candidate.canonical_id for shortlist in shortlists for candidate in shortlist}
+
+    def _build_llm_options(self, ids: set[int] | None = None) -> list[dict[str, Any]]:
         options: list[dict[str, Any]] = []
         for canonical in self.canonical_values:
             if canonical.id is None:
                 continue
+            if ids is not None and canonical.id not in ids:
+                continue
             options.append(
                 {
                     "id": canonical.id,
@@ -236,7 +791,7 @@ class SemanticMatcher:
             if canonical.id is not None
         }
 
-        results: list[MatchCandidate] = []
+        scored: list[tuple[float, CanonicalValue]] = []
         for item in rankings:
             if not isinstance(item, dict):
                 continue
@@ -247,20 +802,14 @@ class SemanticMatcher:
                 score = float(item.get("score", 0))
             except (TypeError, ValueError):
                 continue
-            score = max(0.0, min(1.0, score))
-            results.append(
-                MatchCandidate(
-                    canonical_id=canonical.id or 0,
-                    canonical_label=canonical.canonical_label,
-                    dimension=canonical.dimension,
-                    description=canonical.description,
-                    score=round(score, 4),
-                )
-            )
+            scored.append((round(max(0.0, min(1.0, score)), 4), canonical))
 
-        results.sort(key=lambda item: item.score, reverse=True)
         top_k = max(1, self.config.top_k or 5)
-        return results[:top_k]
+        # ``nlargest`` is equivalent to a stable descending sort truncated to ``top_k``.
+        return [
+            self._candidate(canonical, score)
+            for score, canonical in heapq.nlargest(top_k, scored, key=lambda item: item[0])
+        ]
 
     def _parse_llm_json(self, content: str) -> list[dict[str, Any]]:
         text = (content or "").strip()
@@ -301,6 +850,139 @@ class SemanticMatcher:
 
         return [item for item in data if isinstance(item, dict)]
 
+    def _embedding_index(self) -> EmbeddingIndex | None:
+        """Return the prebuilt TF-IDF index for this matcher's canonical values."""
+
+        return _INDEX_CACHE.get_or_build(
+            "embedding",
+            self._dimensions_key(),
+            self._library_signature(),
+            self._build_embedding_index,
+        )
+
+    def _fuzzy_index(self) -> EmbeddingIndex | None:
+        """Return the prebuilt character n-gram index over canonical labels."""
+
+        return _INDEX_CACHE.get_or_build(
+            "fuzzy",
+            self._dimensions_key(),
+            self._library_signature(),
+            self._build_fuzzy_index,
+        )
+
+    def _build_fuzzy_index(self) -> EmbeddingIndex | None:
+        labels = [canonical.canonical_label for canonical in self.canonical_values]
+        vectorizer = TfidfVectorizer(
+            norm=None, analyzer="char_wb", ngram_range=_FUZZY_NGRAM_RANGE
+        )
+        try:
+            return EmbeddingIndex(labels, vectorizer)
+        except ValueError:
+            LOGGER.warning(
+                "Falling back to lexical similarity because n-gram vectorization failed",
+            )
+            return None
+
+    def _uses_fuzzy(self) -> bool:
+        return self.config.matcher_backend == "fuzzy"
+
+    def _build_embedding_index(self) -> EmbeddingIndex | None:
+        sentences = [self._canonical_as_sentence(cv) for cv in self.canonical_values]
+        try:
+            return EmbeddingIndex(sentences)
+        except ValueError:
+            LOGGER.warning(
+                "Falling back to lexical similarity because TF-IDF vectorization failed",
+            )
+            return None
+
+    def _exact_index(self) -> ExactMatchIndex:
+        attribute_keys = tuple(self.config.exact_match_attributes or ())
+        return _INDEX_CACHE.get_or_build(
+            "exact",
+            self._dimensions_key(),
+            f"{self._library_signature()}:{json.dumps(attribute_keys)}",
+            lambda: ExactMatchIndex(self.canonical_values, attribute_keys),
+        )
+
+    def _exact_matches(self, raw_text: str) -> List[MatchCandidate]:
+        if not self.canonical_values:
+            return []
+        return self._exact_index().lookup(raw_text)[: max(1, self.config.top_k or 5)]
+
+    @staticmethod
+    def _candidate(canonical: CanonicalValue, score: float) -> MatchCandidate:
+        return MatchCandidate(
+            canonical_id=canonical.id or 0,
+            canonical_label=canonical.canonical_label,
+            dimension=canonical.dimension,
+            description=canonical.description,
+            score=score,
+        )
+
+    def _lexical_index(self) -> LexicalIndex:
+        """Return the prebuilt inverted token index for this matcher."""
+
+        return _INDEX_CACHE.get_or_build(
+            "lexical",
+            self._dimensions_key(),
+            self._library_signature(),
+            lambda: LexicalIndex(
+                [
+                    self._tokenize(self._canonical_as_sentence(canonical))
+                    for canonical in self.canonical_values
+                ]
+            ),
+        )
+
+    def _dimensions_key(self) -> tuple[str, ...]:
+        if self._dimensions is None:
+            self._dimensions = tuple(
+                sorted({canonical.dimension for canonical in self.canonical_values})
+            )
+        return self._dimensions
+
+    def _library_signature(self) -> str:
+        """Hash the canonical values so cached indexes match this exact snapshot."""
+
+        if self._signature is None:
+            digest = hashlib.sha1()
+            for canonical in self.canonical_values:
+                digest.update(
+                    json.dumps(
+                        [
+                            canonical.id,
+                            canonical.dimension,
+                            canonical.canonical_label,
+                            canonical.description,
+                            canonical.attributes or {},
+                        ],
+                        ensure_ascii=False,
+                        sort_keys=True,
+                        default=str,
+                    ).encode("utf-8")
+                )
+            self._signature = digest.hexdigest()
+        return self._signature
+
+    def _parse_llm_batch_json(self, content: str, count: int) -> list[list[dict[str, Any]]]:
+        """Split a batched LLM reply into per-value ranking lists.
+
+        Items are matched to raw values through their ``index``; values missing from
+        the reply get an empty ranking so callers can fall back to embeddings.
+        """
+
+        rankings: list[list[dict[str, Any]]] = [[] for _ in range(count)]
+        for item in self._parse_llm_json(content):
+            index = item.get("index")
+            matches = item.get("matches")
+            if not isinstance(index, int) or not 0 <= index < count:
+                continue
+            if not isinstance(matches, list):
+                continue
+            rankings[index] = [match for match in matches if isinstance(match, dict)]
+        return rankings
+
     @staticmethod
     def _canonical_as_sentence(canonical: CanonicalValue) -> str:
         if canonical.description:
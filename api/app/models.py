@@ -5,7 +5,7 @@ from __future__ import annotations
 from datetime import datetime, timezone
 from typing import Any, Optional
 
-from sqlalchemy import Column, JSON, UniqueConstraint
+from sqlalchemy import Column, Index, JSON, UniqueConstraint
 from sqlmodel import Field, SQLModel
 
 
@@ -24,11 +24,24 @@ class CanonicalValue(SQLModel, table=True):
     created_at: datetime = Field(
         default_factory=lambda: datetime.now(timezone.utc), nullable=False
     )
+    updated_at: Optional[datetime] = Field(
+        default_factory=lambda: datetime.now(timezone.utc),
+        sa_column_kwargs={"onupdate": lambda: datetime.now(timezone.utc)},
+    )
 
 
 class RawValue(SQLModel, table=True):
     """Raw values awaiting review."""
 
+    __table_args__ = (
+        Index(
+            "uq_rawvalue_dimension_normalised",
+            "dimension",
+            "normalised_text",
+            unique=True,
+        ),
+    )
+
     id: Optional[int] = Field(default=None, primary_key=True)
     dimension: str = Field(index=True)
     raw_text: str = Field(description="Unstandardized text received from source systems.")
@@ -39,11 +52,79 @@ class RawValue(SQLModel, table=True):
         description="Suggested canonical match identifier.",
     )
     notes: Optional[str] = None
+    normalised_text: Optional[str] = Field(
+        default=None,
+        description="Deduplication key; null for rows recorded one per proposal.",
+    )
+    occurrence_count: int = Field(default=1, ge=0)
+    last_seen_at: Optional[datetime] = Field(default=None)
     created_at: datetime = Field(
         default_factory=lambda: datetime.now(timezone.utc), nullable=False
     )
 
 
+class LLMRankingCacheEntry(SQLModel, table=True):
+    """Parsed LLM rankings cached per raw value, dimension, model and library version."""
+
+    id: Optional[int] = Field(default=None, primary_key=True)
+    cache_key: str = Field(
+        index=True,
+        sa_column_kwargs={"unique": True},
+        description="Digest of the normalised raw text, dimension, model and library version.",
+    )
+    raw_text: str = Field(description="Normalised raw text the rankings were produced for.")
+    dimension: str = Field(index=True)
+    llm_model: str = Field(description="Provider mode and model identifier used for scoring.")
+    library_version: str = Field(
+        description="Hash of the canonical options sent to the LLM."
+    )
+    rankings: list[dict[str, Any]] = Field(
+        default_factory=list,
+        sa_column=Column(JSON, nullable=False, server_default="[]"),
+        description="Parsed ranking objects containing canonical ``id`` and ``score``.",
+    )
+    created_at: datetime = Field(
+        default_factory=lambda: datetime.now(timezone.utc), nullable=False, index=True
+    )
+
+
+class Job(SQLModel, table=True):
+    """Long-running operation executed by the in-process job runner."""
+
+    id: Optional[int] = Field(default=None, primary_key=True)
+    kind: str = Field(index=True, description="Registered handler that executes the job.")
+    status: str = Field(
+        default="queued",
+        index=True,
+        description="One of queued, running, succeeded, failed or cancelled.",
+    )
+    params: dict[str, Any] = Field(
+        default_factory=dict,
+        sa_column=Column(JSON, nullable=False, server_default="{}"),
+        description="JSON parameters the job was submitted with.",
+    )
+    progress: float = Field(default=0.0, description="Completed fraction between 0 and 1.")
+    message: Optional[str] = Field(default=None, description="Latest progress note.")
+    result: Optional[Any] = Field(
+        default=None,
+        sa_column=Column(JSON, nullable=True),
+        description="JSON encoded return value of a succeeded job.",
+    )
+    error: Optional[str] = Field(default=None, description="Failure reason of a failed job.")
+    cancel_requested: bool = Field(default=False)
+    created_at: datetime = Field(
+        default_factory=lambda: datetime.now(timezone.utc), nullable=False, index=True
+    )
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    owner: Optional[str] = Field(
+        default=None, description="Job runner (host, process and instance) executing the job."
+    )
+    heartbeat_at: Optional[datetime] = Field(
+        default=None, description="Last time the owning runner reported the job alive."
+    )
+
+
 class SystemConfig(SQLModel, table=True):
     """Single row table containing reviewer-configurable knobs."""
 
@@ -60,6 +141,19 @@ class SystemConfig(SQLModel, table=True):
     llm_api_base: Optional[str] = None
     llm_api_key: Optional[str] = Field(default=None, description="Stored securely in the database.")
     top_k: int = Field(default=5)
+    llm_batch_size: int = Field(
+        default=20,
+        description="Raw values packed into a single LLM prompt during bulk scoring.",
+    )
+    llm_shortlist_size: int = Field(
+        default=20,
+        description="Embedding candidates reranked by the LLM when matcher_backend is 'hybrid'.",
+    )
+    exact_match_attributes: list[str] = Field(
+        default_factory=lambda: ["code"],
+        sa_column=Column(JSON, nullable=False, server_default='["code"]'),
+        description="Canonical attributes whose values short-circuit matching on an exact hit.",
+    )
     updated_at: datetime = Field(
         default_factory=lambda: datetime.now(timezone.utc), nullable=False
     )
@@ -120,6 +214,10 @@ class SourceFieldMapping(SQLModel, table=True):
         description="Canonical reference dimension the field harmonizes to."
     )
     description: Optional[str] = Field(default=None)
+    capture_limit: Optional[int] = Field(
+        default=None,
+        description="Distinct values kept per capture; null uses the default, 0 keeps all.",
+    )
     created_at: datetime = Field(
         default_factory=lambda: datetime.now(timezone.utc), nullable=False
     )
@@ -136,6 +234,17 @@ class SourceFieldMapping(SQLModel, table=True):
 class SourceSample(SQLModel, table=True):
     """Aggregated samples for raw values sourced from external systems."""
 
+    __table_args__ = (
+        Index(
+            "uq_sourcesample_natural_key",
+            "source_connection_id",
+            "source_table",
+            "source_field",
+            "raw_value",
+            unique=True,
+        ),
+    )
+
     id: Optional[int] = Field(default=None, primary_key=True)
     source_connection_id: int = Field(
         foreign_key="sourceconnection.id", index=True, nullable=False
@@ -153,6 +262,69 @@ class SourceSample(SQLModel, table=True):
     )
 
 
+class SourceSchemaCache(SQLModel, table=True):
+    """Reflected table or field metadata of a source connection."""
+
+    __table_args__ = (
+        UniqueConstraint(
+            "source_connection_id", "object_key", name="uq_source_schema_cache_key"
+        ),
+    )
+
+    id: Optional[int] = Field(default=None, primary_key=True)
+    source_connection_id: int = Field(
+        foreign_key="sourceconnection.id", index=True, nullable=False
+    )
+    object_key: str = Field(description="'tables' or 'fields:<schema>.<table>'.")
+    settings_fingerprint: str = Field(
+        description="Fingerprint of the connection settings the metadata was read with."
+    )
+    payload: list[dict[str, Any]] = Field(
+        default_factory=list,
+        sa_column=Column(JSON, nullable=False, server_default="[]"),
+    )
+    refreshed_at: datetime = Field(
+        default_factory=lambda: datetime.now(timezone.utc), nullable=False
+    )
+
+
+class SourceMatchResult(SQLModel, table=True):
+    """Best canonical candidates computed for a distinct source sample value."""
+
+    __table_args__ = (
+        UniqueConstraint(
+            "source_connection_id",
+            "source_table",
+            "source_field",
+            "dimension",
+            "raw_value",
+            name="uq_source_match_result_dimension_value",
+        ),
+    )
+
+    id: Optional[int] = Field(default=None, primary_key=True)
+    source_connection_id: int = Field(
+        foreign_key="sourceconnection.id", index=True, nullable=False
+    )
+    source_table: str
+    source_field: str
+    raw_value: str
+    dimension: str = Field(description="Dimension the value was scored against.")
+    library_version: str = Field(description="Signature of the canonical library used.")
+    config_version: str = Field(description="Fingerprint of the matcher configuration used.")
+    sample_seen_at: datetime = Field(
+        nullable=False, description="Latest sample ``last_seen_at`` covered by this result."
+    )
+    matches: list[dict[str, Any]] = Field(
+        default_factory=list,
+        sa_column=Column(JSON, nullable=False, server_default="[]"),
+        description="Serialised match candidates, best first.",
+    )
+    computed_at: datetime = Field(
+        default_factory=lambda: datetime.now(timezone.utc), nullable=False
+    )
+
+
 class ValueMapping(SQLModel, table=True):
     """Approved mappings from raw source values to canonical entries."""
 
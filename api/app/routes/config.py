@@ -4,12 +4,14 @@ from __future__ import annotations
 
 import logging
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Response, status
 from sqlmodel import Session
 
 from ..database import get_session
-from ..schemas import SystemConfigRead, SystemConfigUpdate
+from ..schemas import LLMCacheStats, SystemConfigRead, SystemConfigUpdate
 from ..services.config import ensure_system_config, system_config_to_read
+from ..services.dimension_catalogue import DimensionCatalogue, get_dimension_catalogue
+from ..services.llm_cache import LLMRankingCache, get_llm_cache
 
 logger = logging.getLogger(__name__)
 
@@ -25,7 +27,9 @@ def read_config(session: Session = Depends(get_session)) -> SystemConfigRead:
 
 @router.put("", response_model=SystemConfigRead)
 def update_config(
-    payload: SystemConfigUpdate, session: Session = Depends(get_session)
+    payload: SystemConfigUpdate,
+    session: Session = Depends(get_session),
+    catalogue: DimensionCatalogue = Depends(get_dimension_catalogue),
 ) -> SystemConfigRead:
     config = ensure_system_config(session)
 
@@ -42,6 +46,7 @@ def update_config(
     session.add(config)
     session.commit()
     session.refresh(config)
+    catalogue.invalidate()
     logger.info(
         "Configuration updated",
         extra={
@@ -51,3 +56,22 @@ def update_config(
         },
     )
     return system_config_to_read(config)
+
+
+@router.get("/llm-cache", response_model=LLMCacheStats)
+def read_llm_cache_stats(
+    llm_cache: LLMRankingCache | None = Depends(get_llm_cache),
+) -> LLMCacheStats:
+    if llm_cache is None:
+        return LLMCacheStats(enabled=False)
+    return LLMCacheStats(enabled=True, **llm_cache.stats())
+
+
+@router.delete("/llm-cache", status_code=status.HTTP_204_NO_CONTENT)
+def clear_llm_cache(
+    llm_cache: LLMRankingCache | None = Depends(get_llm_cache),
+) -> Response:
+    if llm_cache is not None:
+        llm_cache.clear()
+        logger.info("LLM ranking cache cleared")
+    return Response(status_code=status.HTTP_204_NO_CONTENT)
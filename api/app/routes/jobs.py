@@ -0,0 +1,97 @@
+"""Endpoints for submitting and tracking background jobs."""
+
+from __future__ import annotations
+
+import logging
+from typing import Any, List
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import JSONResponse
+from sqlmodel import Session, select
+
+from ..database import get_session
+from ..models import Job
+from ..schemas import JobRead, JobSubmit
+from ..services.jobs import JobRunner, get_job_runner
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/jobs", tags=["jobs"])
+
+
+def accepted_job(job: JobRead) -> JSONResponse:
+    """202 response pointing the client at the job's status endpoint."""
+
+    return JSONResponse(
+        status_code=status.HTTP_202_ACCEPTED,
+        content=job.model_dump(mode="json"),
+        headers={"Location": f"/api/jobs/{job.id}"},
+    )
+
+
+def _require_job(session: Session, job_id: int) -> Job:
+    job = session.get(Job, job_id)
+    if not job:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Job not found")
+    return job
+
+
+@router.post("", response_model=JobRead, status_code=status.HTTP_202_ACCEPTED)
+def submit_job(
+    payload: JobSubmit, runner: JobRunner = Depends(get_job_runner)
+) -> JSONResponse:
+    if not runner.is_submittable(payload.kind):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=(
+                f"Unknown job kind '{payload.kind}'. "
+                f"Available kinds: {', '.join(runner.kinds) or 'none'}."
+            ),
+        )
+    return accepted_job(runner.submit(payload.kind, payload.params))
+
+
+@router.get("", response_model=List[JobRead])
+def list_jobs(
+    status_filter: str | None = Query(None, alias="status"),
+    kind: str | None = Query(None),
+    limit: int = Query(50, ge=1, le=500),
+    session: Session = Depends(get_session),
+    runner: JobRunner = Depends(get_job_runner),
+) -> List[JobRead]:
+    statement = select(Job)
+    if status_filter:
+        statement = statement.where(Job.status == status_filter)
+    if kind:
+        statement = statement.where(Job.kind == kind)
+    jobs = session.exec(statement.order_by(Job.id.desc()).limit(limit)).all()
+    return [runner.describe(job) for job in jobs]
+
+
+@router.get("/{job_id}", response_model=JobRead)
+def get_job(
+    job_id: int,
+    session: Session = Depends(get_session),
+    runner: JobRunner = Depends(get_job_runner),
+) -> JobRead:
+    return runner.describe(_require_job(session, job_id))
+
+
+@router.get("/{job_id}/result")
+def get_job_result(job_id: int, session: Session = Depends(get_session)) -> Any:
+    job = _require_job(session, job_id)
+    if job.status != "succeeded":
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"Job {job_id} is {job.status}" + (f": {job.error}" if job.error else ""),
+        )
+    return job.result
+
+
+@router.post("/{job_id}/cancel", response_model=JobRead)
+def cancel_job(job_id: int, runner: JobRunner = Depends(get_job_runner)) -> JobRead:
+    job = runner.cancel(job_id)
+    if job is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Job not found")
+    logger.info("Job cancellation requested", extra={"job_id": job_id, "status": job.status})
+    return job
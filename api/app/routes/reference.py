@@ -8,8 +8,9 @@ import logging
 import re
 from collections import defaultdict
 from dataclasses import dataclass
+from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any
+from typing import Any, AsyncIterator, Sequence
 
 import pandas as pd
 from fastapi import (
@@ -18,10 +19,15 @@ from fastapi import (
     File,
     Form,
     HTTPException,
+    Query,
+    Request,
     Response,
     UploadFile,
     status,
 )
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+from starlette.requests import ClientDisconnect
 from pydantic import ValidationError
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import aliased
@@ -29,14 +35,12 @@ from sqlalchemy.sql import func
 from sqlmodel import Session, select
 
 from ..database import get_session
-from ..matcher import SemanticMatcher
+from ..matcher import find_exact_matches
 from ..models import (
     CanonicalValue,
     Dimension,
     DimensionRelation,
     DimensionRelationLink,
-    RawValue,
-    SystemConfig,
 )
 from ..schemas import (
     BulkImportColumnMapping,
@@ -55,8 +59,13 @@ from ..schemas import (
     DimensionRelationRead,
     DimensionRelationUpdate,
     DimensionUpdate,
+    MatchCandidate,
+    MatchBatchItem,
+    MatchBatchRequest,
+    MatchBatchResponse,
     MatchRequest,
     MatchResponse,
+    MatchStreamError,
     ProposedDimension,
 )
 from ..services.dimensions import (
@@ -69,6 +78,21 @@ from ..services.dimensions import (
     validate_attributes,
     validate_extra_fields,
 )
+from ..services.dimension_catalogue import (
+    CatalogueSnapshot,
+    DimensionCatalogue,
+    get_dimension_catalogue,
+)
+from ..services.jobs import (
+    JobContext,
+    JobRunner,
+    ProgressCallback,
+    get_job_runner,
+    no_progress,
+)
+from ..services.matcher_registry import MatcherRegistry, get_matcher_registry
+from ..services.raw_values import RawValueRecorder, compact_raw_values, get_raw_value_recorder
+from .jobs import accepted_job
 
 logger = logging.getLogger(__name__)
 
@@ -926,7 +950,9 @@ async def preview_canonical_import(
     status_code=status.HTTP_201_CREATED,
 )
 def create_canonical_value(
-    payload: CanonicalValueCreate, session: Session = Depends(get_session)
+    payload: CanonicalValueCreate,
+    session: Session = Depends(get_session),
+    matchers: MatcherRegistry = Depends(get_matcher_registry),
 ) -> CanonicalValue:
     """Create and persist a canonical value."""
 
@@ -942,6 +968,7 @@ def create_canonical_value(
     session.add(canonical)
     session.commit()
     session.refresh(canonical)
+    matchers.bump(canonical.dimension)
     return canonical
 
 
@@ -950,6 +977,7 @@ def update_canonical_value(
     canonical_id: int,
     payload: CanonicalValueUpdate,
     session: Session = Depends(get_session),
+    matchers: MatcherRegistry = Depends(get_matcher_registry),
 ) -> CanonicalValue:
     """Update an existing canonical value."""
 
@@ -959,6 +987,7 @@ def update_canonical_value(
             status_code=status.HTTP_404_NOT_FOUND, detail="Canonical value not found"
         )
 
+    previous_dimension = canonical.dimension
     target_dimension_code = payload.dimension or canonical.dimension
     dimension = require_dimension(session, target_dimension_code)
 
@@ -977,12 +1006,17 @@ def update_canonical_value(
     session.add(canonical)
     session.commit()
     session.refresh(canonical)
+    matchers.bump(previous_dimension)
+    if canonical.dimension != previous_dimension:
+        matchers.bump(canonical.dimension)
     return canonical
 
 
 @router.delete("/canonical/{canonical_id}", status_code=status.HTTP_204_NO_CONTENT)
 def delete_canonical_value(
-    canonical_id: int, session: Session = Depends(get_session)
+    canonical_id: int,
+    session: Session = Depends(get_session),
+    matchers: MatcherRegistry = Depends(get_matcher_registry),
 ) -> Response:
     """Remove a canonical value."""
 
@@ -992,97 +1026,332 @@ def delete_canonical_value(
             status_code=status.HTTP_404_NOT_FOUND, detail="Canonical value not found"
         )
 
+    dimension_code = canonical.dimension
     remove_links_for_canonical(session, canonical_id)
     session.delete(canonical)
     session.commit()
+    matchers.bump(dimension_code)
     return Response(status_code=status.HTTP_204_NO_CONTENT)
 
 
+def _rank_with_library(
+    session: Session,
+    catalogue: CatalogueSnapshot,
+    matchers: MatcherRegistry,
+    raw_text: str,
+    dimension_code: str,
+) -> tuple[str, list[MatchCandidate]]:
+    """Score ``raw_text`` against the library, widening the dimension when empty."""
+
+    return _rank_many_with_library(session, catalogue, matchers, [raw_text], dimension_code)[0]
+
+
+def _rank_many_with_library(
+    session: Session,
+    catalogue: CatalogueSnapshot,
+    matchers: MatcherRegistry,
+    raw_texts: list[str],
+    dimension_code: str,
+) -> list[tuple[str, list[MatchCandidate]]]:
+    """Score ``raw_texts`` against one dimension, widening it when the library is empty.
+
+    Falls back to the default dimension, then to global exact matches per value
+    and finally to the dimension with the most canonical values. Every fallback
+    decision is read from the catalogue snapshot rather than the database.
+    """
+
+    config = catalogue.config
+    if not catalogue.has_values(dimension_code) and dimension_code != config.default_dimension:
+        dimension_code = catalogue.require(config.default_dimension)
+
+    if catalogue.has_values(dimension_code):
+        matcher = matchers.get(session, config, dimension_code)
+        return [(dimension_code, ranked) for ranked in matcher.rank_many(raw_texts)]
+
+    results: list[tuple[str, list[MatchCandidate]]] = [(dimension_code, [])] * len(raw_texts)
+    pending: list[int] = []
+    top_k = max(1, config.top_k or 5)
+    for position, raw_text in enumerate(raw_texts):
+        direct_match = find_exact_matches(
+            session,
+            raw_text,
+            config.exact_match_attributes or [],
+            library_signature=catalogue.library_signature(),
+        )
+        if direct_match:
+            direct_dimension = direct_match[0].dimension
+            results[position] = (
+                direct_dimension,
+                [match for match in direct_match if match.dimension == direct_dimension][:top_k],
+            )
+        else:
+            pending.append(position)
+
+    if pending:
+        if catalogue.richest_dimension:
+            dimension_code = catalogue.richest_dimension
+        matcher = matchers.get(session, config, dimension_code)
+        ranked = matcher.rank_many([raw_texts[position] for position in pending])
+        for position, matches in zip(pending, ranked):
+            results[position] = (dimension_code, matches)
+    return results
+
+
 @router.post("/propose", response_model=MatchResponse)
 def propose_match(
-    payload: MatchRequest, session: Session = Depends(get_session)
+    payload: MatchRequest,
+    session: Session = Depends(get_session),
+    matchers: MatcherRegistry = Depends(get_matcher_registry),
+    raw_values: RawValueRecorder = Depends(get_raw_value_recorder),
 ) -> MatchResponse:
     """Score canonical matches for a raw value and persist the raw record."""
 
-    config = session.exec(select(SystemConfig)).first()
-    if not config:
-        raise HTTPException(status_code=500, detail="System configuration missing")
+    catalogue = matchers.catalogue.snapshot(session)
+    config = catalogue.config
+    dimension_code = catalogue.require(payload.dimension or config.default_dimension)
+    exact_attributes = config.exact_match_attributes or []
+    top_k = max(1, config.top_k or 5)
 
-    if payload.dimension:
-        dimension = require_dimension(session, payload.dimension)
-    else:
-        dimension = require_dimension(session, config.default_dimension)
+    ranked = find_exact_matches(
+        session,
+        payload.raw_text,
+        exact_attributes,
+        dimension=dimension_code,
+        library_signature=catalogue.library_signature(dimension_code),
+    )[:top_k]
+    if not ranked:
+        dimension_code, ranked = _rank_with_library(
+            session, catalogue, matchers, payload.raw_text, dimension_code
+        )
+    filtered = [match for match in ranked if match.score >= config.match_threshold]
 
-    dimension_code = dimension.code
+    raw_values.record(
+        session,
+        [_raw_value_row(dimension_code, payload.raw_text, filtered, datetime.now(timezone.utc))],
+    )
 
-    canonical_values = session.exec(
-        select(CanonicalValue).where(CanonicalValue.dimension == dimension_code)
-    ).all()
+    return MatchResponse(
+        raw_text=payload.raw_text, dimension=dimension_code, matches=filtered
+    )
 
-    if not canonical_values and dimension_code != config.default_dimension:
-        fallback_dimension = require_dimension(session, config.default_dimension)
-        canonical_values = session.exec(
-            select(CanonicalValue).where(
-                CanonicalValue.dimension == fallback_dimension.code
-            )
-        ).all()
-        dimension_code = fallback_dimension.code
 
-    normalised_raw = payload.raw_text.strip().lower()
+@router.post("/propose/batch", response_model=MatchBatchResponse)
+def propose_matches(
+    payload: MatchBatchRequest,
+    session: Session = Depends(get_session),
+    matchers: MatcherRegistry = Depends(get_matcher_registry),
+    raw_values: RawValueRecorder = Depends(get_raw_value_recorder),
+) -> MatchBatchResponse:
+    """Score many raw values at once and persist their raw records in one insert.
+
+    Dimensions are resolved once per distinct code and each dimension is ranked
+    through a single shared matcher, so results match per-item ``/propose``
+    calls at a fraction of the round trips.
+    """
+
+    catalogue = matchers.catalogue.snapshot(session)
+    default_code = payload.dimension or catalogue.config.default_dimension
+    catalogue.require_all(item.dimension or default_code for item in payload.items)
+    return MatchBatchResponse(
+        results=_propose_batch(
+            session, catalogue, matchers, raw_values, payload.items, default_code
+        )
+    )
 
-    if not canonical_values:
-        direct_match = session.exec(
-            select(CanonicalValue).where(
-                func.lower(CanonicalValue.canonical_label) == normalised_raw
+
+def _propose_batch(
+    session: Session,
+    catalogue: CatalogueSnapshot,
+    matchers: MatcherRegistry,
+    raw_values: RawValueRecorder,
+    items: Sequence[MatchBatchItem],
+    default_code: str,
+) -> list[MatchResponse]:
+    """Rank ``items`` (whose dimensions must exist) and bulk insert their raw values."""
+
+    if not items:
+        return []
+    config = catalogue.config
+    requested = [item.dimension or default_code for item in items]
+    exact_attributes = config.exact_match_attributes or []
+    top_k = max(1, config.top_k or 5)
+    groups: dict[str, list[int]] = defaultdict(list)
+    for position, dimension_code in enumerate(requested):
+        groups[dimension_code].append(position)
+
+    ranked: list[tuple[str, list[MatchCandidate]]] = [("", [])] * len(items)
+    for dimension_code, positions in groups.items():
+        pending: list[int] = []
+        for position in positions:
+            raw_text = items[position].raw_text
+            exact = find_exact_matches(
+                session,
+                raw_text,
+                exact_attributes,
+                dimension=dimension_code,
+                library_signature=catalogue.library_signature(dimension_code),
+            )[:top_k]
+            if exact:
+                ranked[position] = (dimension_code, exact)
+            else:
+                pending.append(position)
+        if pending:
+            scored = _rank_many_with_library(
+                session,
+                catalogue,
+                matchers,
+                [items[position].raw_text for position in pending],
+                dimension_code,
             )
-        ).all()
+            for position, result in zip(pending, scored):
+                ranked[position] = result
+
+    now = datetime.now(timezone.utc)
+    results: list[MatchResponse] = []
+    rows: list[dict[str, Any]] = []
+    for item, (dimension_code, matches) in zip(items, ranked):
+        filtered = [match for match in matches if match.score >= config.match_threshold]
+        results.append(
+            MatchResponse(raw_text=item.raw_text, dimension=dimension_code, matches=filtered)
+        )
+        rows.append(_raw_value_row(dimension_code, item.raw_text, filtered, now))
+    raw_values.record(session, rows)
 
-        if direct_match:
-            dimension_code = direct_match[0].dimension
-            canonical_values = session.exec(
-                select(CanonicalValue).where(
-                    CanonicalValue.dimension == dimension_code
-                )
-            ).all()
-
-    if not canonical_values:
-        richest_dimension = session.exec(
-            select(CanonicalValue.dimension)
-                .group_by(CanonicalValue.dimension)
-                .order_by(func.count(CanonicalValue.id).desc())
-        ).first()
-
-        dimension_value = None
-        if isinstance(richest_dimension, tuple):
-            dimension_value = richest_dimension[0]
-        elif isinstance(richest_dimension, str):
-            dimension_value = richest_dimension
-
-        if dimension_value:
-            dimension_code = dimension_value
-            canonical_values = session.exec(
-                select(CanonicalValue).where(
-                    CanonicalValue.dimension == dimension_code
-                )
-            ).all()
+    logger.info(
+        "Batch match proposal processed",
+        extra={
+            "items": len(rows),
+            "dimensions": len(groups),
+            "suggested": sum(1 for row in rows if row["status"] == "suggested"),
+        },
+    )
+    return results
 
-    matcher = SemanticMatcher(config=config, canonical_values=canonical_values)
-    ranked = matcher.rank(payload.raw_text)
-    filtered = [match for match in ranked if match.score >= config.match_threshold]
 
-    raw = RawValue(
-        dimension=dimension_code,
-        raw_text=payload.raw_text,
-        status="suggested" if filtered else "pending",
-        proposed_canonical_id=filtered[0].canonical_id if filtered else None,
-    )
-    session.add(raw)
-    session.commit()
-    session.refresh(raw)
+def _raw_value_row(
+    dimension_code: str, raw_text: str, matches: list[MatchCandidate], created_at: datetime
+) -> dict[str, Any]:
+    return {
+        "dimension": dimension_code,
+        "raw_text": raw_text,
+        "status": "suggested" if matches else "pending",
+        "proposed_canonical_id": matches[0].canonical_id if matches else None,
+        "occurrence_count": 1,
+        "last_seen_at": created_at,
+        "created_at": created_at,
+    }
 
-    return MatchResponse(
-        raw_text=payload.raw_text, dimension=dimension_code, matches=filtered
-    )
+
+@router.post("/propose/stream")
+async def propose_match_stream(
+    request: Request,
+    dimension: str | None = Query(
+        None, description="Dimension applied to lines that do not name one."
+    ),
+    chunk_size: int = Query(500, ge=1, le=5000),
+    matchers: MatcherRegistry = Depends(get_matcher_registry),
+    raw_values: RawValueRecorder = Depends(get_raw_value_recorder),
+) -> StreamingResponse:
+    """Score an NDJSON stream of ``{"raw_text", "dimension"}`` lines chunk by chunk.
+
+    Each chunk is ranked and persisted like ``/propose/batch`` and written back as
+    ``MatchResponse`` lines before the next chunk is read, so memory stays bounded
+    by ``chunk_size`` however long the feed is. Lines that fail to parse or name an
+    unknown dimension yield a ``MatchStreamError`` line instead.
+    """
+
+    engine = request.app.state.engine
+
+    async def results() -> AsyncIterator[str]:
+        chunk: list[tuple[int, bytes]] = []
+        try:
+            async for line_number, line in _iter_ndjson_lines(request):
+                chunk.append((line_number, line))
+                if len(chunk) >= chunk_size:
+                    yield await run_in_threadpool(
+                        _propose_stream_chunk, engine, matchers, raw_values, chunk, dimension
+                    )
+                    chunk = []
+        except ClientDisconnect:
+            logger.info("Streaming proposal client disconnected")
+            return
+        if chunk:
+            yield await run_in_threadpool(
+                _propose_stream_chunk, engine, matchers, raw_values, chunk, dimension
+            )
+
+    return _RequestStreamingResponse(results(), media_type="application/x-ndjson")
+
+
+class _RequestStreamingResponse(StreamingResponse):
+    """Streaming response whose body iterator keeps reading the request body.
+
+    ``StreamingResponse`` listens for disconnects on ``receive`` concurrently,
+    which would swallow request body messages the iterator is waiting for.
+    Here disconnects surface through ``request.stream()`` instead.
+    """
+
+    async def __call__(self, scope: Any, receive: Any, send: Any) -> None:
+        await self.stream_response(send)
+        if self.background is not None:
+            await self.background()
+
+
+async def _iter_ndjson_lines(request: Request) -> AsyncIterator[tuple[int, bytes]]:
+    """Yield non-blank request body lines with their 1-based line numbers."""
+
+    buffer = b""
+    line_number = 0
+    async for received in request.stream():
+        buffer += received
+        *lines, buffer = buffer.split(b"\n")
+        for line in lines:
+            line_number += 1
+            if line.strip():
+                yield line_number, line
+    if buffer.strip():
+        yield line_number + 1, buffer
+
+
+def _propose_stream_chunk(
+    engine: Any,
+    matchers: MatcherRegistry,
+    raw_values: RawValueRecorder,
+    chunk: list[tuple[int, bytes]],
+    dimension: str | None,
+) -> str:
+    # Runs on a worker thread with its own session: request-scoped sessions are
+    # closed before a streaming response body is produced.
+    with Session(engine) as session:
+        catalogue = matchers.catalogue.snapshot(session)
+        default_code = dimension or catalogue.config.default_dimension
+
+        output: list[str] = [""] * len(chunk)
+        parsed: list[tuple[int, MatchBatchItem]] = []
+        for position, (line_number, line) in enumerate(chunk):
+            try:
+                parsed.append((position, MatchBatchItem.model_validate_json(line)))
+            except ValidationError as exc:
+                output[position] = MatchStreamError(
+                    line=line_number, error=exc.errors()[0]["msg"]
+                ).model_dump_json()
+
+        valid: list[tuple[int, MatchBatchItem]] = []
+        for position, item in parsed:
+            code = item.dimension or default_code
+            if code in catalogue.dimensions:
+                valid.append((position, item))
+            else:
+                output[position] = MatchStreamError(
+                    line=chunk[position][0], error=f"Dimension '{code}' not found."
+                ).model_dump_json()
+
+        responses = _propose_batch(
+            session, catalogue, matchers, raw_values, [item for _, item in valid], default_code
+        )
+        for (position, _), response in zip(valid, responses):
+            output[position] = response.model_dump_json()
+    return "".join(f"{line}\n" for line in output)
 
 
 @router.get("/dimensions", response_model=list[DimensionRead])
@@ -1094,7 +1363,9 @@ def list_dimensions(session: Session = Depends(get_session)) -> list[DimensionRe
 
 @router.post("/dimensions", response_model=DimensionRead, status_code=status.HTTP_201_CREATED)
 def create_dimension(
-    payload: DimensionCreate, session: Session = Depends(get_session)
+    payload: DimensionCreate,
+    session: Session = Depends(get_session),
+    catalogue: DimensionCatalogue = Depends(get_dimension_catalogue),
 ) -> DimensionRead:
     extra_schema = validate_extra_fields(payload.extra_fields)
     dimension = Dimension(
@@ -1114,6 +1385,7 @@ def create_dimension(
             detail=f"Dimension '{payload.code}' already exists.",
         ) from exc
 
+    catalogue.invalidate()
     session.refresh(dimension)
     return dimension_to_read_model(dimension)
 
@@ -1139,11 +1411,16 @@ def update_dimension(
 
 
 @router.delete("/dimensions/{code}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_dimension(code: str, session: Session = Depends(get_session)) -> Response:
+def delete_dimension(
+    code: str,
+    session: Session = Depends(get_session),
+    catalogue: DimensionCatalogue = Depends(get_dimension_catalogue),
+) -> Response:
     dimension = require_dimension(session, code)
     ensure_dimension_can_be_removed(session, code)
     session.delete(dimension)
     session.commit()
+    catalogue.invalidate()
     return Response(status_code=status.HTTP_204_NO_CONTENT)
 
 
@@ -1421,6 +1698,7 @@ def delete_dimension_relation_link(
 )
 async def import_canonical_values(
     session: Session = Depends(get_session),
+    matchers: MatcherRegistry = Depends(get_matcher_registry),
     dimension: str | None = Form(default=None),
     file: UploadFile | None = File(default=None),
     inline_text: str | None = Form(default=None),
@@ -1428,6 +1706,8 @@ async def import_canonical_values(
     sheet: str | None = Form(default=None),
     dry_run: str | None = Form(default=None),
     duplicate_strategy: str | None = Form(default=None),
+    background: bool = Query(False, description="Run as a background job"),
+    jobs: JobRunner = Depends(get_job_runner),
 ) -> BulkImportResult:
     if not file and not inline_text:
         raise HTTPException(
@@ -1453,6 +1733,32 @@ async def import_canonical_values(
         },
     )
 
+    options = {
+        "filename": filename,
+        "dimension": dimension,
+        "mapping": mapping,
+        "sheet": sheet,
+        "dry_run": dry_run,
+        "duplicate_strategy": duplicate_strategy,
+    }
+    if background:
+        return accepted_job(jobs.submit(IMPORT_CANONICAL_JOB, options, payload=payload_bytes))
+    return _import_canonical_payload(session, matchers, payload_bytes, **options)
+
+
+def _import_canonical_payload(
+    session: Session,
+    matchers: MatcherRegistry,
+    payload_bytes: bytes,
+    *,
+    filename: str,
+    dimension: str | None,
+    mapping: str | None,
+    sheet: str | None,
+    dry_run: str | None,
+    duplicate_strategy: str | None,
+    progress: ProgressCallback = no_progress,
+) -> BulkImportResult:
     loaded = _load_dataframe(payload_bytes, filename, sheet)
 
     mapping_payload: BulkImportColumnMapping | None = None
@@ -1528,58 +1834,65 @@ async def import_canonical_values(
 
     _ensure_dimensions_persisted(session, plan, dimension_cache, pending_dimension_codes)
 
-    for row in prepared_rows:
-        dimension_model = dimension_cache.get(row.dimension_code)
-        if not dimension_model:
-            errors.append(
-                f"Row {row.row_number}: Dimension '{row.dimension_code}' does not exist."
-            )
-            continue
-
-        key = (row.dimension_code, row.canonical_label)
-        existing = existing_lookup.get(key)
-
-        if existing:
-            if duplicate_mode == "skip":
+    try:
+        for position, row in enumerate(prepared_rows):
+            if position % 100 == 0:
+                progress(position, len(prepared_rows))
+            dimension_model = dimension_cache.get(row.dimension_code)
+            if not dimension_model:
                 errors.append(
-                    f"Row {row.row_number}: Skipped existing canonical value "
-                    f"'{row.canonical_label}'."
+                    f"Row {row.row_number}: Dimension '{row.dimension_code}' does not exist."
                 )
                 continue
-            if duplicate_mode == "update":
-                if row.description is not None:
-                    existing.description = row.description
-                if row.attributes:
-                    merged = dict(existing.attributes or {})
-                    merged.update(row.attributes)
-                    existing.attributes = merged
-                elif existing.attributes is None:
-                    existing.attributes = {}
-                session.add(existing)
-                session.commit()
-                session.refresh(existing)
-                updated.append(CanonicalValueRead.model_validate(existing))
-                continue
 
-        canonical = CanonicalValue(
-            dimension=row.dimension_code,
-            canonical_label=row.canonical_label,
-            description=row.description,
-            attributes=row.attributes,
-        )
+            key = (row.dimension_code, row.canonical_label)
+            existing = existing_lookup.get(key)
 
-        session.add(canonical)
-        try:
-            session.commit()
-        except IntegrityError as exc:  # pragma: no cover - depends on DB constraints
-            session.rollback()
-            errors.append(
-                f"Row {row.row_number}: Unable to persist canonical value ({exc.orig})."
+            if existing:
+                if duplicate_mode == "skip":
+                    errors.append(
+                        f"Row {row.row_number}: Skipped existing canonical value "
+                        f"'{row.canonical_label}'."
+                    )
+                    continue
+                if duplicate_mode == "update":
+                    if row.description is not None:
+                        existing.description = row.description
+                    if row.attributes:
+                        merged = dict(existing.attributes or {})
+                        merged.update(row.attributes)
+                        existing.attributes = merged
+                    elif existing.attributes is None:
+                        existing.attributes = {}
+                    session.add(existing)
+                    session.commit()
+                    session.refresh(existing)
+                    updated.append(CanonicalValueRead.model_validate(existing))
+                    continue
+
+            canonical = CanonicalValue(
+                dimension=row.dimension_code,
+                canonical_label=row.canonical_label,
+                description=row.description,
+                attributes=row.attributes,
             )
-            continue
 
-        session.refresh(canonical)
-        created.append(CanonicalValueRead.model_validate(canonical))
+            session.add(canonical)
+            try:
+                session.commit()
+            except IntegrityError as exc:  # pragma: no cover - depends on DB constraints
+                session.rollback()
+                errors.append(
+                    f"Row {row.row_number}: Unable to persist canonical value ({exc.orig})."
+                )
+                continue
+
+            session.refresh(canonical)
+            created.append(CanonicalValueRead.model_validate(canonical))
+    finally:
+        # Rows committed before a failure or cancellation must still refresh matchers.
+        for dimension_code in {row.dimension_code for row in prepared_rows}:
+            matchers.bump(dimension_code)
 
     logger.info(
         "Bulk canonical import processed",
@@ -1595,3 +1908,30 @@ async def import_canonical_values(
         duplicates=[],
         errors=errors,
     )
+
+
+IMPORT_CANONICAL_JOB = "reference.import_canonical"
+
+
+def _run_import_canonical(context: JobContext) -> BulkImportResult:
+    return _import_canonical_payload(
+        context.session,
+        context.state.matcher_registry,
+        context.payload,
+        progress=context.report,
+        **context.params,
+    )
+
+
+COMPACT_RAW_VALUES_JOB = "reference.compact_raw_values"
+
+
+def _run_compact_raw_values(context: JobContext) -> dict[str, int]:
+    return compact_raw_values(context.session, progress=context.report)
+
+
+def register_jobs(runner: JobRunner) -> None:
+    """Register the reference workflows that can run as background jobs."""
+
+    runner.register(IMPORT_CANONICAL_JOB, _run_import_canonical, submittable=False)
+    runner.register(COMPACT_RAW_VALUES_JOB, _run_compact_raw_values)
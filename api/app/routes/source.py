@@ -5,7 +5,7 @@ from __future__ import annotations
 from datetime import datetime, timezone
 from io import BytesIO, StringIO
 from pathlib import Path
-from typing import Iterable, List, Literal, Sequence
+from typing import Any, Iterable, List, Literal, Sequence
 
 import pandas as pd
 from fastapi import (APIRouter, Body, Depends, File, HTTPException, Query, Response,
@@ -19,7 +19,9 @@ from ..models import (
     CanonicalValue,
     SourceConnection,
     SourceFieldMapping,
+    SourceMatchResult,
     SourceSample,
+    SourceSchemaCache,
     SystemConfig,
     ValueMapping,
 )
@@ -32,6 +34,7 @@ from ..schemas import (
     SourceConnectionTestPayload,
     SourceConnectionTestResult,
     SourceConnectionUpdate,
+    SourceFieldCaptureResult,
     SourceFieldMappingCreate,
     SourceFieldMappingRead,
     SourceFieldMappingUpdate,
@@ -47,15 +50,40 @@ from ..schemas import (
     ValueMappingRead,
     ValueMappingUpdate,
 )
+from ..services.jobs import (
+    JobContext,
+    JobRunner,
+    ProgressCallback,
+    get_job_runner,
+    no_progress,
+)
+from ..services.match_results import rank_source_samples
+from ..services.matcher_registry import MatcherRegistry, get_matcher_registry
+from ..services.schema_cache import (
+    TABLES_KEY,
+    SchemaCatalogueCache,
+    fields_key,
+    get_schema_cache,
+)
 from ..services.source_connections import (
     SourceConnectionServiceError,
+    SourceEngineRegistry,
+    get_source_engines,
     list_fields as service_list_fields,
+    list_schema_fields as service_list_schema_fields,
     list_tables as service_list_tables,
     merge_settings,
-    sample_field_values as service_sample_field_values,
+    stream_table_fields as service_stream_table_fields,
     settings_from_payload,
+    supports_bulk_catalogue,
     test_connection as service_test_connection,
 )
+from ..services.source_samples import (
+    CapturePolicy,
+    get_capture_policy,
+    upsert_source_samples,
+)
+from .jobs import accepted_job
 
 
 router = APIRouter(prefix="/source", tags=["source"])
@@ -83,13 +111,6 @@ def _split_table_identifier(identifier: str) -> tuple[str, str | None]:
     return identifier.strip('"'), None
 
 
-def _load_canonical_values(
-    session: Session, dimension: str
-) -> Sequence[CanonicalValue]:
-    statement = select(CanonicalValue).where(CanonicalValue.dimension == dimension)
-    return session.exec(statement).all()
-
-
 def _canonical_lookup(session: Session, identifiers: set[int]) -> dict[int, CanonicalValue]:
     if not identifiers:
         return {}
@@ -187,6 +208,8 @@ def update_connection(
     connection_id: int,
     payload: SourceConnectionUpdate,
     session: Session = Depends(get_session),
+    engines: SourceEngineRegistry | None = Depends(get_source_engines),
+    schema_cache: SchemaCatalogueCache = Depends(get_schema_cache),
 ) -> SourceConnection:
     connection = _require_connection(session, connection_id)
     data = payload.model_dump(exclude_unset=True)
@@ -201,6 +224,7 @@ def update_connection(
         connection.password = password
 
     connection.touch()
+    schema_cache.clear(session, connection_id)
     try:
         session.add(connection)
         session.commit()
@@ -208,13 +232,17 @@ def update_connection(
         session.rollback()
         raise HTTPException(status_code=400, detail="Connection name must be unique") from exc
 
+    if engines is not None:
+        engines.discard(connection_id)
     session.refresh(connection)
     return connection
 
 
 @router.delete("/connections/{connection_id}", status_code=status.HTTP_204_NO_CONTENT)
 def delete_connection(
-    connection_id: int, session: Session = Depends(get_session)
+    connection_id: int,
+    session: Session = Depends(get_session),
+    engines: SourceEngineRegistry | None = Depends(get_source_engines),
 ) -> Response:
     connection = _require_connection(session, connection_id)
 
@@ -230,9 +258,21 @@ def delete_connection(
     session.exec(
         delete(ValueMapping).where(ValueMapping.source_connection_id == connection_id)
     )
+    session.exec(
+        delete(SourceMatchResult).where(
+            SourceMatchResult.source_connection_id == connection_id
+        )
+    )
+    session.exec(
+        delete(SourceSchemaCache).where(
+            SourceSchemaCache.source_connection_id == connection_id
+        )
+    )
 
     session.delete(connection)
     session.commit()
+    if engines is not None:
+        engines.discard(connection_id)
     return Response(status_code=status.HTTP_204_NO_CONTENT)
 
 
@@ -257,6 +297,7 @@ def test_existing_connection(
     connection_id: int,
     overrides: SourceConnectionTestOverrides | None = Body(default=None),
     session: Session = Depends(get_session),
+    engines: SourceEngineRegistry | None = Depends(get_source_engines),
 ) -> SourceConnectionTestResult:
     connection = _require_connection(session, connection_id)
     override_data = (
@@ -267,7 +308,8 @@ def test_existing_connection(
 
     try:
         settings = merge_settings(connection, override_data)
-        latency_ms = service_test_connection(settings)
+        # Overridden settings are a one-off probe; keep them out of the shared pool.
+        latency_ms = service_test_connection(settings, None if override_data else engines)
     except SourceConnectionServiceError as exc:
         raise HTTPException(status_code=400, detail=str(exc)) from exc
 
@@ -279,13 +321,24 @@ def test_existing_connection(
     response_model=List[SourceTableMetadata],
 )
 def list_source_tables(
-    connection_id: int, session: Session = Depends(get_session)
+    connection_id: int,
+    refresh: bool = Query(False, description="Bypass the cached schema catalogue"),
+    session: Session = Depends(get_session),
+    engines: SourceEngineRegistry | None = Depends(get_source_engines),
+    schema_cache: SchemaCatalogueCache = Depends(get_schema_cache),
 ) -> List[SourceTableMetadata]:
     connection = _require_connection(session, connection_id)
 
     try:
         settings = merge_settings(connection)
-        records = service_list_tables(settings)
+        records = schema_cache.load(
+            session,
+            connection_id,
+            settings.fingerprint(),
+            TABLES_KEY,
+            lambda: service_list_tables(settings, engines),
+            refresh=refresh,
+        )
     except SourceConnectionServiceError as exc:
         raise HTTPException(status_code=400, detail=str(exc)) from exc
 
@@ -300,7 +353,10 @@ def list_source_fields(
     connection_id: int,
     table_name: str,
     schema: str | None = Query(default=None),
+    refresh: bool = Query(False, description="Bypass the cached schema catalogue"),
     session: Session = Depends(get_session),
+    engines: SourceEngineRegistry | None = Depends(get_source_engines),
+    schema_cache: SchemaCatalogueCache = Depends(get_schema_cache),
 ) -> List[SourceFieldMetadata]:
     connection = _require_connection(session, connection_id)
 
@@ -318,7 +374,35 @@ def list_source_fields(
 
     try:
         settings = merge_settings(connection)
-        records = service_list_fields(settings, effective_table, effective_schema)
+        fingerprint = settings.fingerprint()
+
+        def load_fields() -> list[dict[str, Any]]:
+            if not (schema_cache.enabled and supports_bulk_catalogue(settings)):
+                return service_list_fields(settings, effective_table, effective_schema, engines)
+            # One catalogue scan fills the cache for every table in the schema.
+            schema_fields = service_list_schema_fields(settings, effective_schema, engines)
+            schema_cache.store(
+                session,
+                connection_id,
+                fingerprint,
+                {
+                    fields_key(name, effective_schema): fields
+                    for name, fields in schema_fields.items()
+                    if name != effective_table
+                },
+            )
+            if effective_table not in schema_fields:
+                return service_list_fields(settings, effective_table, effective_schema, engines)
+            return schema_fields[effective_table]
+
+        records = schema_cache.load(
+            session,
+            connection_id,
+            fingerprint,
+            fields_key(effective_table, effective_schema),
+            load_fields,
+            refresh=refresh,
+        )
     except SourceConnectionServiceError as exc:
         raise HTTPException(status_code=400, detail=str(exc)) from exc
 
@@ -406,65 +490,226 @@ def delete_field_mapping(
 
 @router.post(
     "/connections/{connection_id}/mappings/{mapping_id}/capture",
-    response_model=List[SourceSampleRead],
+    response_model=List[SourceSampleRead] | SourceFieldCaptureResult,
     status_code=status.HTTP_201_CREATED,
 )
 def capture_mapping_samples(
     connection_id: int,
     mapping_id: int,
+    background: bool = Query(False, description="Run as a background job"),
+    summary: bool = Query(False, description="Return only the number of captured values"),
     session: Session = Depends(get_session),
-) -> List[SourceSample]:
+    jobs: JobRunner = Depends(get_job_runner),
+    engines: SourceEngineRegistry | None = Depends(get_source_engines),
+    policy: CapturePolicy = Depends(get_capture_policy),
+) -> List[SourceSampleRead] | SourceFieldCaptureResult:
+    connection, mapping = _require_mapping(session, connection_id, mapping_id)
+    if background:
+        return accepted_job(
+            jobs.submit(
+                CAPTURE_SAMPLES_JOB,
+                {"connection_id": connection_id, "mapping_id": mapping_id},
+            )
+        )
+    if summary:
+        return _capture_samples(session, connection, mapping, engines=engines, policy=policy)
+    samples: list[SourceSampleRead] = []
+    _capture_samples(
+        session, connection, mapping, engines=engines, policy=policy, samples=samples
+    )
+    return samples
+
+
+def _require_mapping(
+    session: Session, connection_id: int, mapping_id: int
+) -> tuple[SourceConnection, SourceFieldMapping]:
     connection = _require_connection(session, connection_id)
     mapping = session.get(SourceFieldMapping, mapping_id)
     if not mapping or mapping.source_connection_id != connection.id:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Mapping not found")
+    return connection, mapping
+
+
+def _capture_samples(
+    session: Session,
+    connection: SourceConnection,
+    mapping: SourceFieldMapping,
+    progress: ProgressCallback = no_progress,
+    engines: SourceEngineRegistry | None = None,
+    policy: CapturePolicy = CapturePolicy(),
+    *,
+    samples: list[SourceSampleRead] | None = None,
+) -> SourceFieldCaptureResult:
+    """Capture the mapping's value distribution, streamed and committed in chunks.
+
+    Returns the number of captured values. The stored rows are only read back
+    (with ``RETURNING``) and appended to ``samples`` when a list is passed, so
+    summaries of unbounded captures never hold every distinct value.
+    """
 
     settings = merge_settings(connection)
     table_name, schema = _split_table_identifier(mapping.source_table)
+    limit = policy.limit_for(mapping)
+    captured: int | None = None
     try:
-        sampled_values = service_sample_field_values(
+        for _, chunk in service_stream_table_fields(
             settings,
             table_name,
-            mapping.source_field,
-            schema=schema,
-            limit=100,
-        )
+            {mapping.source_field: limit},
+            schema,
+            engines=engines,
+            chunk_size=policy.chunk_size,
+        ):
+            if samples is None:
+                _store_samples(session, connection, mapping, chunk, returning=False)
+                session.commit()
+            else:
+                samples.extend(
+                    _commit_samples(session, _store_samples(session, connection, mapping, chunk))
+                )
+            captured = (captured or 0) + len(chunk)
+            if limit:
+                progress(captured, limit)
     except SourceConnectionServiceError as exc:
         raise HTTPException(status_code=400, detail=str(exc)) from exc
 
-    now = datetime.now(timezone.utc)
-    updated: list[SourceSample] = []
-    for raw_value, occurrence_count in sampled_values:
-        statement = select(SourceSample).where(
-            and_(
-                SourceSample.source_connection_id == connection.id,
-                SourceSample.source_table == mapping.source_table,
-                SourceSample.source_field == mapping.source_field,
-                SourceSample.raw_value == raw_value,
-            )
+    if captured is None:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Field '{mapping.source_field}' not found on {table_name}.",
         )
-        sample = session.exec(statement).first()
-        if sample:
-            sample.occurrence_count = occurrence_count
-            sample.dimension = mapping.ref_dimension
-            sample.last_seen_at = now
-        else:
-            sample = SourceSample(
-                source_connection_id=connection.id,
-                source_table=mapping.source_table,
-                source_field=mapping.source_field,
-                dimension=mapping.ref_dimension,
-                raw_value=raw_value,
-                occurrence_count=occurrence_count,
-                last_seen_at=now,
-            )
-        session.add(sample)
-        updated.append(sample)
+    return SourceFieldCaptureResult(
+        mapping_id=mapping.id,
+        source_table=mapping.source_table,
+        source_field=mapping.source_field,
+        ref_dimension=mapping.ref_dimension,
+        captured_values=captured,
+    )
+
+
+def _store_samples(
+    session: Session,
+    connection: SourceConnection,
+    mapping: SourceFieldMapping,
+    sampled_values: Sequence[tuple[str, int]],
+    now: datetime | None = None,
+    returning: bool = True,
+) -> list[SourceSample]:
+    return upsert_source_samples(
+        session,
+        connection.id,
+        mapping.source_table,
+        mapping.source_field,
+        (
+            (raw_value, occurrence_count, mapping.ref_dimension)
+            for raw_value, occurrence_count in sampled_values
+        ),
+        now=now,
+        returning=returning,
+    )
+
 
+def _commit_samples(session: Session, samples: list[SourceSample]) -> List[SourceSampleRead]:
+    # Serialise before committing so expired rows are not reloaded one by one.
+    reads = [SourceSampleRead.model_validate(sample) for sample in samples]
     session.commit()
-    for sample in updated:
-        session.refresh(sample)
-    return updated
+    return reads
+
+
+@router.post(
+    "/connections/{connection_id}/capture",
+    response_model=List[SourceFieldCaptureResult],
+)
+def capture_connection_samples(
+    connection_id: int,
+    background: bool = Query(False, description="Run as a background job"),
+    session: Session = Depends(get_session),
+    jobs: JobRunner = Depends(get_job_runner),
+    engines: SourceEngineRegistry | None = Depends(get_source_engines),
+    policy: CapturePolicy = Depends(get_capture_policy),
+) -> List[SourceFieldCaptureResult]:
+    connection = _require_connection(session, connection_id)
+    if background:
+        return accepted_job(
+            jobs.submit(CAPTURE_CONNECTION_SAMPLES_JOB, {"connection_id": connection_id})
+        )
+    return _capture_connection_samples(session, connection, engines=engines, policy=policy)
+
+
+def _capture_connection_samples(
+    session: Session,
+    connection: SourceConnection,
+    progress: ProgressCallback = no_progress,
+    engines: SourceEngineRegistry | None = None,
+    policy: CapturePolicy = CapturePolicy(),
+) -> List[SourceFieldCaptureResult]:
+    """Refresh the samples of every mapped field, one reflection per source table.
+
+    Values stream in chunks that are written and committed as they arrive. A
+    field mapped more than once is captured with the widest limit. A table
+    that cannot be sampled is reported against each of its mappings and the
+    remaining tables are still captured.
+    """
+
+    settings = merge_settings(connection)
+    mappings = session.exec(
+        select(SourceFieldMapping)
+        .where(SourceFieldMapping.source_connection_id == connection.id)
+        .order_by(SourceFieldMapping.source_table, SourceFieldMapping.id)
+    ).all()
+    by_table: dict[str, list[SourceFieldMapping]] = {}
+    for mapping in mappings:
+        by_table.setdefault(mapping.source_table, []).append(mapping)
+
+    results: list[SourceFieldCaptureResult] = []
+    for position, (source_table, table_mappings) in enumerate(by_table.items()):
+        progress(position, len(by_table))
+        table_name, schema = _split_table_identifier(source_table)
+        by_field: dict[str, list[SourceFieldMapping]] = {}
+        field_limits: dict[str, int | None] = {}
+        for mapping in table_mappings:
+            by_field.setdefault(mapping.source_field, []).append(mapping)
+            limit = policy.limit_for(mapping)
+            current = field_limits.get(mapping.source_field, 0)
+            field_limits[mapping.source_field] = (
+                None if limit is None or current is None else max(limit, current)
+            )
+
+        now = datetime.now(timezone.utc)
+        captured: dict[str, int] = {}
+        table_error = None
+        try:
+            for field, chunk in service_stream_table_fields(
+                settings,
+                table_name,
+                field_limits,
+                schema,
+                engines=engines,
+                chunk_size=policy.chunk_size,
+            ):
+                captured[field] = captured.get(field, 0) + len(chunk)
+                for mapping in by_field[field]:
+                    _store_samples(session, connection, mapping, chunk, now, returning=False)
+                session.commit()
+        except SourceConnectionServiceError as exc:
+            table_error = str(exc)
+
+        for mapping in table_mappings:
+            error = table_error
+            if error is None and mapping.source_field not in captured:
+                error = f"Field '{mapping.source_field}' not found on {table_name}."
+            results.append(
+                SourceFieldCaptureResult(
+                    mapping_id=mapping.id,
+                    source_table=mapping.source_table,
+                    source_field=mapping.source_field,
+                    ref_dimension=mapping.ref_dimension,
+                    captured_values=captured.get(mapping.source_field, 0),
+                    error=error,
+                )
+            )
+    progress(len(by_table), len(by_table))
+    return results
 
 
 @router.get(
@@ -521,42 +766,17 @@ def ingest_samples(
     connection_id: int,
     payload: SourceSampleIngestRequest,
     session: Session = Depends(get_session),
-) -> List[SourceSample]:
+) -> List[SourceSampleRead]:
     _require_connection(session, connection_id)
-    now = datetime.now(timezone.utc)
-    updated: list[SourceSample] = []
-
-    for value in payload.values:
-        statement = select(SourceSample).where(
-            and_(
-                SourceSample.source_connection_id == connection_id,
-                SourceSample.source_table == payload.source_table,
-                SourceSample.source_field == payload.source_field,
-                SourceSample.raw_value == value.raw_value,
-            )
-        )
-        sample = session.exec(statement).first()
-        if sample:
-            sample.occurrence_count += value.occurrence_count
-            sample.dimension = value.dimension or sample.dimension
-            sample.last_seen_at = now
-        else:
-            sample = SourceSample(
-                source_connection_id=connection_id,
-                source_table=payload.source_table,
-                source_field=payload.source_field,
-                dimension=value.dimension,
-                raw_value=value.raw_value,
-                occurrence_count=value.occurrence_count,
-                last_seen_at=now,
-            )
-            session.add(sample)
-        updated.append(sample)
-
-    session.commit()
-    for sample in updated:
-        session.refresh(sample)
-    return updated
+    samples = upsert_source_samples(
+        session,
+        connection_id,
+        payload.source_table,
+        payload.source_field,
+        ((value.raw_value, value.occurrence_count, value.dimension) for value in payload.values),
+        accumulate=True,
+    )
+    return _commit_samples(session, samples)
 
 
 def _record_matched_preview(
@@ -587,12 +807,26 @@ def _record_matched_preview(
 
 
 def _suggestions_for_samples(
+    session: Session,
+    connection_id: int,
+    mapping: SourceFieldMapping,
     samples: Iterable[SourceSample],
     matcher: SemanticMatcher,
     threshold: float,
     mapped_values: dict[str, ValueMapping],
     canonical_lookup: dict[int, CanonicalValue],
 ) -> tuple[int, List[UnmatchedValuePreview], List[MatchedValuePreview]]:
+    samples = list(samples)
+    rankings = rank_source_samples(
+        session,
+        matcher,
+        connection_id=connection_id,
+        source_table=mapping.source_table,
+        source_field=mapping.source_field,
+        dimension=mapping.ref_dimension,
+        samples=[sample for sample in samples if sample.raw_value not in mapped_values],
+    )
+
     matched_count = 0
     unmatched: list[UnmatchedValuePreview] = []
     matched: dict[str, MatchedValuePreview] = {}
@@ -614,7 +848,7 @@ def _suggestions_for_samples(
             )
             continue
 
-        ranked = matcher.rank(sample.raw_value)
+        ranked = rankings[sample.raw_value]
         if ranked and ranked[0].score >= threshold:
             best = ranked[0]
             matched_count += sample.occurrence_count
@@ -650,9 +884,22 @@ def _suggestions_for_samples(
     response_model=List[FieldMatchStats],
 )
 def compute_match_statistics(
-    connection_id: int, session: Session = Depends(get_session)
+    connection_id: int,
+    session: Session = Depends(get_session),
+    matchers: MatcherRegistry = Depends(get_matcher_registry),
 ) -> List[FieldMatchStats]:
+    """Compute match statistics inline; submit ``source.match_stats`` to run them as a job."""
+
     connection = _require_connection(session, connection_id)
+    return _match_statistics(session, connection, matchers)
+
+
+def _match_statistics(
+    session: Session,
+    connection: SourceConnection,
+    matchers: MatcherRegistry,
+    progress: ProgressCallback = no_progress,
+) -> List[FieldMatchStats]:
     config = _get_config(session)
 
     mappings = session.exec(
@@ -663,9 +910,9 @@ def compute_match_statistics(
 
     results: list[FieldMatchStats] = []
 
-    for mapping in mappings:
-        canonical_values = _load_canonical_values(session, mapping.ref_dimension)
-        matcher = SemanticMatcher(config=config, canonical_values=canonical_values)
+    for position, mapping in enumerate(mappings):
+        progress(position, len(mappings))
+        matcher = matchers.get(session, config, mapping.ref_dimension)
 
         samples = session.exec(
             select(SourceSample).where(
@@ -693,7 +940,14 @@ def compute_match_statistics(
         )
 
         matched_count, unmatched, matched_values = _suggestions_for_samples(
-            samples, matcher, config.match_threshold, mapped_values, canonical_lookup
+            session,
+            connection.id,
+            mapping,
+            samples,
+            matcher,
+            config.match_threshold,
+            mapped_values,
+            canonical_lookup,
         )
         unmatched.sort(key=lambda item: item.occurrence_count, reverse=True)
 
@@ -722,6 +976,7 @@ def compute_match_statistics(
 def list_unmatched_values(
     connection_id: int,
     session: Session = Depends(get_session),
+    matchers: MatcherRegistry = Depends(get_matcher_registry),
 ) -> List[UnmatchedValueRecord]:
     connection = _require_connection(session, connection_id)
     config = _get_config(session)
@@ -740,8 +995,7 @@ def list_unmatched_values(
         value_mapping_index.setdefault(key, {})[vm.raw_value] = vm
 
     for mapping in mappings:
-        canonical_values = _load_canonical_values(session, mapping.ref_dimension)
-        matcher = SemanticMatcher(config=config, canonical_values=canonical_values)
+        matcher = matchers.get(session, config, mapping.ref_dimension)
         samples = session.exec(
             select(SourceSample).where(
                 and_(
@@ -760,6 +1014,9 @@ def list_unmatched_values(
         )
 
         _, unmatched, _ = _suggestions_for_samples(
+            session,
+            connection.id,
+            mapping,
             samples,
             matcher,
             config.match_threshold,
@@ -977,14 +1234,34 @@ def export_value_mappings(
 @router.post("/value-mappings/import", response_model=ValueMappingImportResult)
 async def import_value_mappings(
     connection_id: int | None = Query(None, description="Default connection to apply to imported rows"),
+    background: bool = Query(False, description="Run as a background job"),
     file: UploadFile = File(...),
     session: Session = Depends(get_session),
+    jobs: JobRunner = Depends(get_job_runner),
 ) -> ValueMappingImportResult:
     raw_content = await file.read()
     if not raw_content:
         raise HTTPException(status_code=400, detail="Upload a non-empty CSV or Excel file.")
 
-    suffix = Path(file.filename or "").suffix.lower()
+    if background:
+        return accepted_job(
+            jobs.submit(
+                IMPORT_VALUE_MAPPINGS_JOB,
+                {"filename": file.filename, "connection_id": connection_id},
+                payload=raw_content,
+            )
+        )
+    return _import_value_mappings(session, raw_content, file.filename, connection_id)
+
+
+def _import_value_mappings(
+    session: Session,
+    raw_content: bytes,
+    filename: str | None,
+    connection_id: int | None,
+    progress: ProgressCallback = no_progress,
+) -> ValueMappingImportResult:
+    suffix = Path(filename or "").suffix.lower()
     buffer = BytesIO(raw_content)
     try:
         if suffix in {".xlsx", ".xls"}:
@@ -1024,6 +1301,8 @@ async def import_value_mappings(
     errors: list[str] = []
 
     for index, row in dataframe.iterrows():
+        if index % 100 == 0:
+            progress(index, len(dataframe))
         row_number = index + 2  # account for header row in spreadsheets
 
         resolved_connection_id = connection_id or row.get("source_connection_id")
@@ -1111,3 +1390,60 @@ async def import_value_mappings(
     session.commit()
 
     return ValueMappingImportResult(created=created, updated=updated, errors=errors)
+
+
+CAPTURE_SAMPLES_JOB = "source.capture_samples"
+CAPTURE_CONNECTION_SAMPLES_JOB = "source.capture_connection_samples"
+MATCH_STATS_JOB = "source.match_stats"
+IMPORT_VALUE_MAPPINGS_JOB = "source.import_value_mappings"
+
+
+def _run_capture_samples(context: JobContext) -> SourceFieldCaptureResult:
+    connection, mapping = _require_mapping(
+        context.session, context.params["connection_id"], context.params["mapping_id"]
+    )
+    return _capture_samples(
+        context.session,
+        connection,
+        mapping,
+        context.report,
+        engines=getattr(context.state, "source_engines", None),
+        policy=context.state.capture_policy,
+    )
+
+
+def _run_capture_connection_samples(context: JobContext) -> List[SourceFieldCaptureResult]:
+    connection = _require_connection(context.session, context.params["connection_id"])
+    return _capture_connection_samples(
+        context.session,
+        connection,
+        context.report,
+        engines=getattr(context.state, "source_engines", None),
+        policy=context.state.capture_policy,
+    )
+
+
+def _run_match_statistics(context: JobContext) -> List[FieldMatchStats]:
+    connection = _require_connection(context.session, context.params["connection_id"])
+    return _match_statistics(
+        context.session, connection, context.state.matcher_registry, context.report
+    )
+
+
+def _run_import_value_mappings(context: JobContext) -> ValueMappingImportResult:
+    return _import_value_mappings(
+        context.session,
+        context.payload,
+        context.params.get("filename"),
+        context.params.get("connection_id"),
+        context.report,
+    )
+
+
+def register_jobs(runner: JobRunner) -> None:
+    """Register the source workflows that can run as background jobs."""
+
+    runner.register(CAPTURE_SAMPLES_JOB, _run_capture_samples)
+    runner.register(CAPTURE_CONNECTION_SAMPLES_JOB, _run_capture_connection_samples)
+    runner.register(MATCH_STATS_JOB, _run_match_statistics)
+    runner.register(IMPORT_VALUE_MAPPINGS_JOB, _run_import_value_mappings, submittable=False)
@@ -61,6 +61,27 @@ class MatchResponse(BaseModel):
     matches: List[MatchCandidate]
 
 
+class MatchBatchItem(BaseModel):
+    raw_text: str = Field(..., min_length=1)
+    dimension: Optional[str] = None
+
+
+class MatchBatchRequest(BaseModel):
+    items: List[MatchBatchItem] = Field(..., min_length=1, max_length=50_000)
+    dimension: Optional[str] = Field(
+        default=None, description="Dimension applied to items that do not name one."
+    )
+
+
+class MatchBatchResponse(BaseModel):
+    results: List[MatchResponse]
+
+
+class MatchStreamError(BaseModel):
+    line: int
+    error: str
+
+
 class SystemConfigRead(BaseModel):
     default_dimension: str
     match_threshold: float
@@ -70,6 +91,9 @@ class SystemConfigRead(BaseModel):
     llm_model: Optional[str]
     llm_api_base: Optional[str]
     top_k: int
+    llm_batch_size: int
+    llm_shortlist_size: int
+    exact_match_attributes: list[str]
     llm_api_key_set: bool
 
 
@@ -82,9 +106,22 @@ class SystemConfigUpdate(BaseModel):
     llm_model: Optional[str] = None
     llm_api_base: Optional[str] = None
     top_k: Optional[int] = Field(default=None, ge=1, le=20)
+    llm_batch_size: Optional[int] = Field(default=None, ge=1, le=200)
+    llm_shortlist_size: Optional[int] = Field(default=None, ge=1, le=200)
+    exact_match_attributes: Optional[list[str]] = None
     llm_api_key: Optional[str] = Field(default=None, min_length=4)
 
 
+class LLMCacheStats(BaseModel):
+    enabled: bool
+    hits: int = 0
+    memory_hits: int = 0
+    misses: int = 0
+    stores: int = 0
+    evictions: int = 0
+    memory_entries: int = 0
+
+
 class SourceConnectionBase(BaseModel):
     name: str
     db_type: str
@@ -157,6 +194,7 @@ class SourceFieldMappingBase(BaseModel):
     source_field: str
     ref_dimension: str
     description: Optional[str] = None
+    capture_limit: Optional[int] = Field(default=None, ge=0)
 
 
 class SourceFieldMappingCreate(SourceFieldMappingBase):
@@ -177,6 +215,7 @@ class SourceFieldMappingUpdate(BaseModel):
     source_field: Optional[str] = None
     ref_dimension: Optional[str] = None
     description: Optional[str] = None
+    capture_limit: Optional[int] = Field(default=None, ge=0)
 
 
 class SourceSampleValue(BaseModel):
@@ -204,6 +243,15 @@ class SourceSampleRead(BaseModel):
     model_config = ConfigDict(from_attributes=True)
 
 
+class SourceFieldCaptureResult(BaseModel):
+    mapping_id: int
+    source_table: str
+    source_field: str
+    ref_dimension: str
+    captured_values: int
+    error: Optional[str] = None
+
+
 class UnmatchedValuePreview(BaseModel):
     raw_value: str
     occurrence_count: int
@@ -404,6 +452,27 @@ class BulkImportColumnMapping(BaseModel):
     dimension_definition: Optional[DimensionCreate] = None
 
 
+class JobSubmit(BaseModel):
+    kind: str
+    params: Dict[str, Any] = Field(default_factory=dict)
+
+
+class JobRead(BaseModel):
+    id: int
+    kind: str
+    status: Literal["queued", "running", "succeeded", "failed", "cancelled"]
+    params: Dict[str, Any]
+    progress: float = Field(ge=0.0, le=1.0)
+    message: Optional[str] = None
+    error: Optional[str] = None
+    cancel_requested: bool = False
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+
+    model_config = ConfigDict(from_attributes=True)
+
+
 class BulkImportResult(BaseModel):
     created: List[CanonicalValueRead]
     updated: List[CanonicalValueRead] = Field(default_factory=list)
@@ -42,6 +42,8 @@ def ensure_system_config(
         llm_model=settings.llm_model,
         llm_api_base=settings.llm_api_base,
         top_k=settings.top_k,
+        llm_batch_size=settings.llm_batch_size,
+        llm_shortlist_size=settings.llm_shortlist_size,
     )
     session.add(config)
     session.commit()
@@ -65,6 +67,9 @@ def system_config_to_read(config: SystemConfig) -> SystemConfigRead:
         llm_model=config.llm_model,
         llm_api_base=config.llm_api_base,
         top_k=config.top_k,
+        llm_batch_size=config.llm_batch_size,
+        llm_shortlist_size=config.llm_shortlist_size,
+        exact_match_attributes=list(config.exact_match_attributes or []),
         llm_api_key_set=bool(config.llm_api_key),
     )
     logger.debug(
@@ -0,0 +1,146 @@
+"""In-memory catalogue of dimensions and configuration used to route match proposals."""
+
+from __future__ import annotations
+
+import logging
+import threading
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Iterable
+
+from fastapi import HTTPException, Request, status
+from sqlalchemy.sql import func
+from sqlmodel import Session, select
+
+from ..models import CanonicalValue, Dimension, SystemConfig
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True, slots=True)
+class CatalogueSnapshot:
+    version: int
+    config: SystemConfig
+    dimensions: frozenset[str]
+    canonical_counts: dict[str, int]
+    canonical_max_ids: dict[str, int]
+    canonical_updated_at: dict[str, datetime | None]
+    richest_dimension: str | None
+
+    def require(self, code: str) -> str:
+        """Return ``code`` if the dimension exists, mirroring ``require_dimension``."""
+
+        if code not in self.dimensions:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Dimension '{code}' not found.",
+            )
+        return code
+
+    def require_all(self, codes: Iterable[str]) -> None:
+        """Fail with one 404 naming every unknown dimension in ``codes``."""
+
+        missing = sorted(set(codes) - self.dimensions)
+        if missing:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Dimension(s) not found: {', '.join(repr(code) for code in missing)}.",
+            )
+
+    def has_values(self, code: str) -> bool:
+        return self.canonical_counts.get(code, 0) > 0
+
+    def library_signature(self, code: str | None = None) -> str:
+        """Content signature of ``code``'s canonical values (or of all of them).
+
+        Matches what :func:`~api.app.matcher.find_exact_matches` computes
+        itself, so callers holding a snapshot can skip that query.
+        """
+
+        if code is not None:
+            return (
+                f"{self.canonical_counts.get(code, 0)}:{self.canonical_max_ids.get(code)}:"
+                f"{self.canonical_updated_at.get(code)}"
+            )
+        updated = [value for value in self.canonical_updated_at.values() if value is not None]
+        return (
+            f"{sum(self.canonical_counts.values())}:"
+            f"{max(self.canonical_max_ids.values(), default=None)}:"
+            f"{max(updated, default=None)}"
+        )
+
+
+class DimensionCatalogue:
+    """Cache the system configuration, dimension codes and canonical counts.
+
+    Propose requests resolve their dimension and empty-library fallbacks from
+    one snapshot instead of a query per decision. Writes to canonical values,
+    dimensions or the configuration call :meth:`invalidate`; the next
+    :meth:`snapshot` reloads everything with three queries. The configuration
+    is a detached copy, safe to share across sessions. Each application owns
+    one catalogue for its own database, so the invalidation counter is the
+    only version a snapshot needs.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._version = 0
+        self._snapshot: CatalogueSnapshot | None = None
+        self.hits = 0
+        self.misses = 0
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._version += 1
+            self._snapshot = None
+
+    def snapshot(self, session: Session) -> CatalogueSnapshot:
+        with self._lock:
+            cached = self._snapshot
+            if cached is not None and cached.version == self._version:
+                self.hits += 1
+                return cached
+            self.misses += 1
+            version = self._version
+
+        config = session.exec(select(SystemConfig)).first()
+        if not config:
+            raise HTTPException(status_code=500, detail="System configuration missing")
+        counts: dict[str, int] = {}
+        max_ids: dict[str, int] = {}
+        updated_at: dict[str, datetime | None] = {}
+        for dimension, count, max_id, last_update in session.exec(
+            select(
+                CanonicalValue.dimension,
+                func.count(CanonicalValue.id),
+                func.max(CanonicalValue.id),
+                func.max(CanonicalValue.updated_at),
+            ).group_by(CanonicalValue.dimension)
+        ).all():
+            counts[dimension] = count
+            max_ids[dimension] = max_id
+            updated_at[dimension] = last_update
+        snapshot = CatalogueSnapshot(
+            version=version,
+            config=SystemConfig(**config.model_dump()),
+            dimensions=frozenset(session.exec(select(Dimension.code)).all()),
+            canonical_counts=counts,
+            canonical_max_ids=max_ids,
+            canonical_updated_at=updated_at,
+            richest_dimension=max(counts, key=counts.__getitem__) if counts else None,
+        )
+        with self._lock:
+            # A write during the load bumped the version; serve it but don't keep it.
+            if self._version == version:
+                self._snapshot = snapshot
+        logger.debug(
+            "Dimension catalogue loaded",
+            extra={"dimensions": len(snapshot.dimensions), "version": version},
+        )
+        return snapshot
+
+
+def get_dimension_catalogue(request: Request) -> DimensionCatalogue:
+    """FastAPI dependency returning the application's dimension catalogue."""
+
+    return request.app.state.dimension_catalogue
@@ -0,0 +1,358 @@
+"""In-process background job runner for long-running operations."""
+
+from __future__ import annotations
+
+import logging
+import os
+import socket
+import threading
+import uuid
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable
+
+from fastapi import HTTPException, Request
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy import or_, update
+from sqlmodel import Session, select
+
+from ..models import Job
+from ..schemas import JobRead
+from ..utils import as_utc
+
+logger = logging.getLogger(__name__)
+
+TERMINAL_STATUSES = frozenset({"succeeded", "failed", "cancelled"})
+ACTIVE_STATUSES = ("queued", "running")
+
+# Heartbeats a runner may miss before its unfinished jobs count as orphaned.
+_MISSED_HEARTBEATS = 4
+
+# Signature of the progress hooks accepted by long-running helpers.
+ProgressCallback = Callable[[int, int], None]
+
+
+def no_progress(completed: int, total: int) -> None:
+    """Progress hook used when an operation runs inline in a request."""
+
+
+class JobCancelled(Exception):
+    """Raised inside a handler once cancellation of its job was requested."""
+
+
+@dataclass(slots=True)
+class _LiveJob:
+    future: Future | None = None
+    progress: float = 0.0
+    message: str | None = None
+    cancel: threading.Event = field(default_factory=threading.Event)
+
+
+class JobContext:
+    """Handle passed to job handlers for database access and progress reporting."""
+
+    def __init__(
+        self,
+        job_id: int,
+        params: dict[str, Any],
+        session: Session,
+        state: Any,
+        live: _LiveJob,
+        payload: Any = None,
+    ) -> None:
+        self.job_id = job_id
+        self.params = params
+        self.session = session
+        self.state = state
+        self.payload = payload
+        self._live = live
+
+    @property
+    def cancelled(self) -> bool:
+        return self._live.cancel.is_set()
+
+    def report(self, completed: int, total: int, message: str | None = None) -> None:
+        """Record progress and raise :class:`JobCancelled` if cancellation was requested.
+
+        Handlers call this between units of work, which makes it the
+        cancellation point as well.
+        """
+
+        if total > 0:
+            self._live.progress = max(0.0, min(1.0, completed / total))
+        if message is not None:
+            self._live.message = message
+        if self.cancelled:
+            raise JobCancelled()
+
+
+JobHandler = Callable[[JobContext], Any]
+
+
+@dataclass(slots=True)
+class _Registration:
+    handler: JobHandler
+    submittable: bool
+
+
+class JobRunner:
+    """Execute registered job kinds on a thread pool and track them in the ``job`` table.
+
+    Status transitions (queued, running and the terminal states) are persisted
+    so jobs can be polled from any request. Progress is kept in memory while a
+    job runs and written to the row when it finishes. Cancellation is
+    cooperative: queued jobs are dropped immediately and running handlers stop
+    at their next :meth:`JobContext.report` call. No broker is involved, so
+    jobs do not survive a restart.
+
+    Several API processes may share the ``job`` table. Each runner stamps the
+    jobs it accepts with its ``owner`` id and refreshes their ``heartbeat_at``
+    every ``heartbeat_seconds``; the same beat picks up cancellations requested
+    through another process. :meth:`recover` only fails jobs whose heartbeat
+    is older than four beats, i.e. whose runner has stopped. The heartbeat
+    thread runs between :meth:`start` and :meth:`shutdown`.
+    """
+
+    def __init__(
+        self,
+        engine: Any,
+        state: Any,
+        *,
+        max_workers: int = 2,
+        heartbeat_seconds: float = 15.0,
+    ) -> None:
+        self._engine = engine
+        self._state = state
+        self.owner = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self.heartbeat_seconds = heartbeat_seconds
+        self._executor = ThreadPoolExecutor(
+            max_workers=max(1, max_workers), thread_name_prefix="refdata-job"
+        )
+        self._handlers: dict[str, _Registration] = {}
+        self._live: dict[int, _LiveJob] = {}
+        self._lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._heartbeat: threading.Thread | None = None
+
+    def start(self) -> None:
+        """Start the heartbeat thread; workers start lazily on the first submit."""
+
+        if self._heartbeat is None:
+            self._heartbeat = threading.Thread(
+                target=self._heartbeat_loop, name="refdata-job-heartbeat", daemon=True
+            )
+            self._heartbeat.start()
+
+    @property
+    def kinds(self) -> list[str]:
+        return sorted(kind for kind, entry in self._handlers.items() if entry.submittable)
+
+    def register(self, kind: str, handler: JobHandler, *, submittable: bool = True) -> None:
+        """Register ``handler`` for ``kind``.
+
+        ``submittable`` kinds can be started through the generic jobs endpoint
+        with JSON parameters; the others need an in-memory payload (such as an
+        uploaded file) and are only submitted by their own routes.
+        """
+
+        self._handlers[kind] = _Registration(handler, submittable)
+
+    def is_submittable(self, kind: str) -> bool:
+        entry = self._handlers.get(kind)
+        return bool(entry and entry.submittable)
+
+    def submit(
+        self, kind: str, params: dict[str, Any] | None = None, *, payload: Any = None
+    ) -> JobRead:
+        """Persist a queued job and schedule it on the worker pool."""
+
+        if kind not in self._handlers:
+            raise KeyError(kind)
+        with Session(self._engine) as session:
+            job = Job(
+                kind=kind,
+                params=jsonable_encoder(params or {}),
+                owner=self.owner,
+                heartbeat_at=datetime.now(timezone.utc),
+            )
+            session.add(job)
+            session.commit()
+            session.refresh(job)
+            snapshot = JobRead.model_validate(job)
+
+        live = _LiveJob()
+        with self._lock:
+            self._live[snapshot.id] = live
+            live.future = self._executor.submit(self._run, snapshot.id, payload)
+        logger.info("Job queued", extra={"job_id": snapshot.id, "kind": kind})
+        return snapshot
+
+    def describe(self, job: Job) -> JobRead:
+        """Return ``job`` with the live progress of a running job applied."""
+
+        snapshot = JobRead.model_validate(job)
+        live = self._live.get(snapshot.id)
+        if live is not None and snapshot.status not in TERMINAL_STATUSES:
+            snapshot.progress = live.progress
+            snapshot.message = live.message
+            snapshot.cancel_requested = snapshot.cancel_requested or live.cancel.is_set()
+        return snapshot
+
+    def cancel(self, job_id: int) -> JobRead | None:
+        """Request cancellation; returns ``None`` when the job does not exist."""
+
+        with self._lock:
+            live = self._live.get(job_id)
+        dropped = False
+        if live is not None:
+            live.cancel.set()
+            dropped = bool(live.future and live.future.cancel())
+
+        with Session(self._engine) as session:
+            job = session.get(Job, job_id)
+            if job is None:
+                return None
+            if job.status not in TERMINAL_STATUSES:
+                job.cancel_requested = True
+                if dropped or (live is None and self._is_orphaned(job)):
+                    # Never started, or its runner has stopped: finish it now.
+                    # Jobs of another live runner stop at its next heartbeat.
+                    self._finish(job, "cancelled", message="Cancelled before start")
+                    with self._lock:
+                        self._live.pop(job_id, None)
+                session.add(job)
+                session.commit()
+                session.refresh(job)
+            return self.describe(job)
+
+    def recover(self) -> int:
+        """Fail unfinished jobs whose runner stopped sending heartbeats."""
+
+        with Session(self._engine) as session:
+            orphans = session.exec(
+                select(Job).where(
+                    Job.status.in_(ACTIVE_STATUSES),
+                    or_(Job.heartbeat_at.is_(None), Job.heartbeat_at < self._stale_before()),
+                )
+            ).all()
+            for job in orphans:
+                self._finish(job, "failed", error="Interrupted by an application restart")
+                session.add(job)
+            session.commit()
+        if orphans:
+            logger.warning("Marked interrupted jobs as failed", extra={"jobs": len(orphans)})
+        return len(orphans)
+
+    def shutdown(self, *, wait: bool = False) -> None:
+        self._stopped.set()
+        if self._heartbeat is not None:
+            self._heartbeat.join()
+        with self._lock:
+            for live in self._live.values():
+                live.cancel.set()
+        self._executor.shutdown(wait=wait, cancel_futures=True)
+
+    def beat(self) -> None:
+        """Refresh this runner's unfinished jobs and apply remote cancellations."""
+
+        with self._lock:
+            if not self._live:
+                return
+        with Session(self._engine) as session:
+            session.exec(
+                update(Job)
+                .where(Job.owner == self.owner, Job.status.in_(ACTIVE_STATUSES))
+                .values(heartbeat_at=datetime.now(timezone.utc))
+            )
+            cancelled = session.exec(
+                select(Job.id).where(
+                    Job.owner == self.owner,
+                    Job.status.in_(ACTIVE_STATUSES),
+                    Job.cancel_requested,
+                )
+            ).all()
+            session.commit()
+        with self._lock:
+            for job_id in cancelled:
+                live = self._live.get(job_id)
+                if live is not None:
+                    # Queued jobs finish as cancelled as soon as a worker picks them up.
+                    live.cancel.set()
+
+    def _heartbeat_loop(self) -> None:
+        while not self._stopped.wait(self.heartbeat_seconds):
+            try:
+                self.beat()
+            except Exception:  # noqa: BLE001 - keep the heartbeat alive
+                logger.exception("Job heartbeat failed")
+
+    def _stale_before(self) -> datetime:
+        return datetime.now(timezone.utc) - timedelta(
+            seconds=self.heartbeat_seconds * _MISSED_HEARTBEATS
+        )
+
+    def _is_orphaned(self, job: Job) -> bool:
+        return job.heartbeat_at is None or as_utc(job.heartbeat_at) < self._stale_before()
+
+    def _run(self, job_id: int, payload: Any) -> None:
+        live = self._live[job_id]
+        with Session(self._engine) as session:
+            job = session.get(Job, job_id)
+            if job is None or job.status != "queued":
+                with self._lock:
+                    self._live.pop(job_id, None)
+                return
+            job.status = "running"
+            job.started_at = datetime.now(timezone.utc)
+            session.add(job)
+            session.commit()
+            kind, params = job.kind, dict(job.params or {})
+
+        status, result, error = "succeeded", None, None
+        try:
+            if live.cancel.is_set():
+                raise JobCancelled()
+            with Session(self._engine) as session:
+                context = JobContext(job_id, params, session, self._state, live, payload)
+                result = jsonable_encoder(self._handlers[kind].handler(context))
+        except JobCancelled:
+            status = "cancelled"
+        except HTTPException as exc:
+            status, error = "failed", str(exc.detail)
+        except Exception as exc:  # noqa: BLE001 - failures are reported on the job
+            logger.exception("Job failed", extra={"job_id": job_id, "kind": kind})
+            status, error = "failed", str(exc) or exc.__class__.__name__
+
+        with Session(self._engine) as session:
+            job = session.get(Job, job_id)
+            if job is not None:
+                job.progress = 1.0 if status == "succeeded" else live.progress
+                self._finish(job, status, result=result, error=error, message=live.message)
+                session.add(job)
+                session.commit()
+        with self._lock:
+            self._live.pop(job_id, None)
+        logger.info("Job finished", extra={"job_id": job_id, "kind": kind, "status": status})
+
+    @staticmethod
+    def _finish(
+        job: Job,
+        status: str,
+        *,
+        result: Any = None,
+        error: str | None = None,
+        message: str | None = None,
+    ) -> None:
+        job.status = status
+        job.result = result
+        job.error = error
+        if message is not None:
+            job.message = message
+        job.finished_at = datetime.now(timezone.utc)
+
+
+def get_job_runner(request: Request) -> JobRunner:
+    """FastAPI dependency returning the application's job runner."""
+
+    return request.app.state.job_runner
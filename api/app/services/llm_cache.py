@@ -0,0 +1,203 @@
+"""Durable cache for parsed LLM match rankings."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
+from typing import Any
+
+from fastapi import Request
+from sqlalchemy.exc import IntegrityError, SQLAlchemyError
+from sqlmodel import Session, delete, func, select
+
+from ..models import LLMRankingCacheEntry
+from ..utils import as_utc, normalise_raw_text
+
+logger = logging.getLogger(__name__)
+
+# Expired and surplus rows are pruned once every this many writes.
+PRUNE_INTERVAL = 256
+
+
+def build_cache_key(raw_text: str, dimension: str, model: str, library_version: str) -> str:
+    payload = json.dumps(
+        [normalise_raw_text(raw_text), dimension, model, library_version],
+        ensure_ascii=False,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class LLMRankingCache:
+    """Database-backed LLM ranking cache with an in-process LRU in front.
+
+    Entries expire after ``ttl_seconds`` and the table is trimmed to
+    ``max_entries`` rows (oldest first).
+    """
+
+    def __init__(
+        self,
+        engine: Any,
+        *,
+        ttl_seconds: int = 7 * 24 * 3600,
+        max_entries: int = 100_000,
+        memory_entries: int = 2048,
+    ) -> None:
+        self._engine = engine
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.memory_entries = memory_entries
+        self._memory: OrderedDict[str, tuple[float, list[dict[str, Any]]]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._writes_since_prune = 0
+        self.hits = 0
+        self.memory_hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.evictions = 0
+
+    def get(self, key: str) -> list[dict[str, Any]] | None:
+        now = time.time()
+        with self._lock:
+            cached = self._memory.get(key)
+            if cached is not None:
+                expires_at, rankings = cached
+                if expires_at > now:
+                    self._memory.move_to_end(key)
+                    self.hits += 1
+                    self.memory_hits += 1
+                    return rankings
+                del self._memory[key]
+
+        try:
+            with Session(self._engine) as session:
+                entry = session.exec(
+                    select(LLMRankingCacheEntry).where(LLMRankingCacheEntry.cache_key == key)
+                ).first()
+        except SQLAlchemyError as exc:  # pragma: no cover - cache must never break matching
+            logger.warning("LLM ranking cache lookup failed: %s", exc)
+            entry = None
+
+        if entry is None or self._is_expired(entry.created_at):
+            with self._lock:
+                self.misses += 1
+            return None
+
+        expires_at = as_utc(entry.created_at).timestamp() + self.ttl_seconds
+        with self._lock:
+            self.hits += 1
+            self._remember(key, expires_at, entry.rankings)
+        return entry.rankings
+
+    def set(
+        self,
+        key: str,
+        *,
+        raw_text: str,
+        dimension: str,
+        model: str,
+        library_version: str,
+        rankings: list[dict[str, Any]],
+    ) -> None:
+        now = datetime.now(timezone.utc)
+        try:
+            with Session(self._engine) as session:
+                entry = session.exec(
+                    select(LLMRankingCacheEntry).where(LLMRankingCacheEntry.cache_key == key)
+                ).first()
+                if entry is None:
+                    entry = LLMRankingCacheEntry(
+                        cache_key=key,
+                        raw_text=normalise_raw_text(raw_text),
+                        dimension=dimension,
+                        llm_model=model,
+                        library_version=library_version,
+                    )
+                entry.rankings = rankings
+                entry.created_at = now
+                session.add(entry)
+                try:
+                    session.commit()
+                except IntegrityError:
+                    # Another worker stored the same key concurrently; keep theirs.
+                    session.rollback()
+                prune_due = self._count_write()
+                if prune_due:
+                    self._prune(session)
+        except SQLAlchemyError as exc:  # pragma: no cover - cache must never break matching
+            logger.warning("LLM ranking cache write failed: %s", exc)
+
+        with self._lock:
+            self.stores += 1
+            self._remember(key, now.timestamp() + self.ttl_seconds, rankings)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._memory.clear()
+        with Session(self._engine) as session:
+            session.exec(delete(LLMRankingCacheEntry))
+            session.commit()
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "memory_hits": self.memory_hits,
+                "misses": self.misses,
+                "stores": self.stores,
+                "evictions": self.evictions,
+                "memory_entries": len(self._memory),
+            }
+
+    def _remember(self, key: str, expires_at: float, rankings: list[dict[str, Any]]) -> None:
+        if self.memory_entries <= 0:
+            return
+        self._memory[key] = (expires_at, rankings)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_entries:
+            self._memory.popitem(last=False)
+
+    def _count_write(self) -> bool:
+        with self._lock:
+            self._writes_since_prune += 1
+            if self._writes_since_prune < PRUNE_INTERVAL:
+                return False
+            self._writes_since_prune = 0
+            return True
+
+    def _prune(self, session: Session) -> None:
+        cutoff = datetime.now(timezone.utc) - timedelta(seconds=self.ttl_seconds)
+        expired = session.exec(
+            delete(LLMRankingCacheEntry).where(LLMRankingCacheEntry.created_at < cutoff)
+        ).rowcount or 0
+
+        surplus = 0
+        total = session.exec(select(func.count()).select_from(LLMRankingCacheEntry)).one()
+        if total > self.max_entries:
+            stale_ids = select(LLMRankingCacheEntry.id).order_by(
+                LLMRankingCacheEntry.created_at
+            ).limit(total - self.max_entries)
+            surplus = session.exec(
+                delete(LLMRankingCacheEntry).where(LLMRankingCacheEntry.id.in_(stale_ids))
+            ).rowcount or 0
+        session.commit()
+
+        with self._lock:
+            self.evictions += expired + surplus
+        logger.debug(
+            "Pruned LLM ranking cache", extra={"expired": expired, "surplus": surplus}
+        )
+
+    def _is_expired(self, created_at: datetime) -> bool:
+        age = datetime.now(timezone.utc) - as_utc(created_at)
+        return age.total_seconds() > self.ttl_seconds
+
+
+def get_llm_cache(request: Request) -> LLMRankingCache | None:
+    """FastAPI dependency returning the application's LLM ranking cache."""
+
+    return getattr(request.app.state, "llm_cache", None)
@@ -0,0 +1,160 @@
+"""Pooled asynchronous HTTP client shared by LLM-backed matchers."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import random
+from dataclasses import dataclass, field
+from typing import Any, Sequence
+
+import httpx
+from fastapi import Request
+
+logger = logging.getLogger(__name__)
+
+# Provider responses worth retrying; anything else in the 4xx range is final.
+RETRYABLE_STATUS_CODES = frozenset({408, 409, 425, 429, 500, 502, 503, 504})
+
+
+@dataclass(slots=True)
+class LLMRequest:
+    url: str
+    payload: dict[str, Any]
+    headers: dict[str, str] = field(default_factory=dict)
+
+
+class LLMClient:
+    """App-lifetime ``httpx.AsyncClient`` with bounded parallelism and retries.
+
+    At most ``concurrency`` requests are in flight at once, each attempt is
+    bounded by ``timeout_seconds`` and transient failures are retried up to
+    ``max_retries`` times with jittered exponential backoff. :meth:`start`
+    creates the shared client on the application's event loop at startup and
+    :meth:`aclose` closes it at shutdown; blocking callers on other threads,
+    such as job workers, submit their requests to that loop. Before ``start``
+    (scripts, tests without a lifespan) every call uses a private client that
+    it closes itself, so the shared client is never touched off its loop.
+    """
+
+    def __init__(
+        self,
+        *,
+        concurrency: int = 8,
+        timeout_seconds: float = 30.0,
+        max_retries: int = 2,
+        backoff_seconds: float = 0.5,
+        transport: httpx.AsyncBaseTransport | None = None,
+    ) -> None:
+        self.concurrency = max(1, concurrency)
+        self.timeout_seconds = timeout_seconds
+        self.max_retries = max(0, max_retries)
+        self.backoff_seconds = backoff_seconds
+        self._transport = transport
+        self._client: httpx.AsyncClient | None = None
+        self._semaphore: asyncio.Semaphore | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+
+    async def start(self) -> None:
+        """Create the shared client on the running (application) event loop."""
+
+        if self._client is None:
+            self._semaphore = asyncio.Semaphore(self.concurrency)
+            self._client = self._new_client()
+            self._loop = asyncio.get_running_loop()
+
+    async def post_many(self, requests: Sequence[LLMRequest]) -> list[dict[str, Any] | None]:
+        """POST every request concurrently; failed requests yield ``None``."""
+
+        loop = self._loop
+        if loop is not None and loop is not asyncio.get_running_loop():
+            future = asyncio.run_coroutine_threadsafe(self.post_many(requests), loop)
+            return await asyncio.wrap_future(future)
+        if self._client is not None and self._semaphore is not None:
+            return await self._gather(self._client, self._semaphore, requests)
+        async with self._new_client() as client:
+            return await self._gather(client, asyncio.Semaphore(self.concurrency), requests)
+
+    def post_many_sync(self, requests: Sequence[LLMRequest]) -> list[dict[str, Any] | None]:
+        """Blocking wrapper for threadpool routes, job workers, scripts and tests."""
+
+        if not requests:
+            return []
+        loop = self._loop
+        if loop is None:
+            return asyncio.run(self.post_many(requests))
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is loop:
+            raise RuntimeError("post_many_sync would block the LLM client's own event loop")
+        return asyncio.run_coroutine_threadsafe(self.post_many(requests), loop).result()
+
+    async def aclose(self) -> None:
+        client, self._client = self._client, None
+        self._semaphore = None
+        self._loop = None
+        if client is not None:
+            await client.aclose()
+
+    def _new_client(self) -> httpx.AsyncClient:
+        return httpx.AsyncClient(
+            timeout=self.timeout_seconds,
+            limits=httpx.Limits(
+                max_connections=self.concurrency,
+                max_keepalive_connections=self.concurrency,
+            ),
+            transport=self._transport,
+        )
+
+    async def _gather(
+        self,
+        client: httpx.AsyncClient,
+        semaphore: asyncio.Semaphore,
+        requests: Sequence[LLMRequest],
+    ) -> list[dict[str, Any] | None]:
+        return list(
+            await asyncio.gather(*(self._post(client, semaphore, request) for request in requests))
+        )
+
+    async def _post(
+        self,
+        client: httpx.AsyncClient,
+        semaphore: asyncio.Semaphore,
+        request: LLMRequest,
+    ) -> dict[str, Any] | None:
+        async with semaphore:
+            for attempt in range(self.max_retries + 1):
+                try:
+                    response = await client.post(
+                        request.url, json=request.payload, headers=request.headers
+                    )
+                    response.raise_for_status()
+                except httpx.HTTPStatusError as exc:
+                    status = exc.response.status_code
+                    if status not in RETRYABLE_STATUS_CODES or attempt == self.max_retries:
+                        logger.warning("LLM request to %s failed with HTTP %s", request.url, status)
+                        return None
+                except httpx.TransportError as exc:
+                    if attempt == self.max_retries:
+                        logger.warning("LLM request to %s failed: %s", request.url, exc)
+                        return None
+                else:
+                    try:
+                        return response.json()
+                    except ValueError:
+                        logger.warning("LLM response from %s was not JSON", request.url)
+                        return None
+                await asyncio.sleep(self._backoff(attempt))
+        return None  # pragma: no cover - loop always returns
+
+    def _backoff(self, attempt: int) -> float:
+        delay = self.backoff_seconds * (2**attempt)
+        return delay + random.uniform(0, self.backoff_seconds)
+
+
+def get_llm_client(request: Request) -> LLMClient | None:
+    """FastAPI dependency returning the application's shared LLM client."""
+
+    return getattr(request.app.state, "llm_client", None)
@@ -0,0 +1,140 @@
+"""Persisted match results for source samples with incremental re-scoring."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+from datetime import datetime, timezone
+from typing import Iterable
+
+from sqlalchemy.exc import IntegrityError
+from sqlmodel import Session, select
+
+from ..matcher import SemanticMatcher
+from ..models import SourceMatchResult, SourceSample, SystemConfig
+from ..schemas import MatchCandidate
+from ..utils import as_utc
+
+logger = logging.getLogger(__name__)
+
+# Configuration that changes the rankings themselves. The threshold is applied
+# when results are read, and credentials or the default dimension never change
+# a score, so editing them keeps stored results.
+_SCORING_FIELDS = (
+    "matcher_backend",
+    "embedding_model",
+    "llm_mode",
+    "llm_model",
+    "top_k",
+    "llm_shortlist_size",
+    "llm_batch_size",
+    "exact_match_attributes",
+)
+
+
+def config_fingerprint(config: SystemConfig) -> str:
+    """Digest of the configuration fields that can change stored rankings."""
+
+    payload = json.dumps(config.model_dump(include=set(_SCORING_FIELDS)), sort_keys=True)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def rank_source_samples(
+    session: Session,
+    matcher: SemanticMatcher,
+    *,
+    connection_id: int,
+    source_table: str,
+    source_field: str,
+    dimension: str,
+    samples: Iterable[SourceSample],
+) -> dict[str, list[MatchCandidate]]:
+    """Return ranked candidates per distinct raw value of ``samples``.
+
+    Results are kept per dimension, so a field mapped to several dimensions
+    keeps one set for each. Stored results are reused while the sample's
+    ``last_seen_at``, the matcher's library signature and the configuration
+    fingerprint are unchanged; only the remaining values are scored (in one
+    ``rank_many`` call) and written back.
+    """
+
+    seen_at: dict[str, datetime] = {}
+    for sample in samples:
+        observed = as_utc(sample.last_seen_at)
+        if sample.raw_value not in seen_at or observed > seen_at[sample.raw_value]:
+            seen_at[sample.raw_value] = observed
+    if not seen_at:
+        return {}
+
+    library_version = matcher.library_version
+    config_version = config_fingerprint(matcher.config)
+    stored = {
+        row.raw_value: row
+        for row in session.exec(
+            select(SourceMatchResult).where(
+                SourceMatchResult.source_connection_id == connection_id,
+                SourceMatchResult.source_table == source_table,
+                SourceMatchResult.source_field == source_field,
+                SourceMatchResult.dimension == dimension,
+            )
+        ).all()
+    }
+
+    results: dict[str, list[MatchCandidate]] = {}
+    stale: list[str] = []
+    for raw_value, observed in seen_at.items():
+        row = stored.get(raw_value)
+        if (
+            row is not None
+            and row.library_version == library_version
+            and row.config_version == config_version
+            and as_utc(row.sample_seen_at) == observed
+        ):
+            results[raw_value] = [MatchCandidate.model_validate(item) for item in row.matches]
+        else:
+            stale.append(raw_value)
+
+    if not stale:
+        return results
+
+    now = datetime.now(timezone.utc)
+    for raw_value, matches in zip(stale, matcher.rank_many(stale)):
+        results[raw_value] = matches
+        row = stored.get(raw_value) or SourceMatchResult(
+            source_connection_id=connection_id,
+            source_table=source_table,
+            source_field=source_field,
+            dimension=dimension,
+            raw_value=raw_value,
+        )
+        row.library_version = library_version
+        row.config_version = config_version
+        row.sample_seen_at = seen_at[raw_value]
+        row.matches = [match.model_dump() for match in matches]
+        row.computed_at = now
+        session.add(row)
+
+    # Keep the caller's samples and mappings loaded; expiring them would cost a
+    # refresh query per row when the dashboard response is assembled.
+    expire_on_commit = session.expire_on_commit
+    session.expire_on_commit = False
+    try:
+        session.commit()
+    except IntegrityError:
+        # A concurrent request stored the same values first; ours are equivalent.
+        session.rollback()
+    finally:
+        session.expire_on_commit = expire_on_commit
+    logger.debug(
+        "Source match results refreshed",
+        extra={
+            "connection_id": connection_id,
+            "source_table": source_table,
+            "source_field": source_field,
+            "dimension": dimension,
+            "rescored": len(stale),
+            "reused": len(seen_at) - len(stale),
+        },
+    )
+    return results
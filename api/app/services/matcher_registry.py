@@ -0,0 +1,127 @@
+"""Process-wide registry of semantic matchers shared across requests."""
+
+from __future__ import annotations
+
+import json
+import logging
+import threading
+from dataclasses import dataclass
+
+from fastapi import Request
+from sqlmodel import Session, select
+
+from ..matcher import SemanticMatcher, invalidate_matcher_indexes
+from ..models import CanonicalValue, SystemConfig
+from .dimension_catalogue import DimensionCatalogue
+from .llm_cache import LLMRankingCache
+from .llm_client import LLMClient
+from .scoring_pool import ProcessScoringPool
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(slots=True)
+class _RegistryEntry:
+    version: int
+    config_key: str
+    matcher: SemanticMatcher
+
+
+class MatcherRegistry:
+    """Cache one :class:`SemanticMatcher` per dimension.
+
+    Each dimension carries a library version drawn from a monotonically
+    increasing clock. :meth:`bump` advances it after canonical writes so the
+    next :meth:`get` reloads the dimension; matchers are also rebuilt when the
+    matcher-relevant system configuration changes. Cached matchers hold
+    detached copies of the configuration and canonical values, so they never
+    refresh through a closed session. Bumps also invalidate the dimension
+    catalogue, whose canonical counts drive the propose fallbacks.
+    """
+
+    def __init__(
+        self,
+        *,
+        llm_cache: LLMRankingCache | None = None,
+        llm_client: LLMClient | None = None,
+        scoring_pool: ProcessScoringPool | None = None,
+        catalogue: DimensionCatalogue | None = None,
+    ) -> None:
+        self.llm_cache = llm_cache
+        self.llm_client = llm_client
+        self.scoring_pool = scoring_pool
+        self.catalogue = catalogue or DimensionCatalogue()
+        self._lock = threading.Lock()
+        self._clock = 0
+        self._global_version = 0
+        self._versions: dict[str, int] = {}
+        self._entries: dict[str, _RegistryEntry] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def version(self, dimension: str) -> int:
+        with self._lock:
+            return max(self._versions.get(dimension, 0), self._global_version)
+
+    def bump(self, dimension: str | None = None) -> int:
+        """Advance the library version for ``dimension`` (or every dimension)."""
+
+        with self._lock:
+            self._clock += 1
+            if dimension is None:
+                self._global_version = self._clock
+                self._entries.clear()
+            else:
+                self._versions[dimension] = self._clock
+                self._entries.pop(dimension, None)
+            version = self._clock
+        invalidate_matcher_indexes(dimension)
+        self.catalogue.invalidate()
+        logger.debug(
+            "Canonical library version bumped",
+            extra={"dimension": dimension, "version": version},
+        )
+        return version
+
+    def get(self, session: Session, config: SystemConfig, dimension: str) -> SemanticMatcher:
+        """Return the shared matcher for ``dimension``, loading it on first use."""
+
+        config_key = self._config_key(config)
+        version = self.version(dimension)
+        with self._lock:
+            entry = self._entries.get(dimension)
+            if entry and entry.version == version and entry.config_key == config_key:
+                self.hits += 1
+                return entry.matcher
+            self.misses += 1
+
+        canonical_values = [
+            CanonicalValue(**canonical.model_dump())
+            for canonical in session.exec(
+                select(CanonicalValue).where(CanonicalValue.dimension == dimension)
+            ).all()
+        ]
+        matcher = SemanticMatcher(
+            config=SystemConfig(**config.model_dump()),
+            canonical_values=canonical_values,
+            llm_cache=self.llm_cache,
+            llm_client=self.llm_client,
+            scoring_pool=self.scoring_pool,
+        )
+        with self._lock:
+            # Skip caching if a write bumped the version while we were loading.
+            if max(self._versions.get(dimension, 0), self._global_version) == version:
+                self._entries[dimension] = _RegistryEntry(version, config_key, matcher)
+        return matcher
+
+    @staticmethod
+    def _config_key(config: SystemConfig) -> str:
+        return json.dumps(
+            config.model_dump(exclude={"id", "updated_at"}), sort_keys=True, default=str
+        )
+
+
+def get_matcher_registry(request: Request) -> MatcherRegistry:
+    """FastAPI dependency returning the application's matcher registry."""
+
+    return request.app.state.matcher_registry
@@ -0,0 +1,335 @@
+"""Persistence of the ``RawValue`` audit rows recorded by match proposals."""
+
+from __future__ import annotations
+
+import logging
+import threading
+from datetime import datetime
+from typing import Any, Iterable
+
+from fastapi import Request
+from sqlalchemy import and_, case, delete, func, insert
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlmodel import Session, select
+
+from ..models import RawValue
+from ..utils import normalise_raw_text
+from .jobs import ProgressCallback, no_progress
+
+logger = logging.getLogger(__name__)
+
+# Statuses still owned by the matcher; reviewed rows keep their decision on upsert.
+PROPOSAL_STATUSES = ("pending", "suggested")
+
+# Unkeyed rows read per page when folding duplicates.
+_COMPACT_PAGE = 500
+
+
+def insert_raw_values(
+    session: Session, rows: list[dict[str, Any]], *, dedup: bool = False
+) -> None:
+    """Insert ``rows`` with one executemany and commit.
+
+    With ``dedup`` the rows are folded per normalised ``(dimension, raw_text)``
+    and upserted: an existing row gains the occurrences, the latest
+    ``last_seen_at`` and, unless it was already reviewed, the latest proposal.
+    """
+
+    if not rows:
+        return
+    if dedup:
+        _upsert_raw_values(session, fold_raw_value_rows(rows))
+    else:
+        # render_nulls keeps rows with and without a proposal in one executemany batch.
+        session.execute(insert(RawValue).execution_options(render_nulls=True), rows)
+    session.commit()
+
+
+def fold_raw_value_rows(rows: Iterable[dict[str, Any]]) -> list[dict[str, Any]]:
+    """Collapse rows sharing a normalised key, keeping the latest proposal."""
+
+    folded: dict[tuple[str, str], dict[str, Any]] = {}
+    for row in rows:
+        key = (row["dimension"], normalise_raw_text(row["raw_text"]))
+        seen = row.get("last_seen_at") or row["created_at"]
+        existing = folded.get(key)
+        if existing is None:
+            folded[key] = {
+                **row,
+                "normalised_text": key[1],
+                "occurrence_count": row.get("occurrence_count", 1),
+                "last_seen_at": seen,
+            }
+            continue
+        existing["occurrence_count"] += row.get("occurrence_count", 1)
+        existing["last_seen_at"] = max(existing["last_seen_at"], seen)
+        existing["status"] = row["status"]
+        existing["proposed_canonical_id"] = row["proposed_canonical_id"]
+    return list(folded.values())
+
+
+def _upsert_raw_values(session: Session, rows: list[dict[str, Any]]) -> None:
+    dialect = session.get_bind().dialect.name
+    if dialect == "postgresql":
+        statement = postgresql.insert(RawValue)
+    elif dialect == "sqlite":
+        statement = sqlite.insert(RawValue)
+    else:
+        _merge_raw_values(session, rows)
+        return
+
+    table = RawValue.__table__
+    excluded = statement.excluded
+    # Plain comparisons: expanding IN parameters are not allowed in executemany.
+    reviewed = and_(*(table.c.status != status for status in PROPOSAL_STATUSES))
+    statement = statement.on_conflict_do_update(
+        index_elements=["dimension", "normalised_text"],
+        set_={
+            "occurrence_count": table.c.occurrence_count + excluded.occurrence_count,
+            "last_seen_at": excluded.last_seen_at,
+            "status": case((reviewed, table.c.status), else_=excluded.status),
+            "proposed_canonical_id": case(
+                (reviewed, table.c.proposed_canonical_id),
+                else_=excluded.proposed_canonical_id,
+            ),
+        },
+    )
+    session.execute(statement.execution_options(render_nulls=True), rows)
+
+
+def _merge_raw_values(session: Session, rows: list[dict[str, Any]]) -> None:
+    # Portable fallback for dialects without ON CONFLICT: one lookup per key.
+    for row in rows:
+        existing = session.exec(
+            select(RawValue).where(
+                RawValue.dimension == row["dimension"],
+                RawValue.normalised_text == row["normalised_text"],
+            )
+        ).first()
+        if existing is None:
+            session.add(RawValue(**row))
+            continue
+        existing.occurrence_count += row["occurrence_count"]
+        existing.last_seen_at = row["last_seen_at"]
+        if existing.status in PROPOSAL_STATUSES:
+            existing.status = row["status"]
+            existing.proposed_canonical_id = row["proposed_canonical_id"]
+        session.add(existing)
+
+
+def compact_raw_values(
+    session: Session, *, progress: ProgressCallback = no_progress
+) -> dict[str, int]:
+    """Fold unkeyed raw values into one row per normalised ``(dimension, raw_text)``.
+
+    Rows without a ``normalised_text`` (recorded one per proposal) are read by
+    id in pages of ``_COMPACT_PAGE``, so memory stays bounded. Each row either
+    takes the key, if no row holds it yet, or is folded into the row that does.
+    That row gains the occurrences, the earliest ``created_at`` and the latest
+    ``last_seen_at``. A review decision wins over a proposal and the newer of
+    two proposals wins, as in a dedup upsert. Two reviewed rows with different
+    decisions are never merged: the unkeyed one is left in place and counted
+    in ``conflicts`` for a reviewer to resolve.
+    """
+
+    unkeyed = RawValue.normalised_text.is_(None)
+    total = session.exec(select(func.count()).select_from(RawValue).where(unkeyed)).one()
+    keyed = removed = conflicts = done = 0
+    after = 0
+    progress(0, total)
+    while True:
+        page = session.exec(
+            select(RawValue)
+            .where(unkeyed, RawValue.id > after)
+            .order_by(RawValue.id)
+            .limit(_COMPACT_PAGE)
+        ).all()
+        if not page:
+            break
+        after = page[-1].id
+        holders = _key_holders(session, {_raw_value_key(row) for row in page})
+        doomed: list[int] = []
+        for row in page:
+            key = _raw_value_key(row)
+            holder = holders.get(key)
+            if holder is None:
+                row.normalised_text = key[1]
+                holders[key] = row
+                keyed += 1
+            elif _conflicting_reviews(holder, row):
+                conflicts += 1
+                logger.warning(
+                    "Raw value review conflict left unkeyed",
+                    extra={"raw_value_id": row.id, "kept_id": holder.id},
+                )
+            else:
+                _fold_raw_value(holder, row)
+                doomed.append(row.id)
+        session.flush()
+        if doomed:
+            session.execute(
+                delete(RawValue).where(RawValue.id.in_(doomed)),
+                execution_options={"synchronize_session": False},
+            )
+        session.commit()
+        removed += len(doomed)
+        done += len(page)
+        progress(done, total)
+
+    logger.info(
+        "Raw values compacted",
+        extra={"keyed": keyed, "removed": removed, "conflicts": conflicts},
+    )
+    return {"keyed": keyed, "removed": removed, "conflicts": conflicts}
+
+
+def _raw_value_key(row: RawValue) -> tuple[str, str]:
+    return row.dimension, normalise_raw_text(row.raw_text)
+
+
+def _key_holders(
+    session: Session, keys: set[tuple[str, str]]
+) -> dict[tuple[str, str], RawValue]:
+    by_dimension: dict[str, list[str]] = {}
+    for dimension, text in keys:
+        by_dimension.setdefault(dimension, []).append(text)
+    holders: dict[tuple[str, str], RawValue] = {}
+    for dimension, texts in by_dimension.items():
+        for holder in session.exec(
+            select(RawValue).where(
+                RawValue.dimension == dimension, RawValue.normalised_text.in_(texts)
+            )
+        ):
+            holders[(dimension, holder.normalised_text)] = holder
+    return holders
+
+
+def _conflicting_reviews(holder: RawValue, row: RawValue) -> bool:
+    if holder.status in PROPOSAL_STATUSES or row.status in PROPOSAL_STATUSES:
+        return False
+    return (holder.status, holder.proposed_canonical_id) != (
+        row.status,
+        row.proposed_canonical_id,
+    )
+
+
+def _fold_raw_value(holder: RawValue, row: RawValue) -> None:
+    holder.occurrence_count = (holder.occurrence_count or 1) + (row.occurrence_count or 1)
+    holder.created_at = min(holder.created_at, row.created_at)
+    holder.last_seen_at = max(_last_seen(holder), _last_seen(row))
+    reviewed = row.status not in PROPOSAL_STATUSES
+    if holder.status in PROPOSAL_STATUSES and (reviewed or row.id > holder.id):
+        holder.status = row.status
+        holder.proposed_canonical_id = row.proposed_canonical_id
+        holder.notes = row.notes
+
+
+def _last_seen(row: RawValue) -> datetime:
+    return row.last_seen_at or row.created_at
+
+
+class RawValueBuffer:
+    """Queue raw value rows in memory and insert them in bulk off the request path.
+
+    A daemon thread started by :meth:`start` flushes the queue every
+    ``flush_interval`` seconds, or as soon as ``max_rows`` rows are waiting.
+    :meth:`shutdown` stops the thread and drains whatever is left. Rows are
+    not visible to readers until they are flushed, and rows still queued when
+    the process dies are lost, which is acceptable for an audit trail that is
+    never read back by the request that wrote it. A failed flush is logged and
+    its rows are dropped so a database outage cannot grow the queue without
+    bound.
+    """
+
+    def __init__(
+        self,
+        engine: Any,
+        *,
+        max_rows: int = 500,
+        flush_interval: float = 1.0,
+        dedup: bool = False,
+    ) -> None:
+        self._engine = engine
+        self.max_rows = max(1, max_rows)
+        self.flush_interval = flush_interval
+        self.dedup = dedup
+        self._pending: list[dict[str, Any]] = []
+        self._condition = threading.Condition()
+        self._flush_lock = threading.Lock()
+        self._stopped = False
+        self.flushed = 0
+        self.dropped = 0
+        self._thread: threading.Thread | None = None
+
+    def start(self) -> None:
+        if self._thread is None:
+            self._thread = threading.Thread(
+                target=self._flush_loop, name="refdata-rawvalue-flush", daemon=True
+            )
+            self._thread.start()
+
+    def extend(self, rows: Iterable[dict[str, Any]]) -> None:
+        with self._condition:
+            self._pending.extend(rows)
+            if len(self._pending) >= self.max_rows:
+                self._condition.notify()
+
+    def pending(self) -> int:
+        with self._condition:
+            return len(self._pending)
+
+    def flush(self) -> int:
+        """Insert every queued row now; returns the number of rows written."""
+
+        with self._flush_lock:
+            with self._condition:
+                rows, self._pending = self._pending, []
+            if not rows:
+                return 0
+            try:
+                with Session(self._engine) as session:
+                    insert_raw_values(session, rows, dedup=self.dedup)
+            except Exception:  # noqa: BLE001 - the flusher thread must survive
+                self.dropped += len(rows)
+                logger.exception("Raw value flush failed", extra={"rows": len(rows)})
+                return 0
+            self.flushed += len(rows)
+            logger.debug("Raw values flushed", extra={"rows": len(rows)})
+            return len(rows)
+
+    def shutdown(self) -> None:
+        with self._condition:
+            self._stopped = True
+            self._condition.notify()
+        if self._thread is not None:
+            self._thread.join()
+        self.flush()
+
+    def _flush_loop(self) -> None:
+        while True:
+            with self._condition:
+                if not self._stopped and len(self._pending) < self.max_rows:
+                    self._condition.wait(self.flush_interval)
+                if self._stopped:
+                    return
+            self.flush()
+
+
+class RawValueRecorder:
+    """Record proposal audit rows immediately or through the write-behind buffer."""
+
+    def __init__(self, *, dedup: bool = False, buffer: RawValueBuffer | None = None) -> None:
+        self.dedup = dedup
+        self.buffer = buffer
+
+    def record(self, session: Session, rows: list[dict[str, Any]]) -> None:
+        if self.buffer is not None:
+            self.buffer.extend(rows)
+        else:
+            insert_raw_values(session, rows, dedup=self.dedup)
+
+
+def get_raw_value_recorder(request: Request) -> RawValueRecorder:
+    """FastAPI dependency returning the application's raw value recorder."""
+
+    return request.app.state.raw_value_recorder
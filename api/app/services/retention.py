@@ -0,0 +1,259 @@
+"""Retention pruning for the ``rawvalue`` and ``sourcesample`` history tables."""
+
+from __future__ import annotations
+
+import logging
+import threading
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable
+
+from sqlalchemy import delete, exists, func
+from sqlalchemy.sql import Select
+from sqlmodel import Session, SQLModel, select
+
+from ..config import Settings
+from ..models import (
+    Job,
+    RawValue,
+    SourceConnection,
+    SourceFieldMapping,
+    SourceMatchResult,
+    SourceSample,
+)
+from .jobs import JobContext, JobRunner, ProgressCallback, no_progress
+from .raw_values import PROPOSAL_STATUSES
+
+logger = logging.getLogger(__name__)
+
+PRUNE_HISTORY_JOB = "maintenance.prune_history"
+
+
+@dataclass(frozen=True, slots=True)
+class RetentionPolicy:
+    """Limits applied by :func:`prune_history`; zero disables a limit."""
+
+    raw_value_days: int = 0
+    raw_value_max_per_dimension: int = 0
+    sample_days: int = 0
+    sample_max_per_field: int = 0
+    prune_unmapped_samples: bool = False
+    batch_size: int = 5000
+
+    @classmethod
+    def from_settings(cls, settings: Settings) -> RetentionPolicy:
+        return cls(
+            raw_value_days=settings.retention_raw_value_days,
+            raw_value_max_per_dimension=settings.retention_raw_value_max_per_dimension,
+            sample_days=settings.retention_sample_days,
+            sample_max_per_field=settings.retention_sample_max_per_field,
+            prune_unmapped_samples=settings.retention_prune_unmapped_samples,
+            batch_size=settings.retention_batch_size,
+        )
+
+
+def prune_history(
+    session: Session,
+    policy: RetentionPolicy,
+    *,
+    now: datetime | None = None,
+    progress: ProgressCallback = no_progress,
+) -> dict[str, int]:
+    """Delete history rows outside ``policy`` in batches of ``policy.batch_size``.
+
+    Every batch is its own short transaction, so pruning a large backlog never
+    holds long locks and leaves dead tuples for autovacuum in small steps.
+    Only proposal audit rows (``pending`` or ``suggested``) are pruned from
+    ``rawvalue``; reviewed rows are kept. Samples whose connection is gone are
+    always removed, and stored match results are dropped with their samples.
+    """
+
+    now = now or datetime.now(timezone.utc)
+    batch = max(1, policy.batch_size)
+    raw_last_seen = func.coalesce(RawValue.last_seen_at, RawValue.created_at)
+    proposal = RawValue.status.in_(PROPOSAL_STATUSES)
+    removed = {"raw_values": 0, "source_samples": 0, "source_match_results": 0}
+    steps: list[tuple[str, Callable[[], int]]] = []
+
+    if policy.raw_value_days:
+        cutoff = now - timedelta(days=policy.raw_value_days)
+        expired = select(RawValue.id).where(proposal, raw_last_seen < cutoff)
+        steps.append(("raw_values", lambda: _delete_batches(session, RawValue, expired, batch)))
+    if policy.raw_value_max_per_dimension:
+        steps.append(
+            (
+                "raw_values",
+                lambda: _trim_groups(
+                    session,
+                    RawValue,
+                    [RawValue.dimension],
+                    keep=policy.raw_value_max_per_dimension,
+                    batch=batch,
+                    order_by=(raw_last_seen.desc(), RawValue.id.desc()),
+                    where=proposal,
+                ),
+            )
+        )
+
+    orphaned = select(SourceSample.id).where(
+        SourceSample.source_connection_id.not_in(select(SourceConnection.id))
+    )
+    steps.append(
+        ("source_samples", lambda: _delete_batches(session, SourceSample, orphaned, batch))
+    )
+    if policy.prune_unmapped_samples:
+        mapped = exists().where(
+            SourceFieldMapping.source_connection_id == SourceSample.source_connection_id,
+            SourceFieldMapping.source_table == SourceSample.source_table,
+            SourceFieldMapping.source_field == SourceSample.source_field,
+        )
+        unmapped = select(SourceSample.id).where(~mapped)
+        steps.append(
+            ("source_samples", lambda: _delete_batches(session, SourceSample, unmapped, batch))
+        )
+    if policy.sample_days:
+        sample_cutoff = now - timedelta(days=policy.sample_days)
+        stale = select(SourceSample.id).where(SourceSample.last_seen_at < sample_cutoff)
+        steps.append(
+            ("source_samples", lambda: _delete_batches(session, SourceSample, stale, batch))
+        )
+    if policy.sample_max_per_field:
+        steps.append(
+            (
+                "source_samples",
+                lambda: _trim_groups(
+                    session,
+                    SourceSample,
+                    [
+                        SourceSample.source_connection_id,
+                        SourceSample.source_table,
+                        SourceSample.source_field,
+                    ],
+                    keep=policy.sample_max_per_field,
+                    batch=batch,
+                    order_by=(SourceSample.last_seen_at.desc(), SourceSample.id.desc()),
+                ),
+            )
+        )
+
+    sampled = exists().where(
+        SourceSample.source_connection_id == SourceMatchResult.source_connection_id,
+        SourceSample.source_table == SourceMatchResult.source_table,
+        SourceSample.source_field == SourceMatchResult.source_field,
+        SourceSample.raw_value == SourceMatchResult.raw_value,
+    )
+    unsampled = select(SourceMatchResult.id).where(~sampled)
+    steps.append(
+        (
+            "source_match_results",
+            lambda: _delete_batches(session, SourceMatchResult, unsampled, batch),
+        )
+    )
+
+    for position, (table, step) in enumerate(steps):
+        progress(position, len(steps))
+        removed[table] += step()
+    progress(len(steps), len(steps))
+
+    logger.info("History pruned", extra=removed)
+    return removed
+
+
+def _delete_batches(
+    session: Session, model: type[SQLModel], matching_ids: Select, batch: int
+) -> int:
+    """Delete the rows selected by ``matching_ids``, ``batch`` ids per transaction."""
+
+    removed = 0
+    statement = matching_ids.limit(batch)
+    while True:
+        ids = list(session.exec(statement).all())
+        if not ids:
+            return removed
+        session.execute(delete(model).where(model.id.in_(ids)))
+        session.commit()
+        removed += len(ids)
+        if len(ids) < batch:
+            return removed
+
+
+def _trim_groups(
+    session: Session,
+    model: type[SQLModel],
+    group_columns: list[Any],
+    *,
+    keep: int,
+    batch: int,
+    order_by: tuple[Any, ...],
+    where: Any = None,
+) -> int:
+    """Keep the first ``keep`` rows of every group by ``order_by``; delete the rest."""
+
+    conditions = [where] if where is not None else []
+    oversized = session.exec(
+        select(*group_columns)
+        .where(*conditions)
+        .group_by(*group_columns)
+        .having(func.count(model.id) > keep)
+    ).all()
+    removed = 0
+    for values in oversized:
+        in_group = [column == value for column, value in zip(group_columns, values)]
+        # Re-running the offset query after each delete yields the next surplus batch.
+        surplus = select(model.id).where(*conditions, *in_group).order_by(*order_by).offset(keep)
+        removed += _delete_batches(session, model, surplus, batch)
+    return removed
+
+
+def _run_prune_history(context: JobContext) -> dict[str, int]:
+    policy = RetentionPolicy.from_settings(context.state.settings)
+    return prune_history(context.session, policy, progress=context.report)
+
+
+def register_jobs(runner: JobRunner) -> None:
+    """Register the maintenance workflows that can run as background jobs."""
+
+    runner.register(PRUNE_HISTORY_JOB, _run_prune_history)
+
+
+class RetentionScheduler:
+    """Submit a history pruning job every ``interval_seconds``.
+
+    Runs go through the job runner, so each one is recorded in the ``job``
+    table like a manual submission. A run is skipped while the previous one is
+    still queued or running. Nothing is scheduled until :meth:`start`.
+    """
+
+    def __init__(self, engine: Any, runner: JobRunner, *, interval_seconds: float) -> None:
+        self._engine = engine
+        self._runner = runner
+        self.interval_seconds = interval_seconds
+        self._stopped = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def start(self) -> None:
+        if self._thread is None:
+            self._thread = threading.Thread(
+                target=self._loop, name="refdata-retention", daemon=True
+            )
+            self._thread.start()
+
+    def shutdown(self) -> None:
+        self._stopped.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    def _loop(self) -> None:
+        while not self._stopped.wait(self.interval_seconds):
+            try:
+                with Session(self._engine) as session:
+                    active = session.exec(
+                        select(Job.id).where(
+                            Job.kind == PRUNE_HISTORY_JOB,
+                            Job.status.in_(("queued", "running")),
+                        )
+                    ).first()
+                if active is None:
+                    self._runner.submit(PRUNE_HISTORY_JOB)
+            except Exception:  # noqa: BLE001 - keep the schedule alive
+                logger.exception("Scheduling history pruning failed")
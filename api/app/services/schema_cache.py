@@ -0,0 +1,175 @@
+"""Persisted cache of reflected source connection metadata."""
+
+from __future__ import annotations
+
+import logging
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Optional
+
+from fastapi import Request
+from sqlalchemy import delete
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.exc import IntegrityError
+from sqlmodel import Session, select
+
+from ..models import SourceSchemaCache
+from ..utils import as_utc
+
+logger = logging.getLogger(__name__)
+
+TABLES_KEY = "tables"
+
+# Keys deleted per statement by the portable fallback.
+_KEY_CHUNK = 500
+
+SchemaLoader = Callable[[], list[dict[str, Any]]]
+
+
+def fields_key(table_name: str, schema: Optional[str]) -> str:
+    return f"fields:{schema or ''}.{table_name}"
+
+
+class SchemaCatalogueCache:
+    """Serve table and field listings from the ``sourceschemacache`` table.
+
+    Entries are keyed by connection and object and carry the fingerprint of
+    the connection settings they were read with, so editing a connection
+    makes its entries stale even before the route clears them. Entries older
+    than ``ttl_seconds`` are reloaded on the next request, and ``refresh``
+    forces a reload. Because the cache lives in the application database it
+    survives restarts and is shared by every API worker. A TTL of zero turns
+    caching off.
+    """
+
+    def __init__(self, ttl_seconds: float) -> None:
+        self.ttl_seconds = ttl_seconds
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl_seconds > 0
+
+    def load(
+        self,
+        session: Session,
+        connection_id: int,
+        fingerprint: str,
+        key: str,
+        loader: SchemaLoader,
+        *,
+        refresh: bool = False,
+    ) -> list[dict[str, Any]]:
+        """Return the cached payload for ``key`` or call ``loader`` and store it."""
+
+        if not self.enabled:
+            return loader()
+        if not refresh:
+            entry = session.exec(
+                select(SourceSchemaCache).where(
+                    SourceSchemaCache.source_connection_id == connection_id,
+                    SourceSchemaCache.object_key == key,
+                )
+            ).first()
+            if entry is not None and self._is_fresh(entry, fingerprint):
+                return list(entry.payload)
+
+        payload = loader()
+        self.store(session, connection_id, fingerprint, {key: payload})
+        return payload
+
+    def store(
+        self,
+        session: Session,
+        connection_id: int,
+        fingerprint: str,
+        entries: dict[str, list[dict[str, Any]]],
+    ) -> None:
+        """Replace the cached payloads of ``entries`` in one transaction.
+
+        Rows are upserted, so two requests that miss the cache at the same
+        time both succeed and the last writer's payload is kept.
+        """
+
+        if not self.enabled or not entries:
+            return
+        now = datetime.now(timezone.utc)
+        rows = [
+            {
+                "source_connection_id": connection_id,
+                "object_key": key,
+                "settings_fingerprint": fingerprint,
+                "payload": payload,
+                "refreshed_at": now,
+            }
+            for key, payload in entries.items()
+        ]
+        dialect = session.get_bind().dialect.name
+        if dialect == "postgresql":
+            statement = postgresql.insert(SourceSchemaCache)
+        elif dialect == "sqlite":
+            statement = sqlite.insert(SourceSchemaCache)
+        else:
+            self._replace_entries(session, connection_id, rows)
+            return
+
+        excluded = statement.excluded
+        session.execute(
+            statement.on_conflict_do_update(
+                index_elements=["source_connection_id", "object_key"],
+                set_={
+                    "settings_fingerprint": excluded.settings_fingerprint,
+                    "payload": excluded.payload,
+                    "refreshed_at": excluded.refreshed_at,
+                },
+            ),
+            rows,
+        )
+        session.commit()
+        logger.debug(
+            "Source schema metadata cached",
+            extra={"connection_id": connection_id, "entries": len(entries)},
+        )
+
+    def _replace_entries(
+        self, session: Session, connection_id: int, rows: list[dict[str, Any]]
+    ) -> None:
+        # Portable fallback for dialects without ON CONFLICT. A concurrent
+        # writer may insert a key between the delete and the insert; its
+        # payload is as fresh as ours, so keep it.
+        keys = [row["object_key"] for row in rows]
+        for start in range(0, len(keys), _KEY_CHUNK):
+            session.exec(
+                delete(SourceSchemaCache).where(
+                    SourceSchemaCache.source_connection_id == connection_id,
+                    SourceSchemaCache.object_key.in_(keys[start : start + _KEY_CHUNK]),
+                )
+            )
+        session.add_all(SourceSchemaCache(**row) for row in rows)
+        try:
+            session.commit()
+        except IntegrityError:
+            session.rollback()
+            logger.debug(
+                "Source schema metadata already cached by a concurrent request",
+                extra={"connection_id": connection_id},
+            )
+
+    def clear(self, session: Session, connection_id: int) -> None:
+        """Drop every cached entry of ``connection_id`` (the caller commits)."""
+
+        session.exec(
+            delete(SourceSchemaCache).where(
+                SourceSchemaCache.source_connection_id == connection_id
+            )
+        )
+
+    def _is_fresh(self, entry: SourceSchemaCache, fingerprint: str) -> bool:
+        if entry.settings_fingerprint != fingerprint:
+            return False
+        age = datetime.now(timezone.utc) - as_utc(entry.refreshed_at)
+        return age <= timedelta(seconds=self.ttl_seconds)
+
+
+def get_schema_cache(request: Request) -> SchemaCatalogueCache:
+    """FastAPI dependency returning the application's schema catalogue cache."""
+
+    return request.app.state.schema_cache
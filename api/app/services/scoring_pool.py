@@ -0,0 +1,144 @@
+"""Process pool for CPU-bound scoring of large raw value batches."""
+
+from __future__ import annotations
+
+import logging
+import multiprocessing
+import threading
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass
+from itertools import repeat
+from typing import Any, Callable, Sequence
+
+logger = logging.getLogger(__name__)
+
+# Installed once per worker by ``_install_index``, so a fitted index is sent to
+# each process when it starts rather than pickled per task.
+_WORKER_INDEX: Any = None
+_WORKER_SCORER: Callable[..., list[Any]] | None = None
+
+# Imported by the fork server before it forks workers, so each worker starts
+# with scikit-learn loaded instead of importing it when unpickling the index.
+_MATCHER_MODULE = __name__.rsplit(".", 2)[0] + ".matcher"
+
+# Shards per worker; a few per process keeps cores busy when rows vary in cost.
+_SHARDS_PER_PROCESS = 4
+
+
+def _install_index(index: Any, scorer: Callable[..., list[Any]]) -> None:
+    global _WORKER_INDEX, _WORKER_SCORER
+
+    _WORKER_INDEX, _WORKER_SCORER = index, scorer
+
+
+def _score_shard(texts: Sequence[str], args: tuple[Any, ...]) -> list[Any]:
+    assert _WORKER_SCORER is not None, "scoring worker started without an index"
+    return _WORKER_SCORER(_WORKER_INDEX, texts, *args)
+
+
+def _worker_context() -> multiprocessing.context.BaseContext:
+    # Never fork the threaded API process itself: a child could inherit a lock
+    # held by another thread. The fork server is a clean single-threaded parent.
+    try:
+        context = multiprocessing.get_context("forkserver")
+    except ValueError:  # pragma: no cover - platforms without fork (Windows)
+        return multiprocessing.get_context("spawn")
+    context.set_forkserver_preload([_MATCHER_MODULE])
+    return context
+
+
+@dataclass(slots=True)
+class _IndexPool:
+    index: Any
+    scorer: Callable[..., list[Any]]
+    executor: ProcessPoolExecutor
+
+
+class ProcessScoringPool:
+    """Shard large scoring runs across ``processes`` worker processes.
+
+    ``map(index, scorer, texts, *args)`` calls ``scorer(index, shard, *args)``
+    for contiguous shards of ``texts`` and concatenates the per-text results in
+    input order. Workers start from a fork server (spawn where fork is
+    unavailable) and receive ``index`` and ``scorer`` once through the pool
+    initializer, so only the raw texts and the (small) top-k results cross
+    process boundaries per run. Each index gets its own set of workers; the
+    ``max_pools`` most recently used sets are kept, so alternating between a
+    few dimensions or backends does not restart workers. Both must pickle,
+    which is why scorers are module-level functions. Runs are serialised.
+    """
+
+    def __init__(self, processes: int, *, min_values: int = 5000, max_pools: int = 2) -> None:
+        self.processes = processes
+        self.min_values = max(1, min_values)
+        self.max_pools = max(1, max_pools)
+        self._context = _worker_context()
+        self._lock = threading.Lock()
+        # Keyed by ``id(index)``; entries hold the index, so the id stays unique.
+        self._pools: OrderedDict[int, _IndexPool] = OrderedDict()
+
+    @property
+    def available(self) -> bool:
+        return self.processes > 1
+
+    def should_use(self, count: int) -> bool:
+        """Whether a run of ``count`` values is large enough to amortise the pool."""
+
+        return self.available and count >= self.min_values
+
+    def map(
+        self,
+        index: Any,
+        scorer: Callable[..., list[Any]],
+        texts: Sequence[str],
+        *args: Any,
+    ) -> list[Any]:
+        shard_size = max(1, -(-len(texts) // (self.processes * _SHARDS_PER_PROCESS)))
+        shards = [texts[start : start + shard_size] for start in range(0, len(texts), shard_size)]
+        with self._lock:
+            executor = self._executor_for(index, scorer)
+            try:
+                parts = list(executor.map(_score_shard, shards, repeat(args)))
+            except BrokenProcessPool:
+                logger.warning("Scoring pool broke; scoring this run in-process")
+                self._discard(id(index))
+                return scorer(index, texts, *args)
+        return [result for part in parts for result in part]
+
+    def shutdown(self) -> None:
+        with self._lock:
+            for key in list(self._pools):
+                self._discard(key)
+
+    def _executor_for(
+        self, index: Any, scorer: Callable[..., list[Any]]
+    ) -> ProcessPoolExecutor:
+        key = id(index)
+        pool = self._pools.get(key)
+        if pool is not None and pool.index is index and pool.scorer is scorer:
+            self._pools.move_to_end(key)
+            return pool.executor
+        if pool is not None:
+            self._discard(key)
+        while len(self._pools) >= self.max_pools:
+            self._discard(next(iter(self._pools)))
+
+        executor = ProcessPoolExecutor(
+            max_workers=self.processes,
+            mp_context=self._context,
+            initializer=_install_index,
+            initargs=(index, scorer),
+        )
+        self._pools[key] = _IndexPool(index, scorer, executor)
+        logger.debug(
+            "Started scoring workers",
+            extra={"processes": self.processes, "pools": len(self._pools)},
+        )
+        return executor
+
+    def _discard(self, key: int) -> None:
+        pool = self._pools.pop(key, None)
+        if pool is not None:
+            pool.executor.shutdown(wait=True, cancel_futures=True)
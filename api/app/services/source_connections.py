@@ -2,16 +2,23 @@
 
 from __future__ import annotations
 
+import hashlib
 import json
 import logging
+import queue
+import threading
 import time
-from dataclasses import dataclass
-from typing import Any, Iterable, Optional
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+from typing import Any, Callable, Iterable, Iterator, Optional
 from urllib.parse import urlencode
 
+from fastapi import Request
 from sqlalchemy import MetaData, Table, func, inspect, select, text
-from sqlalchemy.engine import URL
-from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.engine import URL, make_url
+from sqlalchemy.engine.reflection import ObjectKind
+from sqlalchemy.exc import DBAPIError, SQLAlchemyError
 from sqlmodel import create_engine
 
 logger = logging.getLogger(__name__)
@@ -33,6 +40,17 @@ class ConnectionSettings:
     password: Optional[str] = None
     options: Optional[str] = None
     name: Optional[str] = None
+    connection_id: Optional[int] = None
+
+    def fingerprint(self) -> str:
+        """Digest of everything that shapes the engine built for these settings."""
+
+        payload = asdict(self)
+        payload.pop("name")
+        payload.pop("connection_id")
+        return hashlib.sha256(
+            json.dumps(payload, sort_keys=True, default=str).encode("utf-8")
+        ).hexdigest()
 
 
 @dataclass
@@ -133,62 +151,226 @@ def _build_sqlalchemy_url(settings: ConnectionSettings, query: dict[str, str]) -
     raise SourceConnectionServiceError(f"Unsupported database type '{settings.db_type}'")
 
 
-def _create_engine(settings: ConnectionSettings) -> tuple[Any, ParsedOptions]:
+def _create_engine(
+    settings: ConnectionSettings, pool_options: Optional[dict[str, Any]] = None
+) -> tuple[Any, ParsedOptions]:
     parsed = _parse_options(settings.options)
     url = _build_sqlalchemy_url(settings, parsed.query)
-    engine = create_engine(url, pool_pre_ping=True, connect_args=parsed.connect_args)
+    options = dict(pool_options or {})
+    if make_url(url).get_backend_name() == "sqlite":
+        # SQLite pools are per-file or per-thread and reject sizing arguments.
+        options = {}
+    engine = create_engine(
+        url, pool_pre_ping=True, connect_args=parsed.connect_args, **options
+    )
     return engine, parsed
 
 
-def _should_skip_table(dialect: str, schema: Optional[str], name: str) -> bool:
-    if dialect == "sqlite" and name.startswith("sqlite_"):
-        return True
-    if schema in {"pg_catalog", "information_schema"}:
-        return True
-    return False
-
+@dataclass
+class _EngineEntry:
+    fingerprint: str
+    engine: Any
+    parsed: ParsedOptions
+    last_used: float
+
+
+class SourceEngineRegistry:
+    """Share one pooled engine per saved source connection across requests.
+
+    Engines are keyed by connection id and rebuilt when the fingerprint of the
+    connection settings changes. Pools are bounded by ``pool_size`` and
+    ``max_overflow``; engines unused for ``idle_seconds`` are disposed on the
+    next acquisition, and at most ``max_engines`` are kept (least recently used
+    first out). Routes call :meth:`discard` when a connection is updated or
+    deleted, and helpers discard an engine whose database call failed so the
+    next attempt reconnects from scratch.
+    """
+
+    def __init__(
+        self,
+        *,
+        pool_size: int = 2,
+        max_overflow: int = 3,
+        idle_seconds: float = 300.0,
+        max_engines: int = 32,
+    ) -> None:
+        self.pool_options = {"pool_size": pool_size, "max_overflow": max_overflow}
+        self.idle_seconds = idle_seconds
+        self.max_engines = max(1, max_engines)
+        self._entries: dict[int, _EngineEntry] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def acquire(self, settings: ConnectionSettings) -> tuple[Any, ParsedOptions]:
+        if settings.connection_id is None:
+            raise ValueError("Only saved connections can use pooled engines")
+        fingerprint = settings.fingerprint()
+        now = time.monotonic()
+        retired: list[Any] = []
+        with self._lock:
+            retired.extend(self._pop_idle(now))
+            entry = self._entries.get(settings.connection_id)
+            if entry and entry.fingerprint == fingerprint:
+                entry.last_used = now
+                self.hits += 1
+            else:
+                self.misses += 1
+                if entry:
+                    retired.append(self._entries.pop(settings.connection_id).engine)
+                engine, parsed = _create_engine(settings, self.pool_options)
+                entry = _EngineEntry(fingerprint, engine, parsed, now)
+                self._entries[settings.connection_id] = entry
+                while len(self._entries) > self.max_engines:
+                    oldest = min(self._entries, key=lambda key: self._entries[key].last_used)
+                    retired.append(self._entries.pop(oldest).engine)
+        for engine in retired:
+            engine.dispose()
+        return entry.engine, entry.parsed
+
+    @property
+    def max_connections(self) -> int:
+        """Connections one engine's pool may hand out at once."""
+
+        return self.pool_options["pool_size"] + self.pool_options["max_overflow"]
+
+    def discard(self, connection_id: int) -> None:
+        with self._lock:
+            entry = self._entries.pop(connection_id, None)
+        if entry:
+            entry.engine.dispose()
+            logger.debug("Disposed source engine", extra={"connection_id": connection_id})
+
+    def dispose_all(self) -> None:
+        with self._lock:
+            entries, self._entries = list(self._entries.values()), {}
+        for entry in entries:
+            entry.engine.dispose()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _pop_idle(self, now: float) -> list[Any]:
+        idle = [
+            key
+            for key, entry in self._entries.items()
+            if now - entry.last_used > self.idle_seconds
+        ]
+        return [self._entries.pop(key).engine for key in idle]
+
+
+def get_source_engines(request: Request) -> SourceEngineRegistry | None:
+    """FastAPI dependency returning the shared source engine registry, if configured."""
+
+    return getattr(request.app.state, "source_engines", None)
+
+
+@contextmanager
+def _open_engine(
+    settings: ConnectionSettings,
+    engines: Optional[SourceEngineRegistry],
+    purpose: str,
+) -> Iterator[tuple[Any, ParsedOptions]]:
+    """Yield a pooled engine for saved connections, or a throwaway one otherwise."""
 
-def test_connection(settings: ConnectionSettings) -> float:
+    pooled = engines is not None and settings.connection_id is not None
     try:
-        engine, _ = _create_engine(settings)
+        if pooled:
+            engine, parsed = engines.acquire(settings)
+        else:
+            engine, parsed = _create_engine(settings)
     except SourceConnectionServiceError:
         raise
     except Exception as exc:  # pragma: no cover - defensive logging
-        logger.debug(
-            "Failed to initialise engine for %s",
-            settings.name or settings.database,
-            exc_info=exc,
-        )
+        logger.debug("Failed to initialise engine for %s", purpose, exc_info=exc)
         raise SourceConnectionServiceError(str(exc)) from exc
 
     try:
-        start = time.perf_counter()
-        with engine.connect() as connection:
-            connection.execute(text("SELECT 1"))
-        elapsed_ms = (time.perf_counter() - start) * 1000
-    except SQLAlchemyError as exc:
-        logger.debug(
-            "Connection test failed for %s",
-            settings.name or settings.database,
-            exc_info=exc,
-        )
-        raise SourceConnectionServiceError(str(exc)) from exc
+        yield engine, parsed
+    except SourceConnectionServiceError as exc:
+        if pooled and isinstance(exc.__cause__, DBAPIError):
+            engines.discard(settings.connection_id)
+        raise
     finally:
-        engine.dispose()
+        if not pooled:
+            engine.dispose()
+
+
+_POSTGRES_TYPES = {"postgres", "postgresql", "postgresql+psycopg"}
+
+# One catalogue scan instead of per-schema inspector round trips. Reads pg_class
+# like the inspector does, so user schemas, privileges and relation kinds agree
+# with the other listing paths: ordinary, partitioned and foreign tables, plus
+# plain and materialised views.
+_POSTGRES_TABLES = text(
+    """
+    SELECT n.nspname AS table_schema, c.relname AS table_name, c.relkind
+    FROM pg_catalog.pg_class AS c
+    JOIN pg_catalog.pg_namespace AS n ON n.oid = c.relnamespace
+    WHERE c.relkind IN ('r', 'p', 'f', 'v', 'm')
+      AND n.nspname NOT IN ('pg_catalog', 'information_schema')
+      AND n.nspname NOT LIKE 'pg\\_%'
+      AND (CAST(:schema AS TEXT) IS NULL OR n.nspname = :schema)
+    """
+)
+_POSTGRES_VIEW_KINDS = {"v", "m"}
+
+
+def supports_bulk_catalogue(settings: ConnectionSettings) -> bool:
+    """Whether :func:`list_schema_fields` reflects a whole schema in one query.
+
+    Other dialects still work but reflect table by table, so callers gain
+    nothing over :func:`list_fields`.
+    """
+
+    return settings.db_type.strip().lower() in _POSTGRES_TYPES
+
+
+def _inspected_field(column: dict[str, Any]) -> dict[str, Any]:
+    column_type = column.get("type")
+    default = column.get("default")
+    return {
+        "name": column["name"],
+        "data_type": str(column_type) if column_type is not None else None,
+        "nullable": column.get("nullable"),
+        "default": str(default) if default is not None else None,
+    }
 
-    return float(elapsed_ms)
+
+def _should_skip_table(dialect: str, schema: Optional[str], name: str) -> bool:
+    if dialect == "sqlite" and name.startswith("sqlite_"):
+        return True
+    if schema in {"pg_catalog", "information_schema"}:
+        return True
+    return False
 
 
-def list_tables(settings: ConnectionSettings) -> list[dict[str, Any]]:
-    try:
-        engine, parsed = _create_engine(settings)
-    except SourceConnectionServiceError:
-        raise
-    except Exception as exc:  # pragma: no cover - defensive logging
-        logger.debug("Failed to initialise engine for table discovery", exc_info=exc)
-        raise SourceConnectionServiceError(str(exc)) from exc
+def test_connection(
+    settings: ConnectionSettings, engines: Optional[SourceEngineRegistry] = None
+) -> float:
+    with _open_engine(settings, engines, settings.name or settings.database) as (engine, _):
+        try:
+            start = time.perf_counter()
+            with engine.connect() as connection:
+                connection.execute(text("SELECT 1"))
+            elapsed_ms = (time.perf_counter() - start) * 1000
+        except SQLAlchemyError as exc:
+            logger.debug(
+                "Connection test failed for %s",
+                settings.name or settings.database,
+                exc_info=exc,
+            )
+            raise SourceConnectionServiceError(str(exc)) from exc
 
-    try:
+    return float(elapsed_ms)
+
+
+def list_tables(
+    settings: ConnectionSettings, engines: Optional[SourceEngineRegistry] = None
+) -> list[dict[str, Any]]:
+    with _open_engine(settings, engines, "table discovery") as (engine, parsed):
+        if engine.dialect.name == "postgresql":
+            return _list_postgres_tables(engine, parsed.schema)
         try:
             inspector = inspect(engine)
             dialect = engine.dialect.name
@@ -223,31 +405,45 @@ def list_tables(settings: ConnectionSettings) -> list[dict[str, Any]]:
                     continue
                 results.append({"name": name, "schema": schema, "type": "view"})
 
-        unique: dict[tuple[Optional[str], str, str], dict[str, Any]] = {}
-        for item in results:
-            unique[(item.get("schema"), item["name"], item["type"])] = item
+    unique: dict[tuple[Optional[str], str, str], dict[str, Any]] = {}
+    for item in results:
+        unique[(item.get("schema"), item["name"], item["type"])] = item
 
-        ordered = sorted(
-            unique.values(),
-            key=lambda item: ((item.get("schema") or ""), item["name"], item["type"]),
-        )
-        return ordered
-    finally:
-        engine.dispose()
+    ordered = sorted(
+        unique.values(),
+        key=lambda item: ((item.get("schema") or ""), item["name"], item["type"]),
+    )
+    return ordered
 
 
-def list_fields(
-    settings: ConnectionSettings, table_name: str, schema: Optional[str]
-) -> list[dict[str, Any]]:
+def _list_postgres_tables(engine: Any, schema: Optional[str]) -> list[dict[str, Any]]:
     try:
-        engine, parsed = _create_engine(settings)
-    except SourceConnectionServiceError:
-        raise
-    except Exception as exc:  # pragma: no cover - defensive logging
-        logger.debug("Failed to initialise engine for column discovery", exc_info=exc)
+        with engine.connect() as connection:
+            rows = connection.execute(_POSTGRES_TABLES, {"schema": schema}).fetchall()
+    except SQLAlchemyError as exc:
+        logger.debug("Failed to read the table catalogue", exc_info=exc)
         raise SourceConnectionServiceError(str(exc)) from exc
 
-    try:
+    return sorted(
+        (
+            {
+                "name": row.table_name,
+                "schema": row.table_schema,
+                "type": "view" if row.relkind in _POSTGRES_VIEW_KINDS else "table",
+            }
+            for row in rows
+        ),
+        key=lambda item: (item["schema"] or "", item["name"], item["type"]),
+    )
+
+
+def list_fields(
+    settings: ConnectionSettings,
+    table_name: str,
+    schema: Optional[str],
+    engines: Optional[SourceEngineRegistry] = None,
+) -> list[dict[str, Any]]:
+    with _open_engine(settings, engines, "column discovery") as (engine, parsed):
         try:
             inspector = inspect(engine)
         except SQLAlchemyError as exc:
@@ -266,73 +462,151 @@ def list_fields(
                 exc_info=exc,
             )
             raise SourceConnectionServiceError(str(exc)) from exc
-    finally:
-        engine.dispose()
-
-    fields: list[dict[str, Any]] = []
-    for column in columns:
-        column_type = column.get("type")
-        default = column.get("default")
-        fields.append(
-            {
-                "name": column["name"],
-                "data_type": str(column_type) if column_type is not None else None,
-                "nullable": column.get("nullable"),
-                "default": str(default) if default is not None else None,
-            }
-        )
 
+    fields = [_inspected_field(column) for column in columns]
     fields.sort(key=lambda item: item["name"])
     return fields
 
 
-def sample_field_values(
+def list_schema_fields(
     settings: ConnectionSettings,
-    table_name: str,
-    field_name: str,
     schema: Optional[str],
-    limit: int = 100,
-) -> list[tuple[str, int]]:
-    try:
-        engine, parsed = _create_engine(settings)
-    except SourceConnectionServiceError:
-        raise
-    except Exception as exc:  # pragma: no cover - defensive logging
-        logger.debug("Failed to initialise engine for sample capture", exc_info=exc)
-        raise SourceConnectionServiceError(str(exc)) from exc
+    engines: Optional[SourceEngineRegistry] = None,
+) -> dict[str, list[dict[str, Any]]]:
+    """Return the fields of every table and view in ``schema``, keyed by table name.
 
-    target_schema = schema if schema is not None else parsed.schema
+    Uses the inspector's multi-table reflection, so the fields match
+    :func:`list_fields` exactly; on PostgreSQL that is a single catalogue
+    query (see :func:`supports_bulk_catalogue`). ``schema`` defaults to the
+    connection's schema option, then the database's default schema.
+    """
 
-    try:
-        metadata = MetaData(schema=target_schema)
-        table = Table(table_name, metadata, autoload_with=engine, schema=target_schema)
-        if field_name not in table.c:
-            raise SourceConnectionServiceError(
-                f"Field '{field_name}' not found on {table_name}."
+    with _open_engine(settings, engines, "column discovery") as (engine, parsed):
+        target_schema = schema if schema is not None else parsed.schema
+        try:
+            reflected = inspect(engine).get_multi_columns(
+                schema=target_schema, kind=ObjectKind.ANY
             )
-        column = table.c[field_name]
-        query = (
-            select(column.label("raw_value"), func.count().label("occurrence_count"))
-            .select_from(table)
-            .where(column.is_not(None))
-            .group_by(column)
-            .order_by(func.count().desc())
-            .limit(limit)
-        )
-        with engine.connect() as connection:
-            rows = connection.execute(query).fetchall()
-    except SQLAlchemyError as exc:
-        logger.debug(
-            "Failed to sample values for %s.%s",
-            table_name,
-            field_name,
-            exc_info=exc,
-        )
-        raise SourceConnectionServiceError(str(exc)) from exc
-    finally:
-        engine.dispose()
+        except SQLAlchemyError as exc:
+            logger.debug("Failed to read the column catalogue of %s", target_schema, exc_info=exc)
+            raise SourceConnectionServiceError(str(exc)) from exc
+
+    tables: dict[str, list[dict[str, Any]]] = {}
+    for (_, table_name), columns in reflected.items():
+        fields = [_inspected_field(column) for column in columns]
+        fields.sort(key=lambda item: item["name"])
+        tables[table_name] = fields
+    return tables
+
+
+SampleChunk = list[tuple[str, int]]
+
+
+def stream_table_fields(
+    settings: ConnectionSettings,
+    table_name: str,
+    field_limits: dict[str, Optional[int]],
+    schema: Optional[str],
+    engines: Optional[SourceEngineRegistry] = None,
+    chunk_size: int = 1000,
+) -> Iterator[tuple[str, SampleChunk]]:
+    """Yield ``(field, values)`` chunks of the value distribution of each field.
+
+    The table is reflected once for all fields. Each field's ``GROUP BY`` is
+    read through a server-side cursor in chunks of ``chunk_size`` rows; a limit
+    keeps the most frequent values and ``None`` keeps every distinct value,
+    unordered. With a pooled engine the queries run concurrently, bounded by
+    the pool's capacity, and hand chunks over through a bounded queue so memory
+    stays flat; a throwaway engine runs them one after another. Every sampled
+    field yields at least one chunk, possibly empty, and fields missing from
+    the table yield none.
+    """
+
+    pooled = engines is not None and settings.connection_id is not None
+    with _open_engine(settings, engines, "sample capture") as (engine, parsed):
+        target_schema = schema if schema is not None else parsed.schema
+        try:
+            metadata = MetaData(schema=target_schema)
+            table = Table(table_name, metadata, autoload_with=engine, schema=target_schema)
+            fields = [name for name in field_limits if name in table.c]
+
+            def distribution(name: str) -> Iterator[SampleChunk]:
+                column = table.c[name]
+                query = (
+                    select(column.label("raw_value"), func.count().label("occurrence_count"))
+                    .select_from(table)
+                    .where(column.is_not(None))
+                    .group_by(column)
+                )
+                if field_limits[name] is not None:
+                    query = query.order_by(func.count().desc()).limit(field_limits[name])
+                with engine.connect() as connection:
+                    result = connection.execution_options(
+                        stream_results=True, yield_per=chunk_size
+                    ).execute(query)
+                    emitted = False
+                    for rows in result.partitions():
+                        emitted = True
+                        yield [(str(row.raw_value), int(row.occurrence_count)) for row in rows]
+                    if not emitted:
+                        yield []
+
+            workers = min(len(fields), engines.max_connections if pooled else 1)
+            if workers > 1:
+                yield from _stream_concurrently(fields, distribution, workers)
+            else:
+                for name in fields:
+                    for chunk in distribution(name):
+                        yield name, chunk
+        except SQLAlchemyError as exc:
+            logger.debug("Failed to sample values for %s", table_name, exc_info=exc)
+            raise SourceConnectionServiceError(str(exc)) from exc
+
+
+def _stream_concurrently(
+    fields: list[str],
+    distribution: Callable[[str], Iterator[SampleChunk]],
+    workers: int,
+) -> Iterator[tuple[str, SampleChunk]]:
+    # Producers block once the queue holds a few chunks per worker, and give up
+    # when the consumer stops early.
+    chunks: queue.Queue = queue.Queue(maxsize=workers * 2)
+    stopped = threading.Event()
 
-    return [(str(row.raw_value), int(row.occurrence_count)) for row in rows]
+    def hand_over(item: tuple[str, Optional[SampleChunk], Optional[BaseException]]) -> bool:
+        while not stopped.is_set():
+            try:
+                chunks.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def produce(name: str) -> None:
+        try:
+            for chunk in distribution(name):
+                if not hand_over((name, chunk, None)):
+                    return
+        except BaseException as exc:  # noqa: BLE001 - re-raised by the consumer
+            hand_over((name, None, exc))
+            return
+        hand_over((name, None, None))
+
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="refdata-sample") as executor:
+        for name in fields:
+            executor.submit(produce, name)
+        remaining = len(fields)
+        try:
+            while remaining:
+                name, chunk, error = chunks.get()
+                if error is not None:
+                    raise error
+                if chunk is None:
+                    remaining -= 1
+                    continue
+                yield name, chunk
+        finally:
+            stopped.set()
 
 
 def merge_settings(
@@ -347,6 +621,7 @@ def merge_settings(
         "password": connection.password,
         "options": connection.options,
         "name": getattr(connection, "name", None),
+        "connection_id": getattr(connection, "id", None),
     }
 
     if overrides:
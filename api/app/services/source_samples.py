@@ -0,0 +1,186 @@
+"""Bulk persistence of the ``SourceSample`` rows written by capture and ingest."""
+
+from __future__ import annotations
+
+import logging
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any, Iterable, Optional
+
+from fastapi import Request
+from sqlalchemy import func
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlmodel import Session, select
+
+from ..config import Settings
+from ..models import SourceFieldMapping, SourceSample
+
+logger = logging.getLogger(__name__)
+
+# Raw values looked up per statement by the portable fallback.
+_PREFETCH_CHUNK = 500
+
+SampleValue = tuple[str, int, Optional[str]]
+
+
+@dataclass(frozen=True, slots=True)
+class CapturePolicy:
+    """How many distinct values sample capture keeps and how it writes them."""
+
+    default_limit: int = 100
+    chunk_size: int = 1000
+
+    @classmethod
+    def from_settings(cls, settings: Settings) -> CapturePolicy:
+        return cls(
+            default_limit=settings.source_capture_default_limit,
+            chunk_size=settings.source_capture_chunk_size,
+        )
+
+    def limit_for(self, mapping: SourceFieldMapping) -> Optional[int]:
+        """The mapping's capture limit, or the default; ``None`` keeps every value."""
+
+        limit = self.default_limit if mapping.capture_limit is None else mapping.capture_limit
+        return limit or None
+
+
+def upsert_source_samples(
+    session: Session,
+    connection_id: int,
+    source_table: str,
+    source_field: str,
+    values: Iterable[SampleValue],
+    *,
+    accumulate: bool = False,
+    now: datetime | None = None,
+    returning: bool = True,
+) -> list[SourceSample]:
+    """Insert or update the samples of one field in a single statement.
+
+    ``values`` are ``(raw_value, occurrence_count, dimension)`` tuples. An
+    existing sample takes the new count, or adds it when ``accumulate`` is
+    set, keeps its dimension unless a new one is given, and is stamped with
+    ``now``. The caller commits. Samples are returned in input order; with
+    ``returning`` off nothing is read back and the list is empty.
+    """
+
+    now = now or datetime.now(timezone.utc)
+    rows = _fold_values(connection_id, source_table, source_field, values, now)
+    if not rows:
+        return []
+
+    samples = _upsert_samples(session, rows, accumulate=accumulate, returning=returning)
+    position = {row["raw_value"]: index for index, row in enumerate(rows)}
+    samples.sort(key=lambda sample: position[sample.raw_value])
+    logger.debug(
+        "Source samples upserted",
+        extra={"connection_id": connection_id, "rows": len(rows)},
+    )
+    return samples
+
+
+def _upsert_samples(
+    session: Session, rows: list[dict[str, Any]], *, accumulate: bool, returning: bool
+) -> list[SourceSample]:
+    dialect = session.get_bind().dialect.name
+    if dialect == "postgresql":
+        statement = postgresql.insert(SourceSample)
+    elif dialect == "sqlite":
+        statement = sqlite.insert(SourceSample)
+    else:
+        samples = _merge_samples(session, rows, accumulate=accumulate)
+        return samples if returning else []
+
+    table = SourceSample.__table__
+    excluded = statement.excluded
+    statement = statement.on_conflict_do_update(
+        index_elements=["source_connection_id", "source_table", "source_field", "raw_value"],
+        set_={
+            "occurrence_count": (
+                table.c.occurrence_count + excluded.occurrence_count
+                if accumulate
+                else excluded.occurrence_count
+            ),
+            "dimension": func.coalesce(excluded.dimension, table.c.dimension),
+            "last_seen_at": excluded.last_seen_at,
+        },
+    )
+    if not returning:
+        session.execute(statement.execution_options(render_nulls=True), rows)
+        return []
+    # populate_existing refreshes samples already in the session's identity map.
+    statement = statement.returning(SourceSample).execution_options(
+        render_nulls=True, populate_existing=True
+    )
+    return list(session.scalars(statement, rows))
+
+
+def _fold_values(
+    connection_id: int,
+    source_table: str,
+    source_field: str,
+    values: Iterable[SampleValue],
+    now: datetime,
+) -> list[dict[str, Any]]:
+    # One row per raw value: ON CONFLICT cannot touch the same row twice.
+    folded: dict[str, dict[str, Any]] = {}
+    for raw_value, occurrence_count, dimension in values:
+        existing = folded.get(raw_value)
+        if existing is None:
+            folded[raw_value] = {
+                "source_connection_id": connection_id,
+                "source_table": source_table,
+                "source_field": source_field,
+                "dimension": dimension,
+                "raw_value": raw_value,
+                "occurrence_count": occurrence_count,
+                "last_seen_at": now,
+            }
+            continue
+        existing["occurrence_count"] += occurrence_count
+        existing["dimension"] = dimension or existing["dimension"]
+    return list(folded.values())
+
+
+def _merge_samples(
+    session: Session, rows: list[dict[str, Any]], *, accumulate: bool
+) -> list[SourceSample]:
+    # Portable fallback for dialects without ON CONFLICT: prefetch the existing keys.
+    first = rows[0]
+    raw_values = [row["raw_value"] for row in rows]
+    existing: dict[str, SourceSample] = {}
+    for start in range(0, len(raw_values), _PREFETCH_CHUNK):
+        existing.update(
+            (sample.raw_value, sample)
+            for sample in session.exec(
+                select(SourceSample).where(
+                    SourceSample.source_connection_id == first["source_connection_id"],
+                    SourceSample.source_table == first["source_table"],
+                    SourceSample.source_field == first["source_field"],
+                    SourceSample.raw_value.in_(raw_values[start : start + _PREFETCH_CHUNK]),
+                )
+            )
+        )
+
+    samples: list[SourceSample] = []
+    for row in rows:
+        sample = existing.get(row["raw_value"])
+        if sample is None:
+            sample = SourceSample(**row)
+        else:
+            if accumulate:
+                sample.occurrence_count += row["occurrence_count"]
+            else:
+                sample.occurrence_count = row["occurrence_count"]
+            sample.dimension = row["dimension"] or sample.dimension
+            sample.last_seen_at = row["last_seen_at"]
+        session.add(sample)
+        samples.append(sample)
+    session.flush()
+    return samples
+
+
+def get_capture_policy(request: Request) -> CapturePolicy:
+    """FastAPI dependency returning the application's sample capture policy."""
+
+    return request.app.state.capture_policy
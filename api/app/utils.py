@@ -0,0 +1,24 @@
+"""Small helpers shared across the API modules."""
+
+from __future__ import annotations
+
+from datetime import datetime, timezone
+
+
+def as_utc(value: datetime) -> datetime:
+    """Return ``value`` as an aware UTC datetime.
+
+    SQLite drops tzinfo on round trips; the timestamps this application stores
+    are always UTC, so naive values are tagged rather than converted.
+    """
+
+    return value if value.tzinfo else value.replace(tzinfo=timezone.utc)
+
+
+def normalise_raw_text(raw_text: str) -> str:
+    """Collapse whitespace and case so equivalent raw values share one key.
+
+    Keys both the LLM ranking cache and the raw value deduplication index.
+    """
+
+    return " ".join(raw_text.split()).casefold()
@@ -30,24 +30,30 @@ export interface MatchResponse {
 export interface SystemConfig {
   default_dimension: string;
   match_threshold: number;
-  matcher_backend: 'embedding' | 'llm';
+  matcher_backend: 'embedding' | 'fuzzy' | 'llm' | 'hybrid';
   embedding_model: string;
   llm_mode: 'online' | 'offline';
   llm_model?: string | null;
   llm_api_base?: string | null;
   top_k: number;
+  llm_batch_size?: number;
+  llm_shortlist_size?: number;
+  exact_match_attributes?: string[];
   llm_api_key_set: boolean;
 }
 
 export interface SystemConfigUpdate {
   default_dimension?: string;
   match_threshold?: number;
-  matcher_backend?: 'embedding' | 'llm';
+  matcher_backend?: 'embedding' | 'fuzzy' | 'llm' | 'hybrid';
   embedding_model?: string;
   llm_mode?: 'online' | 'offline';
   llm_model?: string | null;
   llm_api_base?: string | null;
   top_k?: number;
+  llm_batch_size?: number;
+  llm_shortlist_size?: number;
+  exact_match_attributes?: string[];
   llm_api_key?: string;
 }
 
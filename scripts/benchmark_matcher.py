@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark for semantic matcher candidate selection.
+
+Compares the legacy "materialise every candidate, sort, slice" strategy with the
+top-k selection used by ``SemanticMatcher`` and reports wall time and peak
+allocations (via ``tracemalloc``) for synthetic canonical libraries. With
+``--processes N`` it also times a bulk ``rank_many`` run in-process against the
+same run sharded across ``N`` scoring worker processes.
+
+Usage:
+    python scripts/benchmark_matcher.py [--sizes 10000 100000] [--queries 20]
+        [--processes 16 --bulk 20000]
+"""
+
+import argparse
+import os
+import random
+import string
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Callable, List, Tuple
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+# Importing the API package builds the FastAPI app; keep it off the network.
+os.environ.setdefault("REFDATA_DATABASE_URL", "sqlite:///:memory:")
+
+from api.app.matcher import SemanticMatcher  # noqa: E402
+from api.app.models import CanonicalValue, SystemConfig  # noqa: E402
+from api.app.schemas import MatchCandidate  # noqa: E402
+from api.app.services.scoring_pool import ProcessScoringPool  # noqa: E402
+
+
+def build_library(size: int, seed: int = 7) -> List[CanonicalValue]:
+    """Generate ``size`` canonical values with a shared random vocabulary."""
+
+    rng = random.Random(seed)
+    vocabulary = ["".join(rng.choices(string.ascii_lowercase, k=6)) for _ in range(5000)]
+    return [
+        CanonicalValue(
+            id=index + 1,
+            dimension="benchmark",
+            canonical_label=" ".join(rng.sample(vocabulary, 3)),
+        )
+        for index in range(size)
+    ]
+
+
+def legacy_embedding_rank(matcher: SemanticMatcher, raw_text: str) -> List[MatchCandidate]:
+    """Reproduce the pre-top-k strategy: one candidate per canonical value."""
+
+    scores = matcher._embedding_index().scores(raw_text)
+    candidates = [
+        MatchCandidate(
+            canonical_id=canonical.id or 0,
+            canonical_label=canonical.canonical_label,
+            dimension=canonical.dimension,
+            description=canonical.description,
+            score=round(float(max(0.0, min(1.0, score))), 4),
+        )
+        for canonical, score in zip(matcher.canonical_values, scores)
+    ]
+    candidates.sort(key=lambda item: item.score, reverse=True)
+    return candidates[: matcher.config.top_k]
+
+
+def measure(label: str, func: Callable[[str], object], queries: List[str]) -> Tuple[float, float]:
+    """Return (milliseconds per query, peak MiB) for ``func`` over ``queries``."""
+
+    func(queries[0])  # warm caches so the fitted index is not counted
+    tracemalloc.start()
+    start = time.perf_counter()
+    for query in queries:
+        func(query)
+    elapsed = (time.perf_counter() - start) * 1000 / len(queries)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    peak_mib = peak / (1024 * 1024)
+    print(f"  {label:<28} {elapsed:>10.2f} ms/query {peak_mib:>10.2f} MiB peak")
+    return elapsed, peak_mib
+
+
+def measure_bulk(matcher: SemanticMatcher, pooled: SemanticMatcher, queries: List[str]) -> None:
+    """Print bulk ``rank_many`` throughput in-process and through the scoring pool."""
+
+    pooled.rank_many(queries[:1])  # fit the index before starting workers
+    timings = []
+    runs = (("in-process rank_many", matcher), ("process pool rank_many", pooled))
+    for label, candidate in runs:
+        start = time.perf_counter()
+        candidate.rank_many(queries)
+        elapsed = time.perf_counter() - start
+        timings.append(elapsed)
+        print(f"  {label:<28} {len(queries) / elapsed:>10.0f} values/s")
+    print(f"  speed-up {timings[0] / timings[1]:.1f}x")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000])
+    parser.add_argument("--queries", type=int, default=20)
+    parser.add_argument("--top-k", type=int, default=5)
+    parser.add_argument("--processes", type=int, default=0)
+    parser.add_argument("--bulk", type=int, default=20_000)
+    args = parser.parse_args()
+
+    config = SystemConfig(matcher_backend="embedding", top_k=args.top_k)
+    for size in args.sizes:
+        library = build_library(size)
+        matcher = SemanticMatcher(config=config, canonical_values=library)
+        rng = random.Random(size)
+        queries = [
+            " ".join(rng.choice(library).canonical_label.split()[:2])
+            for _ in range(args.queries)
+        ]
+
+        print(f"\n{size:,} canonical values (top_k={args.top_k})")
+        _, legacy_peak = measure(
+            "full materialise + sort", lambda text: legacy_embedding_rank(matcher, text), queries
+        )
+        _, current_peak = measure("top-k selection", matcher.rank, queries)
+        if current_peak:
+            print(f"  peak allocation reduced {legacy_peak / current_peak:.1f}x")
+
+        if args.processes > 1:
+            pool = ProcessScoringPool(args.processes, min_values=1)
+            try:
+                pooled = SemanticMatcher(
+                    config=config, canonical_values=library, scoring_pool=pool
+                )
+                bulk = [rng.choice(queries) + f" {index}" for index in range(args.bulk)]
+                measure_bulk(matcher, pooled, bulk)
+            finally:
+                pool.shutdown()
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
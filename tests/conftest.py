@@ -6,6 +6,8 @@ import os
 import sys
 from pathlib import Path
 
+import pytest
+
 
 def _ensure_repo_on_path() -> None:
     """Insert the repository root into ``sys.path`` for package imports."""
@@ -20,3 +22,12 @@ def _ensure_repo_on_path() -> None:
 
 
 _ensure_repo_on_path()
+
+
+@pytest.fixture(autouse=True)
+def _reset_matcher_indexes() -> None:
+    """Start every test without matcher indexes cached by an earlier test."""
+
+    from api.app.matcher import invalidate_matcher_indexes
+
+    invalidate_matcher_indexes()
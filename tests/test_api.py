@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+from contextlib import contextmanager
 from typing import Iterator
 
 import json
@@ -14,9 +15,11 @@ from datetime import datetime, timezone
 from pathlib import Path
 
 import pandas as pd
+import pytest
 from openpyxl import Workbook
 
 from fastapi.testclient import TestClient
+from sqlalchemy import event, text
 from sqlmodel import Session, delete, select
 
 ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
@@ -26,25 +29,39 @@ if ROOT_DIR not in sys.path:
 os.environ.setdefault("REFDATA_DATABASE_URL", "sqlite:///:memory:")
 
 from api.app.main import create_app
+from api.app.matcher import SemanticMatcher
 from api.app.config import Settings
-from api.app.database import create_db_engine, init_db, get_session
-from api.app.models import SourceSample, SystemConfig
+from api.app.database import init_db
+from api.app.models import (
+    RawValue,
+    SourceMatchResult,
+    SourceSample,
+    SourceSchemaCache,
+    SystemConfig,
+)
 from api.app.services.source_connections import SourceConnectionServiceError
 
 
-def build_test_client() -> TestClient:
-    settings = Settings(database_url="sqlite:///:memory:", match_threshold=0.55)
-    app = create_app(settings)
-    engine = create_db_engine(settings)
-    app.state.engine = engine
-    init_db(engine, settings=settings)
+def build_test_client(**overrides) -> TestClient:
+    overrides.setdefault("database_url", "sqlite:///:memory:")
+    settings = Settings(match_threshold=0.55, **overrides)
+    return TestClient(create_app(settings))
 
-    def session_override() -> Iterator[Session]:
-        with Session(engine) as session:
-            yield session
 
-    app.dependency_overrides[get_session] = session_override
-    return TestClient(app)
+@contextmanager
+def capture_statements(engine) -> Iterator[list[str]]:
+    """Collect the SQL statements ``engine`` executes inside the block."""
+
+    statements: list[str] = []
+
+    def record(conn, cursor, statement, parameters, context, executemany) -> None:
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
 
 
 def create_sqlite_source() -> tuple[Path, tempfile.TemporaryDirectory]:
@@ -86,6 +103,247 @@ def test_match_proposal_returns_candidates() -> None:
     assert top_match["canonical_label"] in {"Married", "Single"}
 
 
+def test_match_proposal_serves_exact_codes_without_loading_library() -> None:
+    client = build_test_client()
+    engine = client.app.state.engine
+
+    for _ in range(2):
+        with capture_statements(engine) as statements:
+            response = client.post(
+                "/api/reference/propose",
+                json={"raw_text": "M", "dimension": "marital_status"},
+            )
+        assert response.status_code == 200
+        matches = response.json()["matches"]
+        assert [match["canonical_label"] for match in matches] == ["Married"]
+        assert matches[0]["score"] == 1.0
+
+    assert not any("FROM canonicalvalue" in statement for statement in statements)
+
+
+def test_warm_match_proposal_only_writes_the_raw_value() -> None:
+    client = build_test_client()
+    engine = client.app.state.engine
+    catalogue = client.app.state.dimension_catalogue
+
+    request = {"raw_text": "married", "dimension": "marital_status"}
+    client.post("/api/reference/propose", json=request)
+    with capture_statements(engine) as statements:
+        response = client.post("/api/reference/propose", json=request)
+
+    assert response.status_code == 200
+    assert response.json()["matches"]
+    assert len(statements) == 1 and statements[0].startswith("INSERT INTO rawvalue")
+    assert catalogue.misses == 1
+
+    client.post(
+        "/api/reference/dimensions",
+        json={"code": "region", "label": "Region", "extra_fields": []},
+    )
+    response = client.post(
+        "/api/reference/propose", json={"raw_text": "North", "dimension": "region"}
+    )
+    assert response.status_code == 200
+    assert response.json()["dimension"] != "region"
+    assert catalogue.misses == 2
+
+    client.post(
+        "/api/reference/canonical",
+        json={"dimension": "region", "canonical_label": "North"},
+    )
+    response = client.post(
+        "/api/reference/propose", json={"raw_text": "North", "dimension": "region"}
+    )
+    assert response.json()["dimension"] == "region"
+    assert response.json()["matches"][0]["canonical_label"] == "North"
+    assert catalogue.misses == 3
+
+
+def test_write_behind_defers_raw_values_until_flush_or_shutdown() -> None:
+    client = build_test_client(
+        raw_value_write_behind=True,
+        raw_value_flush_rows=1000,
+        raw_value_flush_interval_seconds=60,
+    )
+    engine = client.app.state.engine
+    buffer = client.app.state.raw_value_buffer
+
+    def stored() -> int:
+        with Session(engine) as session:
+            return len(session.exec(select(RawValue)).all())
+
+    with client:
+        single = client.post(
+            "/api/reference/propose",
+            json={"raw_text": "married", "dimension": "marital_status"},
+        )
+        batch = client.post(
+            "/api/reference/propose/batch",
+            json={"dimension": "marital_status", "items": [{"raw_text": "M"}] * 3},
+        )
+        assert single.status_code == 200 and single.json()["matches"]
+        assert batch.status_code == 200
+        assert stored() == 0
+        assert buffer.pending() == 4
+
+        assert buffer.flush() == 4
+        assert stored() == 4
+
+        client.post("/api/reference/propose", json={"raw_text": "single"})
+        assert stored() == 4
+
+    # Leaving the client runs the lifespan shutdown, which drains the queue.
+    assert buffer.pending() == 0
+    assert stored() == 5
+
+
+def test_dedup_mode_counts_repeated_raw_values_in_one_row() -> None:
+    client = build_test_client(raw_value_dedup=True)
+    engine = client.app.state.engine
+
+    for raw_text in ("married", "  Married ", "single"):
+        client.post(
+            "/api/reference/propose",
+            json={"raw_text": raw_text, "dimension": "marital_status"},
+        )
+    with Session(engine) as session:
+        married = session.exec(
+            select(RawValue).where(RawValue.normalised_text == "married")
+        ).one()
+        married.status = "approved"
+        session.add(married)
+        session.commit()
+
+    response = client.post(
+        "/api/reference/propose/batch",
+        json={
+            "dimension": "marital_status",
+            "items": [{"raw_text": "MARRIED"}, {"raw_text": "Single"}, {"raw_text": "single"}],
+        },
+    )
+    assert response.status_code == 200
+
+    with Session(engine) as session:
+        rows = {row.normalised_text: row for row in session.exec(select(RawValue)).all()}
+    assert set(rows) == {"married", "single"}
+    assert rows["married"].occurrence_count == 3
+    assert rows["married"].status == "approved"
+    assert rows["single"].occurrence_count == 3
+    assert rows["single"].last_seen_at >= rows["single"].created_at
+
+
+def test_batch_proposal_matches_single_proposals_with_one_insert() -> None:
+    client = build_test_client()
+    engine = client.app.state.engine
+    items = [
+        {"raw_text": "Maried"},
+        {"raw_text": "M"},
+        {"raw_text": "single", "dimension": "marital_status"},
+        {"raw_text": "  "},
+    ] * 10
+    expected = [
+        client.post(
+            "/api/reference/propose",
+            json={"dimension": "marital_status", **item},
+        ).json()
+        for item in items
+    ]
+
+    with capture_statements(engine) as statements:
+        response = client.post(
+            "/api/reference/propose/batch",
+            json={"dimension": "marital_status", "items": items},
+        )
+
+    assert response.status_code == 200
+    assert response.json()["results"] == expected
+    assert sum("INSERT INTO rawvalue" in statement for statement in statements) == 1
+    with Session(engine) as session:
+        assert len(session.exec(select(RawValue)).all()) == 2 * len(items)
+
+    missing = client.post(
+        "/api/reference/propose/batch",
+        json={"items": [{"raw_text": "x", "dimension": "nope"}]},
+    )
+    assert missing.status_code == 404
+    assert "'nope'" in missing.json()["detail"]
+
+
+def test_streaming_proposal_emits_ndjson_lines_per_chunk() -> None:
+    client = build_test_client()
+    items = [
+        {"raw_text": "Maried"},
+        {"raw_text": "M", "dimension": "marital_status"},
+        {"raw_text": "x", "dimension": "nope"},
+        {"raw_text": "single"},
+    ]
+    expected = [
+        client.post("/api/reference/propose", json={"dimension": "marital_status", **item}).json()
+        for item in (items[0], items[1], items[3])
+    ]
+
+    def body() -> Iterator[bytes]:
+        for item in items[:2]:
+            yield (json.dumps(item) + "\n").encode()
+        yield b"\n{not json}\n"
+        # Split a line across body chunks and omit the final newline.
+        line = json.dumps(items[2]) + "\n" + json.dumps(items[3])
+        yield line[:5].encode()
+        yield line[5:].encode()
+
+    response = client.post(
+        "/api/reference/propose/stream",
+        params={"dimension": "marital_status", "chunk_size": 2},
+        content=body(),
+        headers={"Content-Type": "application/x-ndjson"},
+    )
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert len(lines) == 5
+    assert [lines[0], lines[1], lines[4]] == expected
+    assert lines[2]["line"] == 4
+    assert lines[3] == {"line": 5, "error": "Dimension 'nope' not found."}
+
+    with Session(client.app.state.engine) as session:
+        assert len(session.exec(select(RawValue)).all()) == 6
+
+
+def test_matcher_registry_reuses_matchers_until_library_changes() -> None:
+    client = build_test_client()
+    registry = client.app.state.matcher_registry
+
+    for raw_text in ("Maried", "Singel"):
+        response = client.post(
+            "/api/reference/propose",
+            json={"raw_text": raw_text, "dimension": "marital_status"},
+        )
+        assert response.status_code == 200
+    assert (registry.misses, registry.hits) == (1, 1)
+
+    version = registry.version("marital_status")
+    created = client.post(
+        "/api/reference/canonical",
+        json={"dimension": "marital_status", "canonical_label": "Divorced"},
+    )
+    assert created.status_code == 201
+    assert registry.version("marital_status") > version
+
+    response = client.post(
+        "/api/reference/propose",
+        json={"raw_text": "Divorced person", "dimension": "marital_status"},
+    )
+    assert response.json()["matches"][0]["canonical_label"] == "Divorced"
+    assert registry.misses == 2
+
+    assert client.put("/api/config", json={"top_k": 3}).status_code == 200
+    client.post(
+        "/api/reference/propose",
+        json={"raw_text": "Divorced person", "dimension": "marital_status"},
+    )
+    assert registry.misses == 3
+
+
 def test_match_proposal_falls_back_when_default_dimension_empty() -> None:
     client = build_test_client()
 
@@ -857,7 +1115,10 @@ def test_source_sample_endpoint_returns_distinct_values() -> None:
     engine = client.app.state.engine
     assert engine is not None
 
+    # Duplicate rows can only exist on installs that predate the natural key index;
+    # init_db folds them when it adds the index.
     with Session(engine) as session:
+        session.exec(text("DROP INDEX uq_sourcesample_natural_key"))
         session.add_all(
             [
                 SourceSample(
@@ -890,6 +1151,7 @@ def test_source_sample_endpoint_returns_distinct_values() -> None:
             ]
         )
         session.commit()
+    init_db(engine)
 
     response = client.get(
         f"/api/source/connections/{connection_id}/samples",
@@ -910,6 +1172,46 @@ def test_source_sample_endpoint_returns_distinct_values() -> None:
     assert bob["dimension"] is None
 
 
+def test_sample_ingest_upserts_the_batch_in_one_statement() -> None:
+    client = build_test_client()
+    engine = client.app.state.engine
+    connection_id = client.post(
+        "/api/source/connections",
+        json={
+            "name": "ingest-upsert",
+            "db_type": "postgres",
+            "host": "localhost",
+            "port": 5432,
+            "database": "analytics",
+            "username": "svc",
+        },
+    ).json()["id"]
+    url = f"/api/source/connections/{connection_id}/samples"
+    batch = {
+        "source_table": "customers",
+        "source_field": "status",
+        "values": [
+            {"raw_value": f"value-{index}", "occurrence_count": 1} for index in range(200)
+        ]
+        + [{"raw_value": "value-0", "occurrence_count": 2, "dimension": "status"}],
+    }
+    assert client.post(url, json=batch).status_code == 201
+    with capture_statements(engine) as statements:
+        response = client.post(url, json=batch)
+
+    assert response.status_code == 201
+    sample_statements = [statement for statement in statements if "sourcesample" in statement]
+    assert len(sample_statements) == 1
+    assert sample_statements[0].startswith("INSERT INTO sourcesample")
+    payload = response.json()
+    assert len(payload) == 200
+    assert payload[0]["raw_value"] == "value-0"
+    assert (payload[0]["occurrence_count"], payload[0]["dimension"]) == (6, "status")
+    assert {item["occurrence_count"] for item in payload[1:]} == {2}
+    with Session(engine) as session:
+        assert len(session.exec(select(SourceSample)).all()) == 200
+
+
 def test_capture_mapping_samples_ingests_source_values() -> None:
     client = build_test_client()
     db_path, temp_dir = create_sqlite_source()
@@ -969,6 +1271,129 @@ def test_capture_mapping_samples_ingests_source_values() -> None:
         assert stats[0]["total_values"] == 3
     finally:
         temp_dir.cleanup()
+
+
+def test_capture_connection_samples_reflects_each_table_once() -> None:
+    client = build_test_client()
+    db_path, temp_dir = create_sqlite_source()
+    try:
+        connection = sqlite3.connect(db_path)
+        try:
+            connection.executemany(
+                "INSERT INTO customers (name, email) VALUES (?, ?)",
+                [("Alice", "alice@example.com"), ("Bob", "bob@example.com"), ("Bob", None)],
+            )
+            connection.commit()
+        finally:
+            connection.close()
+
+        connection_id = client.post(
+            "/api/source/connections",
+            json={
+                "name": "sqlite-capture-all",
+                "db_type": "sqlite",
+                "host": "localhost",
+                "port": 5432,
+                "database": str(db_path),
+                "username": "ignored",
+            },
+        ).json()["id"]
+        for table, field in [
+            ("customers", "name"),
+            ("customers", "email"),
+            ("customers", "phone"),
+            ("customer_view", "name"),
+        ]:
+            created = client.post(
+                f"/api/source/connections/{connection_id}/mappings",
+                json={"source_table": table, "source_field": field, "ref_dimension": "customer"},
+            )
+            assert created.status_code == 201
+
+        response = client.post(f"/api/source/connections/{connection_id}/capture")
+        assert response.status_code == 200
+        results = {(item["source_table"], item["source_field"]): item for item in response.json()}
+        assert results[("customers", "name")]["captured_values"] == 2
+        assert results[("customers", "email")]["captured_values"] == 2
+        assert results[("customer_view", "name")]["captured_values"] == 2
+        assert results[("customers", "phone")]["captured_values"] == 0
+        assert "not found" in results[("customers", "phone")]["error"]
+
+        samples = client.get(
+            f"/api/source/connections/{connection_id}/samples",
+            params={"source_table": "customers", "source_field": "name"},
+        ).json()
+        assert {(item["raw_value"], item["occurrence_count"]) for item in samples} == {
+            ("Alice", 1),
+            ("Bob", 2),
+        }
+
+        # One engine acquisition, and so one reflection, per source table.
+        engines = client.app.state.source_engines
+        assert (engines.hits, engines.misses) == (1, 1)
+    finally:
+        temp_dir.cleanup()
+
+
+def test_capture_limits_are_configurable_per_mapping() -> None:
+    client = build_test_client(source_capture_default_limit=5, source_capture_chunk_size=100)
+    db_path, temp_dir = create_sqlite_source()
+    try:
+        connection = sqlite3.connect(db_path)
+        try:
+            connection.executemany(
+                "INSERT INTO customers (name, email) VALUES (?, ?)",
+                [(f"city-{index}", f"user-{index % 7}@example.com") for index in range(1050)],
+            )
+            connection.commit()
+        finally:
+            connection.close()
+
+        connection_id = client.post(
+            "/api/source/connections",
+            json={
+                "name": "sqlite-high-cardinality",
+                "db_type": "sqlite",
+                "host": "localhost",
+                "port": 5432,
+                "database": str(db_path),
+                "username": "ignored",
+            },
+        ).json()["id"]
+        mappings_url = f"/api/source/connections/{connection_id}/mappings"
+        unbounded = client.post(
+            mappings_url,
+            json={
+                "source_table": "customers",
+                "source_field": "name",
+                "ref_dimension": "city",
+                "capture_limit": 0,
+            },
+        ).json()
+        assert unbounded["capture_limit"] == 0
+        client.post(
+            mappings_url,
+            json={"source_table": "customers", "source_field": "email", "ref_dimension": "email"},
+        )
+
+        captured = client.post(
+            f"{mappings_url}/{unbounded['id']}/capture", params={"summary": True}
+        )
+        assert captured.status_code == 201
+        assert captured.json()["captured_values"] == 1050
+
+        results = client.post(f"/api/source/connections/{connection_id}/capture").json()
+        counts = {item["source_field"]: item["captured_values"] for item in results}
+        assert counts == {"name": 1050, "email": 5}
+
+        limited = client.put(f"{mappings_url}/{unbounded['id']}", json={"capture_limit": 3})
+        assert limited.json()["capture_limit"] == 3
+        top = client.post(f"{mappings_url}/{unbounded['id']}/capture").json()
+        assert len(top) == 3
+    finally:
+        temp_dir.cleanup()
+
+
 def test_source_connection_test_endpoint_success() -> None:
     client = build_test_client()
     db_path, temp_dir = create_sqlite_source()
@@ -1060,10 +1485,145 @@ def test_source_connection_metadata_and_existing_test() -> None:
         )
         assert override_failure.status_code == 400
 
+        # Every explorer call above shared one pooled engine for the connection.
+        engines = client.app.state.source_engines
+        assert len(engines) == 1
+        assert (engines.hits, engines.misses) == (3, 1)
+        renamed = client.put(
+            f"/api/source/connections/{connection_id}", json={"name": "warehouse"}
+        )
+        assert renamed.status_code == 200
+        assert len(engines) == 0
+
     finally:
         temp_dir.cleanup()
 
 
+def test_source_schema_listings_are_cached_until_refreshed() -> None:
+    client = build_test_client()
+    db_path, temp_dir = create_sqlite_source()
+    try:
+        connection_id = client.post(
+            "/api/source/connections",
+            json={
+                "name": "cached-sqlite",
+                "db_type": "sqlite",
+                "host": "localhost",
+                "port": 5432,
+                "database": str(db_path),
+                "username": "ignored",
+            },
+        ).json()["id"]
+        tables_url = f"/api/source/connections/{connection_id}/tables"
+        fields_url = f"{tables_url}/customers/fields"
+
+        assert {table["name"] for table in client.get(tables_url).json()} == {
+            "customers",
+            "customer_view",
+        }
+        assert len(client.get(fields_url).json()) == 3
+
+        source = sqlite3.connect(db_path)
+        try:
+            source.execute("CREATE TABLE orders (id INTEGER PRIMARY KEY)")
+            source.execute("ALTER TABLE customers ADD COLUMN phone TEXT")
+            source.commit()
+        finally:
+            source.close()
+
+        # Listings come from the persisted cache until a refresh is requested.
+        assert "orders" not in {table["name"] for table in client.get(tables_url).json()}
+        assert len(client.get(fields_url).json()) == 3
+        refreshed = client.get(tables_url, params={"refresh": True}).json()
+        assert "orders" in {table["name"] for table in refreshed}
+        assert len(client.get(fields_url, params={"refresh": True}).json()) == 4
+
+        with Session(client.app.state.engine) as session:
+            keys = session.exec(
+                select(SourceSchemaCache.object_key).where(
+                    SourceSchemaCache.source_connection_id == connection_id
+                )
+            ).all()
+        assert sorted(keys) == ["fields:.customers", "tables"]
+
+        renamed = client.put(f"/api/source/connections/{connection_id}", json={"name": "other"})
+        assert renamed.status_code == 200
+        with Session(client.app.state.engine) as session:
+            assert session.exec(select(SourceSchemaCache)).all() == []
+    finally:
+        temp_dir.cleanup()
+
+
+def test_concurrent_cold_schema_loads_keep_one_cache_entry() -> None:
+    client = build_test_client()
+    connection_id = client.post(
+        "/api/source/connections",
+        json={
+            "name": "warehouse-race",
+            "db_type": "postgres",
+            "host": "warehouse",
+            "port": 5432,
+            "database": "demo",
+            "username": "user",
+        },
+    ).json()["id"]
+    cache = client.app.state.schema_cache
+    engine = client.app.state.engine
+
+    def racing_loader() -> list[dict[str, str]]:
+        # Another request misses the cache too and stores its listing first.
+        with Session(engine) as other:
+            cache.store(other, connection_id, "fp", {"tables": [{"name": "other"}]})
+        return [{"name": "ours"}]
+
+    with Session(engine) as session:
+        payload = cache.load(session, connection_id, "fp", "tables", racing_loader)
+        entries = session.exec(select(SourceSchemaCache)).all()
+
+    assert payload == [{"name": "ours"}]
+    assert [entry.payload for entry in entries] == [[{"name": "ours"}]]
+
+
+def test_bulk_catalogue_fills_field_cache_for_every_table(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    client = build_test_client()
+    calls: list[str | None] = []
+
+    def fake_schema_fields(settings, schema, engines=None):  # type: ignore[no-untyped-def]
+        calls.append(schema)
+        return {
+            "customers": [{"name": "email", "data_type": "text", "nullable": True}],
+            "orders": [{"name": "total", "data_type": "numeric", "nullable": False}],
+        }
+
+    monkeypatch.setattr(
+        "api.app.routes.source.supports_bulk_catalogue", lambda settings: True
+    )
+    monkeypatch.setattr(
+        "api.app.routes.source.service_list_schema_fields", fake_schema_fields
+    )
+    connection_id = client.post(
+        "/api/source/connections",
+        json={
+            "name": "warehouse-bulk",
+            "db_type": "postgres",
+            "host": "warehouse",
+            "port": 5432,
+            "database": "demo",
+            "username": "user",
+        },
+    ).json()["id"]
+    base = f"/api/source/connections/{connection_id}/tables"
+
+    customers = client.get(f"{base}/customers/fields?schema=sales")
+    orders = client.get(f"{base}/orders/fields?schema=sales")
+    assert customers.status_code == orders.status_code == 200
+    assert [field["name"] for field in customers.json()] == ["email"]
+    assert [field["name"] for field in orders.json()] == ["total"]
+    assert calls == ["sales"]
+
+
 def test_source_tables_surface_connection_errors(monkeypatch: pytest.MonkeyPatch) -> None:
     client = build_test_client()
     db_path, temp_dir = create_sqlite_source()
@@ -1098,15 +1658,7 @@ def test_config_endpoint_auto_seeds_when_missing(tmp_path) -> None:
     db_path = tmp_path / "config.db"
     settings = Settings(database_url=f"sqlite:///{db_path}")
     app = create_app(settings)
-    engine = create_db_engine(settings)
-    app.state.engine = engine
-    init_db(engine, settings=settings)
-
-    def session_override() -> Iterator[Session]:
-        with Session(engine) as session:
-            yield session
-
-    app.dependency_overrides[get_session] = session_override
+    engine = app.state.engine
 
     with TestClient(app) as client:
         with Session(engine) as session:
@@ -1135,6 +1687,137 @@ def test_seeded_source_connection_available() -> None:
     assert any(connection["name"] == "Target Demo Warehouse" for connection in payload)
 
 
+def test_match_stats_reuse_persisted_results_until_inputs_change(monkeypatch) -> None:
+    client = build_test_client()
+    connection_id = client.post(
+        "/api/source/connections",
+        json={
+            "name": "crm",
+            "db_type": "postgres",
+            "host": "localhost",
+            "port": 5432,
+            "database": "crm",
+            "username": "svc",
+        },
+    ).json()["id"]
+    client.post(
+        f"/api/source/connections/{connection_id}/mappings",
+        json={
+            "source_table": "customers",
+            "source_field": "marital",
+            "ref_dimension": "marital_status",
+        },
+    )
+
+    def ingest(*raw_values: str) -> None:
+        response = client.post(
+            f"/api/source/connections/{connection_id}/samples",
+            json={
+                "source_table": "customers",
+                "source_field": "marital",
+                "values": [{"raw_value": value} for value in raw_values],
+            },
+        )
+        assert response.status_code == 201
+
+    scored: list[list[str]] = []
+    original_rank_many = SemanticMatcher.rank_many
+
+    def recording_rank_many(self, raw_values):
+        scored.append(list(raw_values))
+        return original_rank_many(self, raw_values)
+
+    monkeypatch.setattr(SemanticMatcher, "rank_many", recording_rank_many)
+
+    ingest("Singel", "Maried")
+    first = client.get(f"/api/source/connections/{connection_id}/match-stats").json()
+    assert sorted(scored.pop()) == ["Maried", "Singel"]
+
+    second = client.get(f"/api/source/connections/{connection_id}/match-stats").json()
+    assert scored == []
+    assert second == first
+
+    ingest("Singel")
+    client.get(f"/api/source/connections/{connection_id}/unmatched")
+    assert scored.pop() == ["Singel"]
+
+    client.post(
+        "/api/reference/canonical",
+        json={"dimension": "marital_status", "canonical_label": "Divorced"},
+    )
+    client.get(f"/api/source/connections/{connection_id}/match-stats")
+    assert sorted(scored.pop()) == ["Maried", "Singel"]
+
+    # The threshold is applied on read and the key never changes a score.
+    updated = client.put("/api/config", json={"match_threshold": 0.9, "llm_api_key": "sk-test"})
+    assert updated.status_code == 200
+    client.get(f"/api/source/connections/{connection_id}/match-stats")
+    assert scored == []
+
+    assert client.put("/api/config", json={"top_k": 3}).status_code == 200
+    client.get(f"/api/source/connections/{connection_id}/match-stats")
+    assert sorted(scored.pop()) == ["Maried", "Singel"]
+
+
+def test_match_stats_keep_results_per_dimension_of_a_field(monkeypatch) -> None:
+    client = build_test_client()
+    connection_id = client.post(
+        "/api/source/connections",
+        json={
+            "name": "crm",
+            "db_type": "postgres",
+            "host": "localhost",
+            "port": 5432,
+            "database": "crm",
+            "username": "svc",
+        },
+    ).json()["id"]
+    for dimension in ("marital_status", "education"):
+        client.post(
+            f"/api/source/connections/{connection_id}/mappings",
+            json={
+                "source_table": "customers",
+                "source_field": "profile",
+                "ref_dimension": dimension,
+            },
+        )
+    response = client.post(
+        f"/api/source/connections/{connection_id}/samples",
+        json={
+            "source_table": "customers",
+            "source_field": "profile",
+            "values": [{"raw_value": "Singel"}, {"raw_value": "Bachelour"}],
+        },
+    )
+    assert response.status_code == 201
+
+    scored: list[list[str]] = []
+    original_rank_many = SemanticMatcher.rank_many
+
+    def recording_rank_many(self, raw_values):
+        scored.append(sorted(raw_values))
+        return original_rank_many(self, raw_values)
+
+    monkeypatch.setattr(SemanticMatcher, "rank_many", recording_rank_many)
+
+    first = client.get(f"/api/source/connections/{connection_id}/match-stats").json()
+    assert scored == [["Bachelour", "Singel"], ["Bachelour", "Singel"]]
+
+    scored.clear()
+    second = client.get(f"/api/source/connections/{connection_id}/match-stats").json()
+    assert scored == []
+    assert second == first
+
+    with Session(client.app.state.engine) as session:
+        results = session.exec(select(SourceMatchResult)).all()
+    assert sorted((row.dimension, row.raw_value) for row in results) == [
+        ("education", "Bachelour"),
+        ("education", "Singel"),
+        ("marital_status", "Bachelour"),
+        ("marital_status", "Singel"),
+    ]
+
+
 def test_match_stats_without_samples_returns_empty_totals() -> None:
     client = build_test_client()
 
@@ -2,6 +2,8 @@
 
 from __future__ import annotations
 
+import json
+
 from sqlalchemy import inspect, text
 from sqlmodel import Session, create_engine, select
 
@@ -107,8 +109,17 @@ def test_init_db_adds_missing_llm_mode_column(tmp_path) -> None:
     inspector = inspect(engine)
     columns = {column["name"] for column in inspector.get_columns("systemconfig")}
     assert "llm_mode" in columns
+    assert "llm_batch_size" in columns
 
     with engine.begin() as connection:
         value = connection.execute(text("SELECT llm_mode FROM systemconfig")).scalar_one()
+        batch_size = connection.execute(
+            text("SELECT llm_batch_size FROM systemconfig")
+        ).scalar_one()
+        exact_attributes = connection.execute(
+            text("SELECT exact_match_attributes FROM systemconfig")
+        ).scalar_one()
 
     assert value == "online"
+    assert batch_size == 20
+    assert json.loads(exact_attributes) == ["code"]
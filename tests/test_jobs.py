@@ -0,0 +1,423 @@
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlmodel import Session, select
+
+from api.app.models import Job, RawValue, SourceMatchResult, SourceSample
+from api.app.services import raw_values
+from api.app.services.jobs import JobContext, JobRunner
+from tests.test_api import build_test_client, capture_statements
+
+
+def build_client(tmp_path: Path, **overrides) -> TestClient:
+    # A file database gives the job threads their own connections; the shared
+    # in-memory connection would let a request's rollback undo a job's writes.
+    return build_test_client(database_url=f"sqlite:///{tmp_path / 'jobs.db'}", **overrides)
+
+
+def wait_for(client: TestClient, job_id: int, timeout: float = 10.0) -> dict:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        job = client.get(f"/api/jobs/{job_id}").json()
+        if job["status"] in {"succeeded", "failed", "cancelled"}:
+            return job
+        time.sleep(0.02)
+    raise AssertionError(f"job {job_id} did not finish: {job}")
+
+
+def test_match_stats_job_returns_same_result_as_inline_request(tmp_path: Path) -> None:
+    client = build_client(tmp_path)
+    connection_id = client.post(
+        "/api/source/connections",
+        json={
+            "name": "crm",
+            "db_type": "postgres",
+            "host": "localhost",
+            "port": 5432,
+            "database": "crm",
+            "username": "svc",
+        },
+    ).json()["id"]
+    client.post(
+        f"/api/source/connections/{connection_id}/mappings",
+        json={
+            "source_table": "customers",
+            "source_field": "marital",
+            "ref_dimension": "marital_status",
+        },
+    )
+    client.post(
+        f"/api/source/connections/{connection_id}/samples",
+        json={
+            "source_table": "customers",
+            "source_field": "marital",
+            "values": [{"raw_value": "Single"}, {"raw_value": "Maried"}],
+        },
+    )
+
+    submitted = client.post(
+        "/api/jobs",
+        json={"kind": "source.match_stats", "params": {"connection_id": connection_id}},
+    )
+    assert submitted.status_code == 202
+    assert submitted.headers["location"] == f"/api/jobs/{submitted.json()['id']}"
+
+    job = wait_for(client, submitted.json()["id"])
+    assert job["status"] == "succeeded"
+    assert job["progress"] == 1.0
+
+    result = client.get(f"/api/jobs/{job['id']}/result")
+    assert result.status_code == 200
+    inline = client.get(f"/api/source/connections/{connection_id}/match-stats").json()
+    assert result.json() == inline
+
+
+def test_canonical_import_runs_as_background_job(tmp_path: Path) -> None:
+    client = build_client(tmp_path)
+    client.post(
+        "/api/reference/dimensions",
+        json={"code": "bulk", "label": "Bulk Dimension", "extra_fields": []},
+    )
+
+    response = client.post(
+        "/api/reference/canonical/import",
+        params={"background": True},
+        data={"dimension": "bulk"},
+        files={"file": ("values.csv", b"label,code\nValue A,A1\nValue B,B2\n", "text/csv")},
+    )
+    assert response.status_code == 202
+    job = wait_for(client, response.json()["id"])
+    assert job["status"] == "succeeded", job["error"]
+
+    payload = client.get(f"/api/jobs/{job['id']}/result").json()
+    assert sorted(item["canonical_label"] for item in payload["created"]) == [
+        "Value A",
+        "Value B",
+    ]
+    proposal = client.post(
+        "/api/reference/propose", json={"raw_text": "Value B", "dimension": "bulk"}
+    ).json()
+    assert proposal["matches"][0]["canonical_label"] == "Value B"
+
+
+def test_job_failures_and_unknown_kinds_are_reported(tmp_path: Path) -> None:
+    client = build_client(tmp_path)
+    assert client.post("/api/jobs", json={"kind": "nope"}).status_code == 400
+    # Upload-backed kinds need their own route to supply the file.
+    assert (
+        client.post("/api/jobs", json={"kind": "reference.import_canonical"}).status_code == 400
+    )
+    assert client.get("/api/jobs/999").status_code == 404
+
+    submitted = client.post(
+        "/api/jobs", json={"kind": "source.match_stats", "params": {"connection_id": 999}}
+    ).json()
+    job = wait_for(client, submitted["id"])
+    assert job["status"] == "failed"
+    assert job["error"] == "Connection not found"
+
+    result = client.get(f"/api/jobs/{job['id']}/result")
+    assert result.status_code == 409
+
+
+def test_cancel_queued_and_running_jobs(tmp_path: Path) -> None:
+    client = build_client(tmp_path, job_workers=1)
+    runner = client.app.state.job_runner
+    started = threading.Event()
+    release = threading.Event()
+
+    def blocking(context: JobContext) -> str:
+        started.set()
+        release.wait(5)
+        for step in range(1000):
+            context.report(step, 1000, message=f"step {step}")
+            time.sleep(0.005)
+        return "done"
+
+    runner.register("test.blocking", blocking)
+
+    running = client.post("/api/jobs", json={"kind": "test.blocking"}).json()
+    queued = client.post("/api/jobs", json={"kind": "test.blocking"}).json()
+    assert started.wait(5)
+    assert client.get(f"/api/jobs/{queued['id']}").json()["status"] == "queued"
+
+    cancelled = client.post(f"/api/jobs/{queued['id']}/cancel")
+    assert cancelled.status_code == 200
+    assert cancelled.json()["status"] == "cancelled"
+
+    requested = client.post(f"/api/jobs/{running['id']}/cancel").json()
+    assert requested["status"] == "running"
+    assert requested["cancel_requested"] is True
+    release.set()
+
+    job = wait_for(client, running["id"])
+    assert job["status"] == "cancelled"
+    assert job["message"] == "step 0"
+    assert client.post("/api/jobs/999/cancel").status_code == 404
+
+    listed = client.get("/api/jobs", params={"kind": "test.blocking"}).json()
+    assert [item["status"] for item in listed] == ["cancelled", "cancelled"]
+
+
+def test_recover_fails_only_jobs_whose_runner_stopped(tmp_path: Path) -> None:
+    client = build_client(tmp_path)
+    runner = client.app.state.job_runner
+    now = datetime.now(timezone.utc)
+    with Session(client.app.state.engine) as session:
+        jobs = [
+            Job(kind="test.other", status="running", owner="other", heartbeat_at=now),
+            Job(
+                kind="test.other",
+                status="running",
+                owner="other",
+                heartbeat_at=now - timedelta(hours=1),
+            ),
+            Job(kind="test.other", status="queued"),
+        ]
+        session.add_all(jobs)
+        session.commit()
+        alive, stale, legacy = (job.id for job in jobs)
+
+    assert runner.recover() == 2
+    statuses = {
+        job["id"]: job["status"]
+        for job in client.get("/api/jobs", params={"kind": "test.other"}).json()
+    }
+    assert statuses == {alive: "running", stale: "failed", legacy: "failed"}
+
+
+def test_cancel_reaches_a_job_owned_by_another_runner(tmp_path: Path) -> None:
+    client = build_client(tmp_path)
+    runner = client.app.state.job_runner
+    other = JobRunner(client.app.state.engine, client.app.state, heartbeat_seconds=60)
+    started = threading.Event()
+
+    def looping(context: JobContext) -> str:
+        started.set()
+        for step in range(2000):
+            context.report(step, 2000)
+            time.sleep(0.005)
+        return "done"
+
+    runner.register("test.looping", looping)
+    try:
+        job_id = client.post("/api/jobs", json={"kind": "test.looping"}).json()["id"]
+        assert started.wait(5)
+
+        requested = other.cancel(job_id)
+        assert requested is not None
+        assert (requested.status, requested.cancel_requested) == ("running", True)
+
+        runner.beat()
+        assert wait_for(client, job_id)["status"] == "cancelled"
+    finally:
+        other.shutdown()
+
+
+def test_compaction_job_folds_duplicate_raw_values(tmp_path: Path) -> None:
+    client = build_client(tmp_path)
+    for raw_text in ("married", "Married", "single", " married"):
+        client.post(
+            "/api/reference/propose",
+            json={"raw_text": raw_text, "dimension": "marital_status"},
+        )
+    engine = client.app.state.engine
+    with Session(engine) as session:
+        assert len(session.exec(select(RawValue)).all()) == 4
+
+    submitted = client.post("/api/jobs", json={"kind": "reference.compact_raw_values"})
+    job = wait_for(client, submitted.json()["id"])
+    assert job["status"] == "succeeded", job["error"]
+    assert client.get(f"/api/jobs/{job['id']}/result").json() == {
+        "keyed": 2,
+        "removed": 2,
+        "conflicts": 0,
+    }
+
+    with Session(engine) as session:
+        rows = {row.normalised_text: row for row in session.exec(select(RawValue)).all()}
+    assert {key: row.occurrence_count for key, row in rows.items()} == {
+        "married": 3,
+        "single": 1,
+    }
+    assert rows["married"].raw_text == "married"
+
+    # Once folded, a second pass has nothing to do.
+    again = wait_for(
+        client, client.post("/api/jobs", json={"kind": "reference.compact_raw_values"}).json()["id"]
+    )
+    assert client.get(f"/api/jobs/{again['id']}/result").json() == {
+        "keyed": 0,
+        "removed": 0,
+        "conflicts": 0,
+    }
+
+
+def test_compaction_keeps_review_decisions_and_skips_conflicts(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    # Two rows per page, so most groups span pages.
+    monkeypatch.setattr(raw_values, "_COMPACT_PAGE", 2)
+    client = build_client(tmp_path)
+    engine = client.app.state.engine
+    with Session(engine) as session:
+        session.add_all(
+            [
+                RawValue(dimension="marital_status", raw_text="Single", status="pending"),
+                RawValue(dimension="marital_status", raw_text="single", status="approved"),
+                RawValue(dimension="marital_status", raw_text="SINGLE", status="pending"),
+                RawValue(dimension="marital_status", raw_text="Wed", status="approved"),
+                RawValue(dimension="marital_status", raw_text="wed", status="rejected"),
+            ]
+        )
+        session.commit()
+
+    submitted = client.post("/api/jobs", json={"kind": "reference.compact_raw_values"})
+    job = wait_for(client, submitted.json()["id"])
+    assert job["status"] == "succeeded", job["error"]
+    assert client.get(f"/api/jobs/{job['id']}/result").json() == {
+        "keyed": 2,
+        "removed": 2,
+        "conflicts": 1,
+    }
+
+    with Session(engine) as session:
+        rows = session.exec(select(RawValue).order_by(RawValue.id)).all()
+    assert [(row.raw_text, row.normalised_text, row.status) for row in rows] == [
+        ("Single", "single", "approved"),
+        ("Wed", "wed", "approved"),
+        ("wed", None, "rejected"),
+    ]
+    assert rows[0].occurrence_count == 3
+
+
+def test_prune_history_job_applies_retention_in_batches(tmp_path: Path) -> None:
+    client = build_client(
+        tmp_path,
+        retention_raw_value_days=30,
+        retention_sample_max_per_field=2,
+        retention_prune_unmapped_samples=True,
+        retention_batch_size=1,
+    )
+    engine = client.app.state.engine
+    connection_id = client.post(
+        "/api/source/connections",
+        json={
+            "name": "crm",
+            "db_type": "postgres",
+            "host": "localhost",
+            "port": 5432,
+            "database": "crm",
+            "username": "svc",
+        },
+    ).json()["id"]
+    client.post(
+        f"/api/source/connections/{connection_id}/mappings",
+        json={
+            "source_table": "customers",
+            "source_field": "marital",
+            "ref_dimension": "marital_status",
+        },
+    )
+
+    now = datetime.now(timezone.utc)
+    old = now - timedelta(days=60)
+    with Session(engine) as session:
+        session.add(RawValue(dimension="marital_status", raw_text="old", created_at=old))
+        session.add(
+            RawValue(
+                dimension="marital_status", raw_text="kept", status="approved", created_at=old
+            )
+        )
+        session.add(RawValue(dimension="marital_status", raw_text="new", created_at=now))
+        for age, raw_value in enumerate(["Single", "Married", "Maried", "Divorced"]):
+            session.add(
+                SourceSample(
+                    source_connection_id=connection_id,
+                    source_table="customers",
+                    source_field="marital",
+                    raw_value=raw_value,
+                    last_seen_at=now - timedelta(hours=age),
+                )
+            )
+        for field, owner in (("gender", connection_id), ("marital", 999)):
+            session.add(
+                SourceSample(
+                    source_connection_id=owner,
+                    source_table="customers",
+                    source_field=field,
+                    raw_value="x",
+                )
+            )
+        session.commit()
+    client.get(f"/api/source/connections/{connection_id}/match-stats")
+
+    submitted = client.post("/api/jobs", json={"kind": "maintenance.prune_history"})
+    job = wait_for(client, submitted.json()["id"])
+    assert job["status"] == "succeeded", job["error"]
+    assert client.get(f"/api/jobs/{job['id']}/result").json() == {
+        "raw_values": 1,
+        "source_samples": 4,
+        "source_match_results": 2,
+    }
+
+    with Session(engine) as session:
+        assert sorted(row.raw_text for row in session.exec(select(RawValue)).all()) == [
+            "kept",
+            "new",
+        ]
+        assert sorted(row.raw_value for row in session.exec(select(SourceSample)).all()) == [
+            "Married",
+            "Single",
+        ]
+        assert sorted(
+            row.raw_value for row in session.exec(select(SourceMatchResult)).all()
+        ) == ["Married", "Single"]
+
+
+def test_retention_scheduler_submits_prune_jobs(tmp_path: Path) -> None:
+    client = build_client(tmp_path, retention_interval_minutes=0.001)
+    deadline = time.monotonic() + 5
+    jobs: list[dict] = []
+    with client:
+        while not jobs and time.monotonic() < deadline:
+            jobs = client.get("/api/jobs", params={"kind": "maintenance.prune_history"}).json()
+            time.sleep(0.02)
+        client.app.state.retention_scheduler.shutdown()
+        assert jobs
+        assert wait_for(client, jobs[-1]["id"])["status"] == "succeeded"
+
+
+def test_background_threads_run_only_inside_the_lifespan(tmp_path: Path) -> None:
+    before = set(threading.enumerate())
+    client = build_client(
+        tmp_path, raw_value_write_behind=True, retention_interval_minutes=60
+    )
+
+    def started() -> list[threading.Thread]:
+        return [
+            thread
+            for thread in threading.enumerate()
+            if thread not in before and thread.name.startswith("refdata-")
+        ]
+
+    assert started() == []
+    with client:
+        threads = started()
+        assert sorted(thread.name for thread in threads) == [
+            "refdata-job-heartbeat",
+            "refdata-rawvalue-flush",
+            "refdata-retention",
+        ]
+    assert not any(thread.is_alive() for thread in threads)
+
+
+def test_idle_runner_heartbeat_skips_the_database(tmp_path: Path) -> None:
+    client = build_client(tmp_path)
+    with capture_statements(client.app.state.engine) as statements:
+        client.app.state.job_runner.beat()
+    assert statements == []
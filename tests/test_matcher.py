@@ -1,9 +1,18 @@
+import asyncio
 import json
+import threading
+from datetime import datetime, timedelta, timezone
 
+import httpx
 import pytest
+from sqlalchemy.pool import StaticPool
+from sqlmodel import Session, SQLModel, create_engine, select
 
-from api.app.matcher import SemanticMatcher
-from api.app.models import CanonicalValue, SystemConfig
+from api.app.matcher import SemanticMatcher, find_exact_matches, invalidate_matcher_indexes
+from api.app.models import CanonicalValue, LLMRankingCacheEntry, SystemConfig
+from api.app.services.llm_cache import LLMRankingCache
+from api.app.services.llm_client import LLMClient, LLMRequest
+from api.app.services.scoring_pool import ProcessScoringPool
 
 
 class DummyResponse:
@@ -33,6 +42,41 @@ class DummyHttpClient:
         return DummyResponse(self._payload)
 
 
+class ConcurrencyProbe:
+    """Async transport handler that records peak in-flight requests."""
+
+    def __init__(self, payload: dict[str, object], failures: int = 0):
+        self.payload = payload
+        self.failures = failures
+        self.requests = 0
+        self.in_flight = 0
+        self.peak = 0
+
+    async def __call__(self, request: httpx.Request) -> httpx.Response:
+        self.requests += 1
+        self.in_flight += 1
+        self.peak = max(self.peak, self.in_flight)
+        try:
+            await asyncio.sleep(0.01)
+        finally:
+            self.in_flight -= 1
+        if self.failures:
+            self.failures -= 1
+            return httpx.Response(503)
+        return httpx.Response(200, json=self.payload)
+
+
+@pytest.fixture()
+def cache_engine():
+    engine = create_engine(
+        "sqlite:///:memory:",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    SQLModel.metadata.create_all(engine)
+    return engine
+
+
 @pytest.fixture()
 def canonical_values() -> list[CanonicalValue]:
     return [
@@ -113,3 +157,469 @@ def test_embedding_rank_respects_exact_label_match(canonical_values) -> None:
     assert matches
     assert matches[0].canonical_label == "Single"
     assert matches[0].score == 1.0
+
+
+def test_exact_label_or_code_hit_skips_scoring(monkeypatch: pytest.MonkeyPatch) -> None:
+    library = [
+        CanonicalValue(
+            id=1, dimension="marital_status", canonical_label="Married", attributes={"code": "M"}
+        ),
+        CanonicalValue(
+            id=2, dimension="marital_status", canonical_label="Single", attributes={"code": "S"}
+        ),
+    ]
+    matcher = SemanticMatcher(SystemConfig(matcher_backend="llm"), library)
+
+    def fail(*args, **kwargs):
+        raise AssertionError("exact hits must not reach a scoring backend")
+
+    monkeypatch.setattr(matcher, "_embedding_index", fail)
+    monkeypatch.setattr(matcher, "_rank_many_with_llm", fail)
+
+    assert [match.canonical_label for match in matcher.rank(" m ")] == ["Married"]
+    assert matcher.rank("SINGLE")[0].score == 1.0
+    assert [results[0].canonical_id for results in matcher.rank_many(["s", "married"])] == [2, 1]
+
+
+def test_exact_match_attributes_are_configurable() -> None:
+    library = [
+        CanonicalValue(
+            id=1, dimension="education", canonical_label="Bachelor's Degree",
+            attributes={"unesco_level": "6"},
+        ),
+    ]
+    default = SemanticMatcher(SystemConfig(), library)
+    custom = SemanticMatcher(SystemConfig(exact_match_attributes=["unesco_level"]), library)
+
+    assert custom.rank("6")[0].score == 1.0
+    assert not default._exact_matches("6")
+
+
+def test_fuzzy_backend_scores_typos_and_abbreviations() -> None:
+    library = [
+        CanonicalValue(id=1, dimension="education", canonical_label="High School"),
+        CanonicalValue(id=2, dimension="education", canonical_label="Bachelor's Degree"),
+        CanonicalValue(id=3, dimension="marital_status", canonical_label="Married"),
+        CanonicalValue(id=4, dimension="marital_status", canonical_label="Single"),
+    ]
+    word_matcher = SemanticMatcher(SystemConfig(matcher_backend="embedding"), library)
+    fuzzy_matcher = SemanticMatcher(SystemConfig(matcher_backend="fuzzy"), library)
+
+    for raw_text, expected in [("Marreid", "Married"), ("Bach. Deg.", "Bachelor's Degree")]:
+        assert word_matcher.rank(raw_text)[0].score == 0.0
+        top, runner_up = fuzzy_matcher.rank(raw_text)[:2]
+        assert top.canonical_label == expected
+        assert top.score > 2 * runner_up.score
+    assert fuzzy_matcher._fuzzy_index() is fuzzy_matcher._fuzzy_index()
+
+
+def test_embedding_index_is_reused_until_invalidated(canonical_values) -> None:
+    config = SystemConfig(matcher_backend="embedding", top_k=2)
+    first = SemanticMatcher(config=config, canonical_values=canonical_values)
+    second = SemanticMatcher(config=config, canonical_values=canonical_values)
+
+    index = first._embedding_index()
+    assert index is not None
+    assert second._embedding_index() is index
+
+    invalidate_matcher_indexes("marital_status")
+    rebuilt = SemanticMatcher(config=config, canonical_values=canonical_values)
+    assert rebuilt._embedding_index() is not index
+
+
+def test_exact_lookup_map_follows_library_contents_across_databases() -> None:
+    def engine_with(*labels: str):  # type: ignore[no-untyped-def]
+        engine = create_engine(
+            "sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool
+        )
+        SQLModel.metadata.create_all(engine)
+        with Session(engine) as session:
+            session.add_all(
+                CanonicalValue(dimension="marital_status", canonical_label=label)
+                for label in labels
+            )
+            session.commit()
+        return engine
+
+    with Session(engine_with("Single")) as session:
+        assert [match.canonical_label for match in find_exact_matches(session, "single")] == [
+            "Single"
+        ]
+        session.add(CanonicalValue(dimension="marital_status", canonical_label="Married"))
+        session.commit()
+        # Written without invalidating, as another worker would.
+        assert find_exact_matches(session, "married")
+
+    with Session(engine_with("Widowed")) as session:
+        assert find_exact_matches(session, "single") == []
+        assert find_exact_matches(session, "widowed")
+
+
+def test_exact_lookup_map_follows_in_place_edits() -> None:
+    engine = create_engine(
+        "sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool
+    )
+    SQLModel.metadata.create_all(engine)
+    with Session(engine) as session:
+        canonical = CanonicalValue(
+            dimension="marital_status", canonical_label="Single", attributes={"code": "S"}
+        )
+        session.add(canonical)
+        session.commit()
+        assert find_exact_matches(session, "single", ("code",))
+
+        # Renamed and recoded without invalidating, as another worker would.
+        canonical.canonical_label = "Never married"
+        canonical.attributes = {"code": "NM"}
+        session.add(canonical)
+        session.commit()
+        assert find_exact_matches(session, "single", ("code",)) == []
+        assert find_exact_matches(session, "s", ("code",)) == []
+        assert [
+            match.canonical_label for match in find_exact_matches(session, "nm", ("code",))
+        ] == ["Never married"]
+
+
+def test_embedding_index_rebuilds_when_library_changes(canonical_values) -> None:
+    config = SystemConfig(matcher_backend="embedding", top_k=3)
+    original = SemanticMatcher(config=config, canonical_values=canonical_values)
+    original_index = original._embedding_index()
+
+    extended = canonical_values + [
+        CanonicalValue(id=3, dimension="marital_status", canonical_label="Divorced"),
+    ]
+    matcher = SemanticMatcher(config=config, canonical_values=extended)
+
+    assert matcher._embedding_index() is not original_index
+    assert matcher.rank("divorced")[0].canonical_label == "Divorced"
+
+
+def test_embedding_scores_penalise_unknown_query_tokens(canonical_values) -> None:
+    config = SystemConfig(matcher_backend="embedding", top_k=1)
+    matcher = SemanticMatcher(config=config, canonical_values=canonical_values)
+
+    partial = matcher.rank("married person")
+
+    assert partial[0].canonical_label == "Married"
+    assert 0.0 < partial[0].score < 1.0
+
+
+def test_rank_many_matches_individual_rankings(canonical_values) -> None:
+    config = SystemConfig(matcher_backend="embedding", top_k=2)
+    values = canonical_values + [
+        CanonicalValue(
+            id=3,
+            dimension="marital_status",
+            canonical_label="Divorced",
+            description="Marriage legally dissolved",
+        ),
+    ]
+    matcher = SemanticMatcher(config=config, canonical_values=values)
+    raw_values = ["married", "  ", "Divorced", "legally single", "unknown"]
+
+    batched = matcher.rank_many(raw_values)
+
+    assert len(batched) == len(raw_values)
+    assert batched[1] == []
+    for raw_value, matches in zip(raw_values, batched):
+        assert matches == matcher.rank(raw_value)
+    assert batched[2][0].canonical_label == "Divorced"
+    assert batched[2][0].score == 1.0
+
+
+def test_process_pool_scoring_matches_in_process_rankings() -> None:
+    pool = ProcessScoringPool(2, min_values=10, max_pools=1)
+    library = [
+        CanonicalValue(
+            id=index, dimension="pool", canonical_label=f"value {index} group {index % 7}"
+        )
+        for index in range(1, 201)
+    ]
+    raw_values = [f"value {index} grp {index % 5}" for index in range(60)]
+    serial = SemanticMatcher(SystemConfig(matcher_backend="embedding", top_k=3), library)
+    pooled = SemanticMatcher(
+        SystemConfig(matcher_backend="embedding", top_k=3), library, scoring_pool=pool
+    )
+    try:
+        assert pooled.rank_many(raw_values) == serial.rank_many(raw_values)
+        (executor,) = [entry.executor for entry in pool._pools.values()]
+        pooled.rank_many(raw_values[::-1])
+        assert [entry.executor for entry in pool._pools.values()] == [executor]
+
+        fuzzy = SemanticMatcher(
+            SystemConfig(matcher_backend="fuzzy", top_k=3), library, scoring_pool=pool
+        )
+        fuzzy.rank_many(raw_values)
+        # One pool kept: the fuzzy index evicts the embedding workers.
+        assert [entry.executor for entry in pool._pools.values()] != [executor]
+        assert len(pool._pools) == 1
+        # Small runs stay in-process.
+        assert pooled.rank_many(raw_values[:3]) == serial.rank_many(raw_values[:3])
+    finally:
+        pool.shutdown()
+    assert not pool._pools
+
+
+def test_llm_rankings_select_top_k_in_score_order(canonical_values) -> None:
+    values = canonical_values + [
+        CanonicalValue(id=3, dimension="marital_status", canonical_label="Divorced"),
+    ]
+    config = SystemConfig(matcher_backend="llm", top_k=2)
+    matcher = SemanticMatcher(config=config, canonical_values=values)
+
+    matches = matcher._build_matches_from_rankings(
+        [
+            {"id": 1, "score": 0.4},
+            {"id": 99, "score": 1.0},
+            {"id": 3, "score": 0.9},
+            {"id": 2, "score": "0.4"},
+            {"id": 2, "score": "n/a"},
+        ]
+    )
+
+    assert [match.canonical_id for match in matches] == [3, 1]
+
+
+def test_lexical_rank_limits_candidates_to_top_k(canonical_values) -> None:
+    config = SystemConfig(matcher_backend="embedding", top_k=1)
+    matcher = SemanticMatcher(config=config, canonical_values=canonical_values)
+
+    matches = matcher._rank_with_lexical("single")
+
+    assert len(matches) == 1
+    assert matches[0].canonical_label == "Single"
+    assert matches[0].score == 1.0
+
+
+def test_lexical_index_scores_only_rows_sharing_tokens() -> None:
+    values = [
+        CanonicalValue(id=1, dimension="education", canonical_label="High School"),
+        CanonicalValue(id=2, dimension="education", canonical_label="Bachelor Degree"),
+        CanonicalValue(id=3, dimension="education", canonical_label="Master Degree"),
+    ]
+    config = SystemConfig(matcher_backend="embedding", top_k=3)
+    matcher = SemanticMatcher(config=config, canonical_values=values)
+
+    positions, scores = matcher._lexical_index().scores({"degree", "masters"})
+    assert positions.tolist() == [1, 2]
+    assert scores.tolist() == pytest.approx([1 / 3, 1 / 3])
+
+    matches = matcher._rank_with_lexical("Master Degree")
+    assert [match.canonical_id for match in matches] == [3, 2, 1]
+    assert [match.score for match in matches] == [1.0, 0.3333, 0.0]
+
+
+def _offline_llm_payload() -> dict[str, object]:
+    return {"message": {"content": json.dumps([{"id": 2, "score": 0.91}])}}
+
+
+def test_llm_rankings_are_served_from_cache(
+    monkeypatch: pytest.MonkeyPatch, canonical_values, cache_engine
+) -> None:
+    calls: list[dict[str, object]] = []
+    monkeypatch.setattr(
+        "api.app.matcher.httpx.Client",
+        lambda *args, **kwargs: DummyHttpClient(_offline_llm_payload(), calls),
+    )
+    config = SystemConfig(matcher_backend="llm", llm_mode="offline", llm_model="llama3")
+    cache = LLMRankingCache(cache_engine, memory_entries=0)
+
+    first = SemanticMatcher(config, canonical_values, llm_cache=cache).rank("Singel")
+    second = SemanticMatcher(config, canonical_values, llm_cache=cache).rank("  SINGEL ")
+
+    assert first == second
+    assert first[0].canonical_label == "Single"
+    assert len(calls) == 1
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 1
+
+    changed_library = canonical_values + [
+        CanonicalValue(id=3, dimension="marital_status", canonical_label="Widowed"),
+    ]
+    SemanticMatcher(config, changed_library, llm_cache=cache).rank("Singel")
+    assert len(calls) == 2
+
+
+def test_rank_many_batches_llm_prompts(monkeypatch: pytest.MonkeyPatch, canonical_values) -> None:
+    calls: list[dict[str, object]] = []
+    payload = {
+        "message": {
+            "content": json.dumps(
+                [
+                    {"index": 0, "matches": [{"id": 2, "score": 0.9}, {"id": 1, "score": 0.1}]},
+                    {"index": 1, "matches": [{"id": 1, "score": 0.8}]},
+                ]
+            )
+        }
+    }
+    monkeypatch.setattr(
+        "api.app.matcher.httpx.Client",
+        lambda *args, **kwargs: DummyHttpClient(payload, calls),
+    )
+    config = SystemConfig(
+        matcher_backend="llm", llm_mode="offline", llm_model="llama3", llm_batch_size=10
+    )
+    matcher = SemanticMatcher(config, canonical_values)
+
+    results = matcher.rank_many(["Singel", "Marred", "Singel", "Widow"])
+
+    assert len(calls) == 1
+    prompt = calls[0]["payload"]["messages"][1]["content"]
+    assert prompt.count('"raw_value"') == 3
+    assert results[0][0].canonical_label == "Single"
+    assert results[1][0].canonical_label == "Married"
+    assert results[2] == results[0]
+    # Values the model skipped fall back to embedding scores.
+    assert results[3]
+
+
+def test_parse_llm_batch_json_ignores_unknown_indexes(canonical_values) -> None:
+    matcher = SemanticMatcher(SystemConfig(), canonical_values)
+    content = json.dumps(
+        [
+            {"index": 1, "matches": [{"id": 2, "score": 0.7}]},
+            {"index": 5, "matches": [{"id": 1, "score": 0.2}]},
+            {"index": "0", "matches": []},
+        ]
+    )
+
+    assert matcher._parse_llm_batch_json(content, 2) == [[], [{"id": 2, "score": 0.7}]]
+
+
+def test_hybrid_backend_sends_only_embedding_shortlist(monkeypatch: pytest.MonkeyPatch) -> None:
+    library = [
+        CanonicalValue(id=index, dimension="country", canonical_label=f"Country {index}")
+        for index in range(1, 31)
+    ] + [
+        CanonicalValue(id=100, dimension="country", canonical_label="United Kingdom"),
+        CanonicalValue(id=101, dimension="country", canonical_label="United States"),
+    ]
+    calls: list[dict[str, object]] = []
+    payload = {"message": {"content": json.dumps([{"id": 100, "score": 0.95}])}}
+    monkeypatch.setattr(
+        "api.app.matcher.httpx.Client",
+        lambda *args, **kwargs: DummyHttpClient(payload, calls),
+    )
+    config = SystemConfig(
+        matcher_backend="hybrid",
+        llm_mode="offline",
+        llm_model="llama3",
+        llm_shortlist_size=3,
+        top_k=2,
+    )
+
+    matches = SemanticMatcher(config, library).rank("United Kingdom of Great Britain")
+
+    prompt = calls[0]["payload"]["messages"][1]["content"]
+    options = json.loads(prompt.split("Canonical options: ", 1)[1])
+    assert len(options) == 3
+    assert {option["id"] for option in options} >= {100, 101}
+    assert [match.canonical_id for match in matches] == [100, 101]
+    assert matches[0].score == 0.95
+    # The LLM skipped id 101, so its embedding score is kept.
+    assert 0 < matches[1].score < 0.95
+
+
+def test_merge_shortlist_rankings_drops_ids_outside_shortlist(canonical_values) -> None:
+    matcher = SemanticMatcher(SystemConfig(matcher_backend="hybrid"), canonical_values)
+    shortlist = matcher._rank_many_with_embeddings(["Single"], limit=1)[0]
+
+    assert matcher._merge_shortlist_rankings([{"id": 1, "score": 0.9}], shortlist) == []
+    assert matcher._merge_shortlist_rankings([{"id": 2, "score": 0.4}], shortlist) == [
+        {"id": 2, "score": 0.4}
+    ]
+
+
+def test_llm_client_bounds_concurrency_and_retries_transient_errors() -> None:
+    probe = ConcurrencyProbe({"ok": True}, failures=2)
+    client = LLMClient(
+        concurrency=3, max_retries=2, backoff_seconds=0, transport=httpx.MockTransport(probe)
+    )
+
+    responses = client.post_many_sync(
+        [LLMRequest(url="http://llm.test/api/chat", payload={"n": n}) for n in range(9)]
+    )
+
+    assert responses == [{"ok": True}] * 9
+    assert probe.requests == 11
+    assert probe.peak == 3
+
+
+def test_llm_client_gives_up_after_max_retries() -> None:
+    probe = ConcurrencyProbe({"ok": True}, failures=5)
+    client = LLMClient(max_retries=1, backoff_seconds=0, transport=httpx.MockTransport(probe))
+
+    assert client.post_many_sync([LLMRequest(url="http://llm.test/api/chat", payload={})]) == [None]
+    assert probe.requests == 2
+
+
+def test_llm_client_serves_worker_threads_from_the_app_loop() -> None:
+    probe = ConcurrencyProbe({"ok": True})
+    client = LLMClient(concurrency=2, transport=httpx.MockTransport(probe))
+    requests = [LLMRequest(url="http://llm.test/api/chat", payload={"n": n}) for n in range(4)]
+
+    def call_from_threads() -> list[object]:
+        results: list[object] = []
+        workers = [
+            threading.Thread(target=lambda: results.append(client.post_many_sync(requests)))
+            for _ in range(2)
+        ]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+        return results
+
+    # Before start every call owns a private client, so threads cannot close each other's.
+    assert call_from_threads() == [[{"ok": True}] * 4] * 2
+
+    loop = asyncio.new_event_loop()
+    app_thread = threading.Thread(target=loop.run_forever)
+    app_thread.start()
+    try:
+        asyncio.run_coroutine_threadsafe(client.start(), loop).result()
+        probe.peak = 0
+        assert call_from_threads() == [[{"ok": True}] * 4] * 2
+        # Both threads shared the app loop's client and its concurrency bound.
+        assert probe.peak == 2
+        asyncio.run_coroutine_threadsafe(client.aclose(), loop).result()
+    finally:
+        loop.call_soon_threadsafe(loop.stop)
+        app_thread.join()
+        loop.close()
+
+
+def test_rank_many_fans_out_llm_prompts_through_shared_client(canonical_values) -> None:
+    probe = ConcurrencyProbe(_offline_llm_payload())
+    client = LLMClient(concurrency=4, transport=httpx.MockTransport(probe))
+    config = SystemConfig(
+        matcher_backend="llm", llm_mode="offline", llm_model="llama3", llm_batch_size=1
+    )
+    matcher = SemanticMatcher(config, canonical_values, llm_client=client)
+
+    results = matcher.rank_many([f"value {n}" for n in range(12)])
+
+    assert probe.requests == 12
+    assert probe.peak == 4
+    assert all(result[0].canonical_label == "Single" for result in results)
+
+
+def test_llm_cache_expires_entries_after_ttl(cache_engine) -> None:
+    cache = LLMRankingCache(cache_engine, ttl_seconds=60, memory_entries=0)
+    cache.set(
+        "key",
+        raw_text="Singel",
+        dimension="marital_status",
+        model="offline:llama3",
+        library_version="v1",
+        rankings=[{"id": 2, "score": 0.9}],
+    )
+    assert cache.get("key") == [{"id": 2, "score": 0.9}]
+
+    with Session(cache_engine) as session:
+        entry = session.exec(select(LLMRankingCacheEntry)).one()
+        entry.created_at = datetime.now(timezone.utc) - timedelta(seconds=120)
+        session.add(entry)
+        session.commit()
+
+    assert cache.get("key") is None
@@ -5,6 +5,7 @@ from __future__ import annotations
 import types
 
 import pytest
+from sqlalchemy import create_engine, text
 from sqlalchemy.exc import OperationalError
 
 from api.app.services import source_connections as svc
@@ -75,3 +76,135 @@ def test_list_fields_wrapped_inspection_error(monkeypatch: pytest.MonkeyPatch) -
 
     assert "connect failed" in str(excinfo.value)
     assert engine.disposed is True
+
+
+def _counting_engines(monkeypatch: pytest.MonkeyPatch) -> list[DummyEngine]:
+    created: list[DummyEngine] = []
+    parsed = svc.ParsedOptions(query={}, connect_args={}, schema=None)
+
+    def _create(settings, pool_options=None):
+        created.append(DummyEngine())
+        return created[-1], parsed
+
+    monkeypatch.setattr(svc, "_create_engine", _create)
+    return created
+
+
+def test_engine_registry_reuses_engines_until_settings_change(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    created = _counting_engines(monkeypatch)
+    registry = svc.SourceEngineRegistry(idle_seconds=60)
+    settings = svc.ConnectionSettings(
+        db_type="postgresql",
+        host="warehouse",
+        port=5432,
+        database="demo",
+        username="user",
+        connection_id=7,
+    )
+
+    first, _ = registry.acquire(settings)
+    assert registry.acquire(settings)[0] is first
+    assert (registry.hits, registry.misses) == (1, 1)
+
+    moved = svc.ConnectionSettings(**{**settings.__dict__, "host": "replica"})
+    second, _ = registry.acquire(moved)
+    assert second is not first and first.disposed is True
+    assert len(registry) == 1
+
+    registry.discard(7)
+    assert second.disposed is True and len(registry) == 0
+    assert len(created) == 2
+
+
+def test_engine_registry_evicts_idle_and_failed_engines(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    _counting_engines(monkeypatch)
+    registry = svc.SourceEngineRegistry(idle_seconds=0)
+    base = dict(db_type="postgresql", host="h", port=5432, database="d", username="u")
+
+    idle, _ = registry.acquire(svc.ConnectionSettings(**base, connection_id=1))
+    active, _ = registry.acquire(svc.ConnectionSettings(**base, connection_id=2))
+    assert idle.disposed is True and active.disposed is False
+
+    registry = svc.SourceEngineRegistry(idle_seconds=60)
+    settings = svc.ConnectionSettings(**base, connection_id=3)
+    failing, _ = registry.acquire(settings)
+    _patch_inspect(monkeypatch, "server closed the connection")
+    with pytest.raises(svc.SourceConnectionServiceError):
+        svc.list_tables(settings, registry)
+    assert failing.disposed is True and len(registry) == 0
+
+
+def test_schema_fields_match_per_table_fields(tmp_path) -> None:  # type: ignore[no-untyped-def]
+    database = tmp_path / "source.db"
+    engine = create_engine(f"sqlite:///{database}")
+    with engine.begin() as connection:
+        connection.execute(
+            text(
+                "CREATE TABLE customers (id INTEGER PRIMARY KEY, "
+                "email VARCHAR(80) NOT NULL, status TEXT DEFAULT 'active', joined DATETIME)"
+            )
+        )
+        connection.execute(text("CREATE TABLE orders (id INTEGER, total NUMERIC(10, 2))"))
+        connection.execute(text("CREATE VIEW active AS SELECT id, email FROM customers"))
+    engine.dispose()
+    settings = svc.ConnectionSettings(
+        db_type="sqlite", host="", port=0, database=str(database), username=""
+    )
+
+    bulk = svc.list_schema_fields(settings, None)
+
+    assert sorted(bulk) == ["active", "customers", "orders"]
+    for table_name, fields in bulk.items():
+        assert fields == svc.list_fields(settings, table_name, None)
+    assert {field["name"]: field["data_type"] for field in bulk["customers"]}["email"] == (
+        "VARCHAR(80)"
+    )
+    assert svc.supports_bulk_catalogue(
+        svc.ConnectionSettings(db_type="Postgres", host="h", port=5432, database="d", username="u")
+    )
+    assert not svc.supports_bulk_catalogue(settings)
+
+
+def test_stream_table_fields_chunks_concurrent_queries(
+    tmp_path,  # type: ignore[no-untyped-def]
+) -> None:
+    database = tmp_path / "source.db"
+    engine = create_engine(f"sqlite:///{database}")
+    with engine.begin() as connection:
+        connection.execute(text("CREATE TABLE cities (name TEXT, country TEXT)"))
+        connection.execute(
+            text("INSERT INTO cities VALUES (:name, :country)"),
+            [{"name": f"city-{index}", "country": f"c-{index % 3}"} for index in range(25)],
+        )
+    engine.dispose()
+    registry = svc.SourceEngineRegistry(idle_seconds=60)
+    settings = svc.ConnectionSettings(
+        db_type="sqlite", host="", port=0, database=str(database), username="", connection_id=1
+    )
+
+    chunks = list(
+        svc.stream_table_fields(
+            settings,
+            "cities",
+            {"name": None, "country": 2, "missing": None},
+            None,
+            engines=registry,
+            chunk_size=10,
+        )
+    )
+    assert all(len(chunk) <= 10 for _, chunk in chunks)
+    assert sum(len(chunk) for field, chunk in chunks if field == "name") == 25
+    assert [len(chunk) for field, chunk in chunks if field == "country"] == [2]
+    assert {field for field, _ in chunks} == {"name", "country"}
+
+    # A consumer that stops early releases the producer threads.
+    stream = svc.stream_table_fields(
+        settings, "cities", {"name": None, "country": None}, None, registry, chunk_size=1
+    )
+    assert len(next(stream)[1]) == 1
+    stream.close()
+    registry.dispose_all()
@@ -1,28 +1,15 @@
 import io
-from typing import Iterator
 
 import pandas as pd
 from fastapi.testclient import TestClient
-from sqlmodel import Session
 
 from api.app.config import Settings
-from api.app.database import create_db_engine, get_session, init_db
 from api.app.main import create_app
 
 
 def build_client() -> TestClient:
     settings = Settings(database_url="sqlite:///:memory:", match_threshold=0.55)
-    app = create_app(settings)
-    engine = create_db_engine(settings)
-    app.state.engine = engine
-    init_db(engine, settings=settings)
-
-    def session_override() -> Iterator[Session]:
-        with Session(engine) as session:
-            yield session
-
-    app.dependency_overrides[get_session] = session_override
-    return TestClient(app)
+    return TestClient(create_app(settings))
 
 
 def seed_mapping(client: TestClient):